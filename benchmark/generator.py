@@ -0,0 +1,166 @@
+""" Synthetic container configurations for benchmarks, root service of each configuration is `root` """
+import os
+import sys
+import types
+
+import md.di
+
+
+class Service:
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+
+    def call(self, *args, **kwargs) -> None:
+        pass
+
+    def create(self, **kwargs) -> 'Service':
+        return Service(**kwargs)
+
+    @staticmethod
+    def create_static(**kwargs) -> 'Service':
+        return Service(**kwargs)
+
+
+def wide(width: int = 1000, shared: bool = True) -> md.di.Configuration:
+    """ Root service depends on `width` independent services """
+    definition_map = {f'service_{index!s}': md.di.Definition(class_=Service) for index in range(width)}
+    definition_map['root'] = md.di.Definition(
+        class_=Service,
+        arguments={f'argument_{index!s}': md.di.Reference(id_=f'service_{index!s}') for index in range(width)},
+        public=True,
+        shared=shared,
+    )
+    return md.di.Configuration(definition_map=definition_map)
+
+
+def deep(depth: int = 100) -> md.di.Configuration:
+    """ Services form a chain, each service depends on previous one """
+    definition_map = {'service_0': md.di.Definition(class_=Service)}
+    for index in range(1, depth):
+        definition_map[f'service_{index!s}'] = md.di.Definition(
+            class_=Service,
+            arguments={'dependency': md.di.Reference(id_=f'service_{index - 1!s}')},
+        )
+    definition_map['root'] = md.di.Definition(
+        class_=Service,
+        arguments={'dependency': md.di.Reference(id_=f'service_{depth - 1!s}')},
+        public=True,
+    )
+    return md.di.Configuration(definition_map=definition_map)
+
+
+def aliased(service_count: int = 1000, alias_count: int = 10) -> md.di.Configuration:
+    """ Each service has `alias_count` aliases, root service references services by alias """
+    definition_map = {f'service_{index!s}': md.di.Definition(class_=Service) for index in range(service_count)}
+    definition_alias_map = {
+        f'alias_{index!s}_{alias_index!s}': f'service_{index!s}'
+        for index in range(service_count)
+        for alias_index in range(alias_count)
+    }
+    definition_map['root'] = md.di.Definition(
+        class_=Service,
+        arguments={
+            f'argument_{index!s}': md.di.Reference(id_=f'alias_{index!s}_{index % alias_count!s}')
+            for index in range(service_count)
+        },
+        public=True,
+    )
+    return md.di.Configuration(definition_map=definition_map, definition_alias_map=definition_alias_map)
+
+
+def big_arguments(size: int = 1000) -> md.di.Configuration:
+    """ Root service has list and dictionary arguments of `size` items, half of them are references """
+    definition_map = {f'service_{index!s}': md.di.Definition(class_=Service) for index in range(size // 2)}
+    definition_map['root'] = md.di.Definition(
+        class_=Service,
+        arguments={
+            'list': [
+                md.di.Reference(id_=f'service_{index // 2!s}') if index % 2 else index for index in range(size)
+            ],
+            'dict': {
+                f'key_{index!s}': md.di.Reference(id_=f'service_{index // 2!s}') if index % 2 else index
+                for index in range(size)
+            },
+        },
+        public=True,
+    )
+    return md.di.Configuration(definition_map=definition_map)
+
+
+def many_calls(call_count: int = 100) -> md.di.Configuration:
+    """ Root service has `call_count` method calls with reference and value arguments """
+    definition_map = {f'service_{index!s}': md.di.Definition(class_=Service) for index in range(call_count)}
+    definition_map['root'] = md.di.Definition(
+        class_=Service,
+        calls=[
+            ('call', [md.di.Reference(id_=f'service_{index!s}'), index], {'value': index})
+            for index in range(call_count)
+        ],
+        public=True,
+    )
+    return md.di.Configuration(definition_map=definition_map)
+
+
+def factory_tuples(service_count: int = 1000) -> md.di.Configuration:
+    """ Services are created by service method and by static method factories """
+    definition_map = {'factory': md.di.Definition(class_=Service)}
+    for index in range(service_count):
+        if index % 2:
+            factory = (md.di.Reference(id_='factory'), 'create')
+        else:
+            factory = (Service, 'create_static')
+        definition_map[f'service_{index!s}'] = md.di.Definition(factory=factory, arguments={'index': index})
+    definition_map['root'] = md.di.Definition(
+        class_=Service,
+        arguments={f'argument_{index!s}': md.di.Reference(id_=f'service_{index!s}') for index in range(service_count)},
+        public=True,
+    )
+    return md.di.Configuration(definition_map=definition_map)
+
+
+def live_module(depth: int = 50, name: str = 'md_di_benchmark_live') -> types.ModuleType:
+    """
+    Returns module of `depth` classes, which constructors require previous class instance (by type hint),
+    module is registered, so classes could be autowired by `md.di.live.Container`; root class is `Root`
+    """
+    source_line_list = ['class Service0:', '    pass', '']
+    for index in range(1, depth):
+        source_line_list += [
+            f'class Service{index!s}:',
+            f'    def __init__(self, dependency: Service{index - 1!s}) -> None:',
+            '        self.dependency = dependency',
+            '',
+        ]
+    source_line_list += [
+        'class Root:',
+        f'    def __init__(self, dependency: Service{depth - 1!s}) -> None:',
+        '        self.dependency = dependency',
+    ]
+
+    module = types.ModuleType(name)
+    exec(compile('\n'.join(source_line_list), f'<{name!s}>', 'exec'), module.__dict__)
+    sys.modules[name] = module
+    return module
+
+
+def service_package(module_count: int, directory: str, name: str = 'md_di_benchmark_services') -> str:
+    """
+    Writes package of `module_count` modules into `directory`, each module has `Service` class
+    and some code to be executed on import (like a typical service module); returns package name
+    """
+    package_path = os.path.join(directory, name)
+    os.makedirs(package_path, exist_ok=True)
+    with open(os.path.join(package_path, '__init__.py'), 'w'):
+        pass
+
+    body = '\n'.join(
+        f'class Entity{index!s}:\n'
+        f'    def __init__(self, value: int = {index!s}) -> None:\n'
+        f'        self.value = value\n\n'
+        f'CONSTANT_{index!s} = {{key: str(key) for key in range(50)}}\n'
+        for index in range(50)
+    )
+    for index in range(module_count):
+        with open(os.path.join(package_path, f'service_{index!s}.py'), 'w') as file:
+            file.write(body + '\n\nclass Service:\n    pass\n')
+    return name
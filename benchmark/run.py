@@ -0,0 +1,323 @@
+"""
+Container benchmark suite, e.g.:
+
+    python benchmark/run.py --save         # records baseline
+    python benchmark/run.py --compare      # compares with recorded baseline, fails on regression
+    python benchmark/run.py --filter cold  # runs cases, which names contain `cold`
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+import typing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lib'))
+
+import md.di  # noqa: E402
+import md.di.live  # noqa: E402
+import md.di.storage  # noqa: E402
+
+import generator  # noqa: E402
+
+StatementType = typing.Callable[[], object]
+CaseType = typing.Callable[[], StatementType]  # prepares case, returns measured statement
+
+_case_map: typing.Dict[str, CaseType] = {}
+_default_baseline_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def case(name: str) -> typing.Callable[[CaseType], CaseType]:
+    def register(function: CaseType) -> CaseType:
+        _case_map[name] = function
+        return function
+    return register
+
+
+def _cold_get(configuration: md.di.Configuration) -> StatementType:
+    """ New container per retrieval: includes definition plans creation and dependencies instantiation """
+    return lambda: md.di.Container(configuration=configuration).get('root')
+
+
+def _warm_get(configuration: md.di.Configuration) -> StatementType:
+    container = md.di.Container(configuration=configuration)
+    container.get('root')
+    return lambda: container.get('root')
+
+
+# Container construction
+@case('construction/wide_10000')
+def _() -> StatementType:
+    configuration = generator.wide(width=10000)
+    return lambda: md.di.Container(configuration=configuration)
+
+
+@case('configuration/wide_10000')
+def _() -> StatementType:
+    return lambda: generator.wide(width=10000)
+
+
+@case('configuration/wide_10000_frozen')
+def _() -> StatementType:
+    return lambda: generator.wide(width=10000).freeze()
+
+
+# Cold retrieval
+@case('cold_get/wide_1000')
+def _() -> StatementType:
+    return _cold_get(configuration=generator.wide(width=1000))
+
+
+@case('cold_get/deep_100')
+def _() -> StatementType:
+    return _cold_get(configuration=generator.deep(depth=100))
+
+
+@case('cold_get/aliased_1000x10')
+def _() -> StatementType:
+    return _cold_get(configuration=generator.aliased(service_count=1000, alias_count=10))
+
+
+@case('cold_get/big_arguments_1000')
+def _() -> StatementType:
+    return _cold_get(configuration=generator.big_arguments(size=1000))
+
+
+@case('cold_get/many_calls_100')
+def _() -> StatementType:
+    return _cold_get(configuration=generator.many_calls(call_count=100))
+
+
+@case('cold_get/factory_tuples_1000')
+def _() -> StatementType:
+    return _cold_get(configuration=generator.factory_tuples(service_count=1000))
+
+
+# Warm (shared) retrieval
+@case('warm_get/shared')
+def _() -> StatementType:
+    return _warm_get(configuration=generator.wide(width=10))
+
+
+@case('warm_get/shared_by_class')
+def _() -> StatementType:
+    configuration = generator.wide(width=10)
+    configuration.definition_alias_map[md.di.reference(id_=generator.Service)] = 'root'
+    container = md.di.Container(configuration=configuration)
+    container.get(generator.Service)
+    return lambda: container.get(generator.Service)
+
+
+# Non-shared retrieval (warm plans, new instance per retrieval)
+@case('non_shared_get/wide_10')
+def _() -> StatementType:
+    return _warm_get(configuration=generator.wide(width=10, shared=False))
+
+
+@case('non_shared_get/big_arguments_100')
+def _() -> StatementType:
+    configuration = generator.big_arguments(size=100)
+    configuration.definition_map['root'].shared = False
+    return _warm_get(configuration=configuration)
+
+
+@case('non_shared_get/many_calls_10')
+def _() -> StatementType:
+    configuration = generator.many_calls(call_count=10)
+    configuration.definition_map['root'].shared = False
+    return _warm_get(configuration=configuration)
+
+
+# Pooled retrieval (instance is taken from the pool and returned)
+@case('pooled_get/big_arguments_100')
+def _() -> StatementType:
+    configuration = generator.big_arguments(size=100)
+    configuration.definition_map['root'].shared = False
+    configuration.definition_map['root'].pool = 1
+    container = md.di.Container(configuration=configuration)
+
+    def statement() -> None:
+        with container.pooled('root'):
+            pass
+    return statement
+
+
+# Scope
+@case('scope/enter_exit')
+def _() -> StatementType:
+    container = md.di.Container(configuration=generator.wide(width=10))
+
+    def statement() -> None:
+        with container.scope():
+            pass
+    return statement
+
+
+# Live container autowiring
+@case('live/autowire_deep_50')
+def _() -> StatementType:
+    root_class = generator.live_module(depth=50).Root
+
+    def statement() -> object:
+        container = md.di.live.Container()
+        container.set_definition_cache(md.di.live.DefinitionCache())  # class introspection is not cached
+        return container.get(root_class)
+    return statement
+
+
+@case('live/autowire_deep_50_cached')
+def _() -> StatementType:
+    root_class = generator.live_module(depth=50).Root
+    definition_cache = md.di.live.DefinitionCache()
+
+    def statement() -> object:
+        container = md.di.live.Container()
+        container.set_definition_cache(definition_cache)
+        return container.get(root_class)
+    return statement
+
+
+# Stored configuration load, one definition is used
+def _storage_load(dump: typing.Callable[..., None], load: typing.Callable[[str], md.di.Configuration]) -> StatementType:
+    directory = tempfile.mkdtemp(prefix='md_di_benchmark_')
+    atexit.register(shutil.rmtree, directory, True)
+    path = os.path.join(directory, 'configuration')
+    dump(configuration=generator.wide(width=10000), path=path)
+    return lambda: load(path).definition_map['service_0']
+
+
+@case('storage/load_pickle_wide_10000')
+def _() -> StatementType:
+    return _storage_load(dump=md.di.storage.dump, load=md.di.storage.load)
+
+
+@case('storage/load_indexed_wide_10000')
+def _() -> StatementType:
+    return _storage_load(dump=md.di.storage.dump_indexed, load=md.di.storage.load_indexed)
+
+
+# Process startup: configuration of many service modules, only one service is used
+_startup_script = '''
+import importlib
+import sys
+
+import md.di
+
+package, module_count, deferred = sys.argv[1], int(sys.argv[2]), sys.argv[3] == 'deferred'
+definition_map = {}
+for index in range(module_count):
+    path = f'{package!s}.service_{index!s}'
+    class_ = f'{path!s}.Service' if deferred else importlib.import_module(path).Service
+    definition_map[f'service_{index!s}'] = md.di.Definition(class_=class_, public=True)
+md.di.Container(configuration=md.di.Configuration(definition_map=definition_map)).get('service_0')
+'''
+
+
+def _startup(module_count: int, deferred: bool) -> StatementType:
+    """ New interpreter per execution (includes interpreter startup), modules are imported from bytecode cache """
+    directory = tempfile.mkdtemp(prefix='md_di_benchmark_')
+    atexit.register(shutil.rmtree, directory, True)
+    package = generator.service_package(module_count=module_count, directory=directory)
+    command = [
+        sys.executable, '-c', _startup_script, package, str(module_count), 'deferred' if deferred else 'eager'
+    ]
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([directory] + sys.path))
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)  # modules are imported from bytecode cache, as in production
+    return lambda: subprocess.run(command, env=environment, check=True)
+
+
+@case('startup/eager_import_500')
+def _() -> StatementType:
+    return _startup(module_count=500, deferred=False)
+
+
+@case('startup/deferred_import_500')
+def _() -> StatementType:
+    return _startup(module_count=500, deferred=True)
+
+
+def measure(statement: StatementType, repeat: int) -> typing.Dict[str, float]:
+    """ Returns best time per statement execution (seconds) and peak memory of single execution (bytes) """
+    timer = timeit.Timer(stmt=statement)
+    number, _ = timer.autorange()  # at least 0.2 seconds per repeat
+    time = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        statement()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'time': time, 'memory': peak_memory}
+
+
+def _format_time(time: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if time >= scale:
+            return f'{time / scale:.2f} {unit!s}'
+    return f'{time / 1e-9:.0f} ns'
+
+
+def _format_memory(memory: float) -> str:
+    for unit, scale in (('MiB', 2 ** 20), ('KiB', 2 ** 10)):
+        if memory >= scale:
+            return f'{memory / scale:.1f} {unit!s}'
+    return f'{memory:.0f} B'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='md.di benchmark suite')
+    parser.add_argument('--filter', default='', help='run cases, which names contain the value')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repeats, best one is taken')
+    parser.add_argument('--save', nargs='?', const=_default_baseline_path, help='write results as baseline')
+    parser.add_argument('--compare', nargs='?', const=_default_baseline_path, help='compare results with baseline')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative slowdown treated as regression')
+    argument_map = parser.parse_args()
+
+    baseline_map = {}
+    if argument_map.compare:
+        with open(argument_map.compare) as file:
+            baseline_map = json.load(file)['result_map']
+
+    result_map = {}
+    regression_list = []
+    for name, prepare in _case_map.items():
+        if argument_map.filter not in name:
+            continue
+
+        result = result_map[name] = measure(statement=prepare(), repeat=argument_map.repeat)
+        line = f'{name!s:<40} {_format_time(result["time"])!s:>12} {_format_memory(result["memory"])!s:>12}'
+
+        baseline = baseline_map.get(name)
+        if baseline:
+            ratio = result['time'] / baseline['time']
+            line += f' {ratio:>8.2f}x'
+            if ratio > 1 + argument_map.threshold:
+                line += ' regression'
+                regression_list.append(name)
+        print(line, flush=True)
+
+    if argument_map.save:
+        with open(argument_map.save, 'w') as file:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'version': md.di.__version__,
+                'result_map': result_map,
+            }, file, indent=2)
+
+    if regression_list:
+        print(f'Regression in {len(regression_list)!s} case(s): {", ".join(regression_list)!s}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,7 +2,20 @@
 #  todo consider to implement independent container call, to make possible (eg. subscribe FUNCTION on EVENT_DISPATCHER)
 #  todo add typing.Set, etc, fixme: here is recursion so make it as property
 
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
+import gc
+import os
+import re
+import sys
+import threading
+import time
+import types
 import typing
+import weakref
 
 import psr.container
 import md.python
@@ -22,13 +35,25 @@ __all__ = (
     'ClassNotFoundException',
     'ServiceCircularReferenceException',
     'InvalidDefinitionConfigurationException',
+    'ServiceRetrievalException',
+    'ServiceDisposalException',
+    'ParameterNotFoundException',
+    'InvalidParameterConfigurationException',
     # Entities
     'Reference',
     'Definition',
     'Callable',
+    'Tagged',
+    'Retention',
+    'Parameter',
+    'Env',
     'Configuration',
+    'PoolStatistics',
     # Components
     'Container',
+    'Scope',
+    'LazyProxy',
+    'InstrumentationInterface',
     # Internals
     'dereference',
     'reference',
@@ -40,14 +65,16 @@ FactoryType = typing.Union[
     typing.Tuple[
         typing.Union[
             'Reference',
-            type  # module or class (type)
+            type,  # module or class (type)
+            str,  # module or class path, it is imported on first instantiation
         ],
         str  # function or method name
     ],
     typing.Callable[  # cls
         ...,  # definition arguments
         object  # service instance
-    ]
+    ],
+    str,  # function path, it is imported on first instantiation
 ]
 DefinitionTagType = typing.Dict[str, typing.Any]
 DefinitionCallType = typing.Tuple[
@@ -55,6 +82,8 @@ DefinitionCallType = typing.Tuple[
     typing.Tuple[typing.Any],  # sequential method argument list
     typing.Dict[str, typing.Any]  # named method arguments dictionary
 ]
+ResolverType = typing.Callable[['Container'], typing.Any]  # resolves argument value in container
+_undefined = object()
 
 
 # Exception
@@ -70,27 +99,76 @@ class InvalidDefinitionConfigurationException(RuntimeError, psr.container.Contai
     pass
 
 
+class ParameterNotFoundException(RuntimeError, psr.container.ContainerExceptionInterface):
+    pass
+
+
+class InvalidParameterConfigurationException(RuntimeError, psr.container.ContainerExceptionInterface):
+    pass
+
+
+class ServiceRetrievalException(RuntimeError, psr.container.ContainerExceptionInterface):
+    """ Some of requested services could not be retrieved, see `Container.get_many` """
+    def __init__(
+        self,
+        error_map: typing.Dict[typing.Union[str, type], Exception],
+        instance_map: typing.Dict[typing.Union[str, type], object],
+    ) -> None:
+        super().__init__(
+            f'Unable to retrieve {len(error_map)!s} service(s): ' +
+            ', '.join(f'`{id_!s}` ({error!s})' for id_, error in error_map.items())
+        )
+        self.error_map = error_map  # requested id -> error
+        self.instance_map = instance_map  # requested id -> instance, for retrieved services
+
+
+class ServiceDisposalException(RuntimeError, psr.container.ContainerExceptionInterface):
+    """ Some of services could not be disposed (or disposal is timed out), see `Container.close` """
+    def __init__(self, error_map: typing.Dict[str, Exception]) -> None:
+        super().__init__(
+            f'Unable to dispose {len(error_map)!s} service(s): ' +
+            ', '.join(f'`{id_!s}` ({error!r})' for id_, error in error_map.items())
+        )
+        self.error_map = error_map  # service id -> error, in disposal order
+
+
 # Entity
 class Reference:
     """ References to a service definition """
-    def __init__(self, id_: str) -> None:
+    __slots__ = ('id', 'lazy')
+
+    def __init__(self, id_: str, lazy: bool = False) -> None:
         self.id = id_
+        self.lazy = lazy  # inject proxy, when service is not created yet
 
     def __repr__(self) -> str:
+        if self.lazy:
+            return f'Reference(id_={self.id!r}, lazy={self.lazy!r})'
         return f'Reference(id_={self.id!r})'
 
 
 class Definition:
     """ Service definition — the instruction how to build service """
+    __slots__ = (
+        'class_', 'factory', 'arguments', 'calls', 'public', 'shared', 'tags', 'lazy', 'scope', 'pool', 'reset', 'retention',
+        'dispose',
+    )
+
     def __init__(
         self,
-        class_: typing.Optional[type] = None,
+        class_: typing.Optional[typing.Union[type, str]] = None,  # class or class path (e.g. `package.module.Class`)
         factory: typing.Optional[FactoryType] = None,
         arguments: typing.Dict[str, typing.Any] = None,
         calls: typing.List[DefinitionCallType] = None,
         public: bool = False,
         shared: bool = True,
         tags: typing.List[DefinitionTagType] = None,
+        lazy: bool = False,
+        scope: typing.Optional[str] = None,
+        pool: typing.Optional[int] = None,
+        reset: typing.List[DefinitionCallType] = None,
+        retention: typing.Optional['Retention'] = None,
+        dispose: typing.Union[str, bool, None] = None,
     ) -> None:
         assert (class_ is None) ^ (factory is None), 'Only one of `cls` and `class` options allowed'
 
@@ -101,6 +179,13 @@ class Definition:
         self.public = public
         self.shared = shared
         self.tags = tags or []
+        self.lazy = lazy  # service is created on first proxy access
+        self.scope = scope  # name of container scope (e.g. `request`), which service instance is bound to
+        self.pool = pool  # max count of idle instances of non-shared service, see `Container.acquire`
+        self.reset = reset or []  # calls performed on instance return into the pool
+        self.retention = retention  # shared service instance is held by container until it is evicted by the policy
+        # disposal method name, `None` detects `close` (or `__exit__`) method, `False` disables disposal
+        self.dispose = dispose
 
     def has_tag(self, tag: str) -> bool:
         # Warning: case-sensitive
@@ -116,15 +201,19 @@ class Definition:
                 yield tag_
 
     def __repr__(self) -> str:
-        class_ = f'dereference("{reference(self.class_)!r}")' if self.class_ else None
+        class_ = f'dereference("{reference(self.class_)!r}")' if isinstance(self.class_, type) else repr(self.class_)
 
         return f'Definition(' \
             f'class_={class_!s}, factory={self.factory!r}, '\
             f'arguments={self.arguments!r}, calls={self.calls!r}, ' \
-            f'public={self.public!r}, shared={self.shared!r}, tags={self.tags!r})'
+            f'public={self.public!r}, shared={self.shared!r}, tags={self.tags!r}, lazy={self.lazy!r}, ' \
+            f'scope={self.scope!r}, pool={self.pool!r}, reset={self.reset!r}, retention={self.retention!r}, ' \
+            f'dispose={self.dispose!r})'
 
 
 class Callable:
+    __slots__ = ('holder', 'method')
+
     def __init__(self, holder: typing.Union[Reference], method: str) -> None:
         self.holder = holder
         self.method = method
@@ -133,8 +222,87 @@ class Callable:
         return f'Callable(holder={self.holder!r}, method={self.method!r})'
 
 
+class Tagged:
+    """ Argument, which is resolved into (lazy) iterable of services tagged with `tag` """
+    __slots__ = ('tag', 'priority')
+
+    def __init__(self, tag: str, priority: str = None) -> None:
+        self.tag = tag
+        self.priority = priority  # tag attribute name, services with greater priority go first
+
+    def __repr__(self) -> str:
+        return f'Tagged(tag={self.tag!r}, priority={self.priority!r})'
+
+
+class Retention:
+    """
+    Shared service retention policy: service instance is evicted (and disposed) by the container,
+    when it is idle for `idle_ttl` seconds, when it is least recently used service of the `group`
+    (services tagged with `group` tag), which exceeds `capacity` or `memory_budget` (bytes, service size is
+    `memory` attribute of the tag), or when it is not referenced anymore (`weak`).
+    Evicted service is created again on next retrieval
+    """
+    __slots__ = ('idle_ttl', 'weak', 'group', 'capacity', 'memory_budget')
+
+    def __init__(
+        self,
+        idle_ttl: typing.Optional[float] = None,
+        weak: bool = False,
+        group: typing.Optional[str] = None,
+        capacity: typing.Optional[int] = None,
+        memory_budget: typing.Optional[int] = None,
+    ) -> None:
+        self.idle_ttl = idle_ttl
+        self.weak = weak
+        self.group = group  # services of the group should have the same capacity and memory budget
+        self.capacity = capacity  # max count of group services held
+        self.memory_budget = memory_budget  # max memory of group services held
+
+    def __repr__(self) -> str:
+        return (
+            f'Retention(idle_ttl={self.idle_ttl!r}, weak={self.weak!r}, group={self.group!r}, '
+            f'capacity={self.capacity!r}, memory_budget={self.memory_budget!r})'
+        )
+
+
+class Parameter:
+    """ Argument, which is resolved into container parameter value """
+    __slots__ = ('name', )
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f'Parameter(name={self.name!r})'
+
+
+class Env:
+    """
+    Parameter (or argument) value, which is read from environment variable on container load
+    and converted with `cast` (`bool` accepts `1`, `true`, `yes`, `on` and `0`, `false`, `no`, `off`, `` values)
+    """
+    __slots__ = ('name', 'cast', 'default')
+
+    def __init__(self, name: str, cast: typing.Callable[[str], typing.Any] = str, default: typing.Any = _undefined) -> None:
+        self.name = name
+        self.cast = cast
+        self.default = default  # value (is not converted) when variable is not set, variable is required by default
+
+    def __repr__(self) -> str:
+        if self.default is _undefined:
+            return f'Env(name={self.name!r}, cast={self.cast!r})'
+        return f'Env(name={self.name!r}, cast={self.cast!r}, default={self.default!r})'
+
+    def __reduce__(self) -> tuple:
+        if self.default is _undefined:  # sentinel identity is not kept by pickle
+            return Env, (self.name, self.cast)
+        return Env, (self.name, self.cast, self.default)
+
+
 class Configuration:
     """ Container configuration """
+    __slots__ = ('parameter_map', 'definition_map', 'definition_alias_map', '_tag_index', '__weakref__')
+
     def __init__(
         self,
         parameter_map: typing.Dict[str, typing.Any] = None,
@@ -144,6 +312,30 @@ class Configuration:
         self.parameter_map = parameter_map or {}
         self.definition_map: typing.Dict[str, Definition] = definition_map or {}
         self.definition_alias_map: typing.Dict[str, str] = definition_alias_map or {}
+        # tag name -> (service id, tag attributes) list, built on first use
+        self._tag_index: typing.Optional[typing.Dict[str, typing.List[typing.Tuple[str, DefinitionTagType]]]] = None
+
+    def find_tagged(self, tag: str) -> typing.List[typing.Tuple[str, DefinitionTagType]]:
+        """
+        Returns (service id, tag attributes) pairs of definitions tagged with `tag` (case-sensitive),
+        definition tagged several times has a pair per tag
+        """
+        if self._tag_index is None:
+            self._tag_index = _create_tag_index(definition_map=self.definition_map)
+
+        return self._tag_index.get(tag, [])
+
+    def reindex(self) -> None:
+        """ Drops tag index, it is required when definitions (or their tags) are modified after index is used """
+        self._tag_index = None
+
+    def freeze(self) -> 'Configuration':
+        """
+        Returns immutable copy of configuration, which could be shared among containers, threads
+        and processes (after fork): maps are read-only, lists are tuples, equal references are the same object.
+        List and dictionary arguments of frozen definitions are resolved into new list and dictionary.
+        """
+        return _Freezer().freeze_configuration(configuration=self)
 
     def __repr__(self) -> str:
         return (
@@ -153,24 +345,102 @@ class Configuration:
         )
 
 
+class PoolStatistics:
+    """ Pooled service statistics, see `Container.get_pool_statistics` """
+    def __init__(self, size: int, idle_count: int, hit_count: int, miss_count: int, discard_count: int) -> None:
+        self.size = size  # max count of idle instances
+        self.idle_count = idle_count  # instances in the pool
+        self.hit_count = hit_count  # instance is taken from the pool
+        self.miss_count = miss_count  # pool is empty, instance is created
+        self.discard_count = discard_count  # returned instance is dropped, pool is full (or reset failed)
+
+    def __repr__(self) -> str:
+        return (
+            f'PoolStatistics(size={self.size!r}, idle_count={self.idle_count!r}, hit_count={self.hit_count!r}, '
+            f'miss_count={self.miss_count!r}, discard_count={self.discard_count!r})'
+        )
+
+
+class _Plan:
+    """ Definition instantiation plan: definition arguments, factory and calls, classified once """
+    __slots__ = ('definition', 'argument_map', 'argument_resolver_list', 'factory', 'factory_resolver', 'call_list')
+
+    def __init__(
+        self,
+        definition: Definition,
+        argument_map: typing.Dict[str, typing.Any],
+        argument_resolver_list: typing.Tuple[typing.Tuple[str, ResolverType], ...],
+        factory: typing.Optional[typing.Callable[..., object]],
+        factory_resolver: typing.Optional[ResolverType],
+        call_list: typing.Tuple[
+            typing.Tuple[
+                str,  # method name
+                typing.Tuple[ResolverType, ...],  # sequential method argument resolver list
+                typing.Tuple[typing.Tuple[str, ResolverType], ...]  # named method argument resolvers
+            ],
+            ...
+        ],
+    ) -> None:
+        self.definition = definition
+        self.argument_map = argument_map  # arguments which require no resolution
+        self.argument_resolver_list = argument_resolver_list
+        self.factory = factory
+        self.factory_resolver = factory_resolver  # when factory is a service, or service method
+        self.call_list = call_list
+
+
+class _PlanCache:
+    """ Definition plans of the configuration, grouped by resolved parameter values plans depend on """
+    __slots__ = ('_entry_list', )
+
+    def __init__(self) -> None:
+        # (parameter values, plan map name -> definition -> plan) pairs
+        self._entry_list: typing.List[typing.Tuple[typing.Dict[str, typing.Any], typing.Dict[str, dict]]] = []
+
+    def get_plan_map(self, parameter_map: typing.Dict[str, typing.Any], name: str) -> typing.Dict[Definition, typing.Any]:
+        for parameter_map_, plan_map_map in self._entry_list:
+            if parameter_map_ == parameter_map:
+                break
+        else:
+            plan_map_map = {}
+            self._entry_list.append((dict(parameter_map), plan_map_map))
+        return plan_map_map.setdefault(name, {})
+
+
+# configuration -> plans, configuration (and its plans) could be collected once it is not used by containers
+_plan_cache_map: 'weakref.WeakKeyDictionary[Configuration, _PlanCache]' = weakref.WeakKeyDictionary()
+
+
 # Components
 class Container(psr.container.ContainerInterface):
     """ Not thread-safe """
-    def __init__(self,  configuration: Configuration = None) -> None:
+    _parent: typing.Optional['Container'] = None  # root container has no parent
+    _scope_name: typing.Optional[str] = None  # root container holds instances of services without scope
+    _fork_unsafe_id_set: typing.FrozenSet[str] = frozenset()  # services to be created again in forked process
+    _instrumentation: typing.Optional['InstrumentationInterface'] = None
+
+    def __init__(self,  configuration: Configuration = None, validated: bool = False) -> None:
+        """
+        When configuration is `validated` (e.g. with `md.di.analysis.Analyzer`),
+        circular reference is not checked on service instantiation
+        """
         self._configuration = configuration if configuration else Configuration()
-
-        self._configuration.definition_alias_map.update({
-            'container': 'md.di.Container',
-            'psr.container.ContainerInterface': 'md.di.Container',
-        })
-
-        self._configuration.definition_map['md.di.Container'] = Definition(factory=lambda: self)  # hack  # FIXME
+        self._validated = validated
+        self._parameter_resolver = _ParameterResolver(configuration=self._configuration)
+        self._parameter_resolver.load()
 
         # runtime
-        self._instance_map: typing.Dict[str, object] = {
-            'md.di.Container': self  # synthetic service
-        }
+        # container is a synthetic service, it is not added to configuration, so configuration could be shared
+        self._instance_map: typing.Dict[str, object] = dict.fromkeys(_container_id_set, self)
         self._loading_service_list: typing.List[str] = []  # stack of loading services
+        self._plan_map: typing.Dict[Definition, _Plan] = self._get_plan_map()  # definition -> plan
+        # requested id (service id or class) -> public shared service instance, see `get`
+        self._retrieval_map: typing.Dict[typing.Union[str, type], object] = {}
+        self._service_id_map: typing.Dict[type, str] = {}  # class -> service id (reference)
+        self._pool_map: typing.Dict[str, _Pool] = {}  # pooled service id -> pool
+        self._retention_store = _RetentionStore()  # instances of services with retention policy
+        self._checked_retention_id_set: typing.Set[str] = set()  # retained services, which are not held by others
+        self._construction_map: typing.Dict[str, Definition] = {}  # created shared service id -> definition, in order
 
     def _get_definition(self, id_: str) -> Definition:
         """ Returns class definition if exists (or alias destination)"""
@@ -178,33 +448,169 @@ class Container(psr.container.ContainerInterface):
             id_ = self._configuration.definition_alias_map[id_]
 
         if id_ not in self._configuration.definition_map:
+            if id_ in _container_id_set:
+                return _container_definition
             raise ClassNotFoundException(f'Definition `{id_!s}` not found')
 
         return self._configuration.definition_map[id_]
 
+    def get_parameter(self, name: str) -> typing.Any:
+        """ Returns resolved parameter value, parameters are resolved once, on container load """
+        return self._parameter_resolver.get(name=name)
+
+    def has_parameter(self, name: str) -> bool:
+        return self._parameter_resolver.has(name=name)
+
     def _resolve_argument(self, argument: typing.Any) -> typing.Any:
+        argument = self._parameter_resolver.resolve(value=argument)
+        resolver = self._compile_argument(argument=argument)
+        if resolver is None:
+            return argument
+        return resolver(self)
+
+    def _compile_argument(self, argument: typing.Any) -> typing.Optional[ResolverType]:
+        """ Returns argument resolver, or `None` when argument is a value and requires no resolution """
         if isinstance(argument, Reference):
-            return self._get_instance(id_=argument.id)
+            id_ = argument.id
+            if argument.lazy:
+                return lambda container: container._get_lazy_instance(id_=id_)
+
+            if isinstance(self._configuration, _FrozenConfiguration):
+                # definition could not be replaced, so resolver is bound to it and skips alias and definition lookup
+                try:
+                    service_id = self._configuration.definition_alias_map.get(id_, id_)
+                    service_id = self._reference(id_=service_id)  # e.g. live container resolves interface id
+                    definition = self._get_definition(id_=service_id)
+                except Exception:  # error is raised on resolution
+                    pass
+                else:
+                    return lambda container: container._get_instance(id_=service_id, definition=definition)
+            return lambda container: container._get_instance(id_=id_)
 
         if isinstance(argument, Definition):  # todo consider to remove this scope in favor for pre-resolution & reference to it
-            return self._get_instance(
-                id_=str(hash(argument)),  # fixme what if argument is not hashable ?
-                definition=argument,
-            )
+            definition_id = str(hash(argument))
+            return lambda container: container._get_instance(id_=definition_id, definition=argument)
 
         if isinstance(argument, Callable):
-            return self._resolve_callable(holder_reference=argument.holder, method_name=argument.method)
-
-        if isinstance(argument, list):  # todo consider to use iterable instead
-            for index, value in enumerate(argument):
-                argument[index] = self._resolve_argument(argument=value)  # todo check is overriding is ok ?
-            return argument
+            holder, method_name = argument.holder, argument.method
+            return lambda container: container._resolve_callable(holder_reference=holder, method_name=method_name)
+
+        if isinstance(argument, Tagged):
+            id_list = self._find_tagged_id_list(tagged=argument)
+            return lambda container: _TaggedIterable(container=container, id_list=id_list)
+
+        if isinstance(argument, (list, _FrozenList)):  # todo consider to use iterable instead
+            resolver_list = [self._compile_argument(argument=value) for value in argument]
+            if not any(resolver_list):
+                if isinstance(argument, list):
+                    return None
+                return lambda container: list(argument)  # frozen list is resolved into new list
+
+            resolver_list = [
+                _constant_resolver(value) if resolver is None else resolver
+                for value, resolver in zip(argument, resolver_list)
+            ]
+            return lambda container: [resolver(container) for resolver in resolver_list]
 
         if isinstance(argument, dict):
-            for key, value in argument.items():
-                argument[key] = self._resolve_argument(argument=value)  # todo check is overriding is ok ?
-            return argument
-        return argument
+            resolver_map = {key: self._compile_argument(argument=value) for key, value in argument.items()}
+            if not any(resolver_map.values()):
+                if not isinstance(argument, _FrozenDict):
+                    return None
+                return lambda container: dict(argument)  # frozen dictionary is resolved into new dictionary
+
+            resolver_map = {
+                key: _constant_resolver(argument[key]) if resolver is None else resolver
+                for key, resolver in resolver_map.items()
+            }
+            return lambda container: {key: resolver(container) for key, resolver in resolver_map.items()}
+        return None
+
+    def _compile_factory(
+        self,
+        definition: Definition,
+    ) -> typing.Tuple[typing.Optional[typing.Callable[..., object]], typing.Optional[ResolverType]]:
+        """ Returns factory, when it is known before instantiation, or factory resolver otherwise """
+        factory = definition.factory
+        if not factory:
+            if isinstance(definition.class_, str):  # class is imported on first instantiation
+                return dereference(class_qualname=definition.class_), None
+            return definition.class_, None
+
+        if isinstance(factory, str):
+            factory = _import(qualname=factory)
+
+        if isinstance(factory, tuple):
+            holder_reference, method_name = factory
+            if isinstance(holder_reference, Reference):
+                return None, lambda container: container._resolve_callable(holder_reference, method_name)
+            return self._resolve_callable(holder_reference, method_name), None
+
+        if callable(factory):  # todo consider to check does it requires arguments ?
+            return factory, None
+
+        if isinstance(factory, Reference):
+            return None, lambda container: container._resolve_callable(factory, None)
+
+        raise NotImplementedError
+
+    def _create_plan(self, definition: Definition) -> '_Plan':
+        argument_map = {}
+        argument_resolver_list = []
+        resolve_parameters = self._parameter_resolver.resolve  # parameters are substituted once, on plan creation
+        for argument_key, argument_value in definition.arguments.items():
+            argument_value = resolve_parameters(value=argument_value)
+            resolver = self._compile_argument(argument=argument_value)
+            if resolver is None:
+                argument_map[argument_key] = argument_value
+            else:
+                argument_resolver_list.append((argument_key, resolver))
+
+        factory, factory_resolver = self._compile_factory(definition=definition)
+        return _Plan(
+            definition=definition,
+            argument_map=argument_map,
+            argument_resolver_list=tuple(argument_resolver_list),
+            factory=factory,
+            factory_resolver=factory_resolver,
+            call_list=self._compile_call_list(call_list=definition.calls),
+        )
+
+    def _compile_call_list(self, call_list: typing.Iterable[DefinitionCallType]) -> tuple:
+        """ Returns (method name, sequential argument resolvers, named argument resolvers) triples """
+        resolve_parameters = self._parameter_resolver.resolve
+        compiled_call_list = []
+        for method_name, argument_list, call_argument_map in call_list:
+            argument_list = [resolve_parameters(value=value) for value in argument_list]
+            call_argument_map = {key: resolve_parameters(value=value) for key, value in call_argument_map.items()}
+            compiled_call_list.append((
+                method_name,
+                tuple(self._compile_argument(argument=value) or _constant_resolver(value) for value in argument_list),
+                tuple(
+                    (key, self._compile_argument(argument=value) or _constant_resolver(value))
+                    for key, value in call_argument_map.items()
+                ),
+            ))
+        return tuple(compiled_call_list)
+
+    def _get_plan_map(self, name: str = 'plan') -> typing.Dict[Definition, typing.Any]:
+        """
+        Returns definition plans shared by containers (and their scopes) of the configuration, plans take container
+        as an argument; containers with different parameter values have their own plans
+        """
+        try:
+            plan_cache = _plan_cache_map[self._configuration]
+        except KeyError:
+            plan_cache = _plan_cache_map.setdefault(self._configuration, _PlanCache())
+        return plan_cache.get_plan_map(parameter_map=self._parameter_resolver.value_map, name=name)
+
+    def _get_plan(self, definition: Definition) -> '_Plan':
+        """ Returns definition plan, creates it on first use """
+        try:
+            return self._plan_map[definition]
+        except KeyError:
+            plan = self._plan_map[definition] = self._create_plan(definition=definition)
+            return plan
 
     def _get_instance(self, id_: str, definition: Definition = None) -> object:
         try:
@@ -213,38 +619,270 @@ class Container(psr.container.ContainerInterface):
             raise Exception(f'Unable to retrieve service instance `{id_!s}`') from e  # fixme
 
         if not definition.shared:  # if service id is aliased, then check is resolved definition shared
-            return self._create_instance(id_=id_, definition=definition)
+            return self._instantiate(id_=id_, definition=definition)
 
         if id_ in self._configuration.definition_alias_map:
             # if service is aliased, then use destination definition instance
             id_ = self._configuration.definition_alias_map[id_]
 
         if id_ not in self._instance_map:
-            self._create_instance(id_=id_, definition=definition)
+            if definition.retention is not None and definition.scope is None:
+                return self._get_retained_instance(id_=id_, definition=definition)
+
+            self._instantiate(id_=id_, definition=definition)
             assert id_ in self._instance_map
 
         return self._instance_map[id_]
 
-    def _resolve_factory(self, factory: FactoryType) -> typing.Callable[..., object]:
-        if isinstance(factory, tuple):
-            holder_reference, method_name = factory
-            return self._resolve_callable(holder_reference, method_name)
+    def _get_retained_instance(self, id_: str, definition: Definition) -> object:
+        """ Returns instance of service with retention policy, creates it when it is not held (or evicted) """
+        instance = self._find_retained_instance(id_=id_)
+        if instance is _undefined:
+            self._check_retention(id_=id_, definition=definition)
+            self._create_instance(id_=id_, definition=definition)  # retained service is not lazy
+            instance = self._retain(id_=id_, definition=definition)
+        return instance
 
-        if callable(factory):  # todo consider to check does it requires arguments ?
-            return factory
+    def _check_retention(self, id_: str, definition: Definition) -> None:
+        """
+        Checks retained service is not held by shared services (directly or through non-shared ones),
+        they would use disposed instance after eviction; weak retention evicts instance, which is not held anyway
+        """
+        retention = definition.retention
+        if id_ in self._checked_retention_id_set or retention.idle_ttl is None and retention.group is None:
+            return
+
+        definition_map = self._configuration.definition_map
+        dependant_id_list = sorted(
+            dependant_id for dependant_id in self._find_dependant_id_set(id_list=[id_], eager=True)
+            if dependant_id != id_ and dependant_id in definition_map and definition_map[dependant_id].shared
+        )
+        if dependant_id_list:
+            raise InvalidDefinitionConfigurationException(
+                f'Service `{id_!s}` with idle or group retention could not be held by shared services: ' +
+                ', '.join(f'`{dependant_id!s}`' for dependant_id in dependant_id_list) +
+                ' (consider weak retention)'
+            )
+        self._checked_retention_id_set.add(id_)
 
-        if isinstance(factory, Reference):
-            instance = self._get_instance(id_=factory.id)
-            assert callable(instance)
-            return instance
+    def _find_retained_instance(self, id_: str) -> object:
+        instance, evicted_list = self._retention_store.get(id_=id_, now=time.monotonic())
+        self._dispose_evicted(evicted_list=evicted_list, suppress=True)
+        return instance
 
-        raise NotImplementedError
+    def _retain(self, id_: str, definition: Definition) -> object:
+        """ Moves created service instance into retention store """
+        instance = self._instance_map.pop(id_)
+        evicted_list = self._retention_store.put(id_=id_, definition=definition, instance=instance, now=time.monotonic())
+        # retrieval should not fail, when another service could not be disposed
+        self._dispose_evicted(evicted_list=evicted_list, suppress=True)
+        return instance
+
+    def evict(self, id_: str = None) -> None:
+        """
+        Drops shared service instance and disposes it (calls its `close` method if any),
+        service is created again on next retrieval (dependant services keep the instance they are created with).
+        Without `id_`, drops services with retention policy, which idle time is expired (or which are collected),
+        it could be called periodically by idle process; policies are also applied on retrieval
+        """
+        if id_ is None:
+            evicted_list = self._retention_store.evict(now=time.monotonic())
+        else:
+            id_ = self._configuration.definition_alias_map.get(id_, id_)
+            if id_ in _container_id_set:
+                raise InvalidDefinitionConfigurationException('Container could not be evicted')
+
+            evicted_list = self._retention_store.remove(id_=id_)
+            self._construction_map.pop(id_, None)
+            instance = self._instance_map.pop(id_, _undefined)
+            if instance is not _undefined:
+                evicted_list.append((id_, instance))
+            self._retrieval_map.clear()
+        self._dispose_evicted(evicted_list=evicted_list, suppress=False)
+
+    def _dispose_evicted(self, evicted_list: typing.List[typing.Tuple[str, object]], suppress: bool) -> None:
+        """ Disposes evicted instances, first error is raised after all instances are disposed, unless `suppress` """
+        error = None
+        for id_, instance in evicted_list:
+            if isinstance(instance, LazyProxy):
+                continue  # service is not created
+            try:
+                _dispose(instance=instance, definition=self._configuration.definition_map.get(id_))
+            except Exception as e:
+                error = error or e
+        if error is not None and not suppress:
+            raise error
+
+    def close(self, max_workers: int = None, timeout: float = None) -> None:
+        """
+        Disposes created shared services (calls their disposal method, see `Definition.dispose`)
+        in reverse dependency order, they are created again on next retrieval.
+        Services are disposed one by one in reverse creation order, unless `max_workers` or `timeout` is set:
+        then independent services are disposed concurrently in threads, disposal of a service is awaited
+        for `timeout` seconds (it is not interrupted, its dependencies are disposed then).
+        `ServiceDisposalException` is raised after all services are disposed
+        """
+        instance_map = self._take_disposable_instance_map()
+        if max_workers is None and timeout is None:
+            error_map = {}
+            for id_, (instance, definition) in reversed(list(instance_map.items())):
+                try:
+                    _dispose(instance=instance, definition=definition)
+                except Exception as e:  # rest services are disposed anyway
+                    error_map[id_] = e
+        else:
+            error_map = self._dispose_concurrently(instance_map=instance_map, max_workers=max_workers, timeout=timeout)
+
+        if error_map:
+            raise ServiceDisposalException(error_map=error_map) from next(iter(error_map.values()))
+
+    def __enter__(self) -> 'Container':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _take_disposable_instance_map(self) -> typing.Dict[str, typing.Tuple[object, Definition]]:
+        """ Drops created shared services, returns service id -> (instance, definition) in creation order """
+        construction_map, self._construction_map = self._construction_map, {}
+        retained_instance_map = {}
+        if self._parent is None:  # retention store is shared by container scopes
+            retained_instance_map = dict(self._retention_store.clear())
+
+        instance_map = {}
+        for id_, definition in construction_map.items():
+            instance = self._instance_map.get(id_, retained_instance_map.get(id_, _undefined))
+            if instance is not _undefined:  # evicted one is disposed already
+                instance_map[id_] = (instance, definition)
+
+        self._instance_map = dict.fromkeys(_container_id_set, self)
+        self._retrieval_map = {}
+        return instance_map
+
+    def _dispose_concurrently(
+        self,
+        instance_map: typing.Dict[str, typing.Tuple[object, Definition]],
+        max_workers: typing.Optional[int],
+        timeout: typing.Optional[float],
+    ) -> typing.Dict[str, Exception]:
+        """ Disposes services in threads, service is disposed once services depending on it are disposed """
+        dependency_map = self._create_disposal_dependency_map(id_list=list(instance_map))
+        dependant_count_map = dict.fromkeys(instance_map, 0)
+        for dependency_id_list in dependency_map.values():
+            for dependency_id in dependency_id_list:
+                dependant_count_map[dependency_id] += 1
+        ready_id_list = [id_ for id_ in reversed(list(instance_map)) if not dependant_count_map[id_]]
+
+        max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)  # the same as executor default
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        pending_map: typing.Dict[concurrent.futures.Future, typing.Tuple[str, typing.Optional[float]]] = {}
+        error_map: typing.Dict[str, Exception] = {}
+        try:
+            while ready_id_list or pending_map:
+                # disposal is submitted when worker is free, so its timeout is not spent in executor queue
+                while ready_id_list and len(pending_map) < max_workers:
+                    id_ = ready_id_list.pop(0)
+                    instance, definition = instance_map[id_]
+                    future = executor.submit(_dispose, instance, definition)
+                    pending_map[future] = (id_, None if timeout is None else time.monotonic() + timeout)
+
+                deadline = min((deadline for _, deadline in pending_map.values() if deadline is not None), default=None)
+                done_set, _ = concurrent.futures.wait(
+                    pending_map,
+                    timeout=None if deadline is None else max(0.0, deadline - time.monotonic()),
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+
+                now = time.monotonic()
+                for future, (id_, deadline) in list(pending_map.items()):
+                    if future in done_set:
+                        error = future.exception()
+                    elif deadline is not None and deadline <= now:
+                        error = TimeoutError(f'Service `{id_!s}` is not disposed in {timeout!s} seconds')
+                    else:
+                        continue
+
+                    del pending_map[future]
+                    if error is not None:
+                        error_map[id_] = error
+                    for dependency_id in dependency_map[id_]:
+                        dependant_count_map[dependency_id] -= 1
+                        if not dependant_count_map[dependency_id]:
+                            ready_id_list.append(dependency_id)
+        finally:
+            executor.shutdown(wait=False)  # timed out disposal is not awaited
+        return error_map
+
+    def _create_disposal_dependency_map(self, id_list: typing.List[str]) -> typing.Dict[str, typing.List[str]]:
+        """
+        Returns service id -> ids of listed services it (transitively, through non-listed services) depends on;
+        `id_list` is in creation order, dependency created after the service (e.g. by calls) is ignored,
+        so there is no circular dependencies
+        """
+        definition_map = self._configuration.definition_map
+        definition_alias_map = self._configuration.definition_alias_map
+        index_map = {id_: index for index, id_ in enumerate(id_list)}
+
+        dependency_map = {}
+        for id_ in id_list:
+            dependency_id_list = []
+            visited_id_set = {id_}
+            pending_id_list = [id_]
+            while pending_id_list:
+                definition = definition_map.get(pending_id_list.pop())
+                if definition is None:
+                    continue
+
+                for reference_ in _iterate_definition_references(definition=definition, configuration=self._configuration):
+                    dependency_id = definition_alias_map.get(reference_.id, reference_.id)
+                    if dependency_id in visited_id_set:
+                        continue
+                    visited_id_set.add(dependency_id)
+
+                    if dependency_id not in index_map:
+                        pending_id_list.append(dependency_id)  # e.g. non-shared service holds its dependencies
+                    elif index_map[dependency_id] < index_map[id_]:
+                        dependency_id_list.append(dependency_id)
+            dependency_map[id_] = dependency_id_list
+        return dependency_map
+
+    def _instantiate(self, id_: str, definition: Definition) -> object:
+        """ Creates service instance, or proxy for lazy service """
+        if definition.scope is not None and definition.scope != self._scope_name:
+            raise InvalidDefinitionConfigurationException(
+                f'Unable to retrieve service `{id_!s}` out of `{definition.scope!s}` scope'
+            )
+
+        if not definition.lazy:
+            return self._create_instance(id_=id_, definition=definition)
+
+        proxy = LazyProxy(factory=functools.partial(self._create_lazy_instance, id_, definition))
+        if definition.shared:
+            self._instance_map[id_] = proxy  # replaced with instance on first proxy access
+        return proxy
 
-    def _resolve_callable(self, holder_reference: typing.Union[type, Reference], method_name: str) -> typing.Callable:
+    def _create_lazy_instance(self, id_: str, definition: Definition) -> object:
+        """ Creates lazy service instance on first proxy access """
+        return self._create_instance(id_=id_, definition=definition)
+
+    def _get_lazy_instance(self, id_: str) -> object:
+        """ Returns shared service instance if it is created, or proxy otherwise """
+        instance_id = self._configuration.definition_alias_map.get(id_, id_)
+        if instance_id in self._instance_map:
+            return self._instance_map[instance_id]
+        return LazyProxy(factory=functools.partial(self._get_instance, id_))
+
+    def _resolve_callable(
+        self,
+        holder_reference: typing.Union[type, Reference, str],
+        method_name: typing.Optional[str],
+    ) -> typing.Callable:
         holder = holder_reference
 
         if isinstance(holder_reference, Reference):
             holder = self._get_instance(id_=holder_reference.id)
+        elif isinstance(holder_reference, str):
+            holder = _import(qualname=holder_reference)
 
         resolved_callable = holder
         if method_name:
@@ -265,27 +903,29 @@ class Container(psr.container.ContainerInterface):
 
     def _create_instance(self, id_: str, definition: Definition) -> object:
         """ Creates and returns new instance """
+        plan = self._get_plan(definition=definition)
+        resolved_argument_map = plan.argument_map.copy()
+
+        if self._validated:
+            for argument_key, resolver in plan.argument_resolver_list:
+                resolved_argument_map[argument_key] = resolver(self)
+        else:
+            if id_ in self._loading_service_list:
+                raise ServiceCircularReferenceException(
+                    f'The service `{id_!s}` has a circular reference to itself: ' +
+                    ' -> '.join(self._loading_service_list + [id_])
+                )
+
+            self._loading_service_list.append(id_)
+            try:
+                for argument_key, resolver in plan.argument_resolver_list:
+                    resolved_argument_map[argument_key] = resolver(self)
+            finally:
+                self._loading_service_list.pop()
 
-        if id_ in self._loading_service_list:
-            raise ServiceCircularReferenceException(
-                f'The service `{id_!s}` has a circular reference to itself: ' +
-                ' -> '.join(self._loading_service_list + [id_])
-            )
-
-        self._loading_service_list.append(id_)
-
-        # todo consider to add support for list arguments
-
-        resolved_argument_map = {}
-        for argument_key, argument_value in definition.arguments.items():
-            resolved_argument_map[argument_key] = self._resolve_argument(argument=argument_value)
-
-        self._loading_service_list.pop()
-
-        factory = definition.class_
-
-        if definition.factory:
-            factory = self._resolve_factory(factory=definition.factory)
+        factory = plan.factory
+        if plan.factory_resolver:
+            factory = plan.factory_resolver(self)
 
         try:
             instance = factory(**resolved_argument_map)
@@ -298,9 +938,24 @@ class Container(psr.container.ContainerInterface):
                 f'Unable to initialize service `{id_!s}`'
             ) from e
 
+        if not definition.shared:
+            self._perform_call_list(id_=id_, instance=instance, call_list=plan.call_list)
+            return instance
+
         self._instance_map[id_] = instance
+        try:
+            self._perform_call_list(id_=id_, instance=instance, call_list=plan.call_list)
+        finally:  # instance is kept when calls fail, so it is disposed as well
+            self._record_construction(id_=id_, definition=definition)
+        return instance
+
+    def _record_construction(self, id_: str, definition: Definition) -> None:
+        """ Adds created shared service, dependencies are created before, so they are disposed after """
+        self._construction_map.pop(id_, None)  # e.g. evicted service is created again, it is disposed before others
+        self._construction_map[id_] = definition
 
-        for method_name, argument_list, argument_map in definition.calls:
+    def _perform_call_list(self, id_: str, instance: object, call_list: tuple) -> None:
+        for method_name, argument_resolver_list, argument_resolver_map in call_list:
             try:
                 instance_method = getattr(instance, method_name)
             except AttributeError as e:
@@ -309,32 +964,403 @@ class Container(psr.container.ContainerInterface):
                     f'Unable to initialize service. Definition `{id_!s}` has no method `{method_name!s}`'
                 ) from e
 
-            # Resolve arguments
-            resolved_argument_list = []
-            for argument_value in argument_list:
-                resolved_argument_list.append(self._resolve_argument(argument=argument_value))
-
-            resolved_argument_map = {}
-            for argument_key, argument_value in argument_map.items():
-                resolved_argument_map[argument_key] = self._resolve_argument(argument=argument_value)
-
             # Perform call
-            instance_method(*resolved_argument_list, **resolved_argument_map)
+            instance_method(
+                *[resolver(self) for resolver in argument_resolver_list],
+                **{argument_key: resolver(self) for argument_key, resolver in argument_resolver_map}
+            )
 
-        return instance
+    def warm_up(self, tag: str = None) -> None:
+        """ Creates public (or tagged with `tag`) shared services with their dependencies in advance """
+        for id_list in self._create_warm_up_level_list(tag=tag):
+            for id_ in id_list:
+                self._get_instance(id_=id_)
+
+    def _create_warm_up_level_list(self, tag: str = None) -> typing.List[typing.List[str]]:
+        """ Returns public (or tagged with `tag`) shared service ids with their dependencies, grouped in levels """
+        if tag is None:
+            root_id_list = [id_ for id_, definition in self._configuration.definition_map.items() if definition.public]
+        else:
+            root_id_list = [id_ for id_, _ in self._configuration.find_tagged(tag=tag)]
+        return self._create_level_list(root_id_list=root_id_list)
+
+    def _create_level_list(
+        self,
+        root_id_list: typing.List[str],
+        dependency_map: typing.Dict[str, typing.List[str]] = None,
+    ) -> typing.List[typing.List[str]]:
+        """
+        Returns shared service ids to be created (services with their dependencies), grouped in levels (topological sort):
+        services of a level depend only on services of previous levels, so they could be created independently.
+        `dependency_map` is filled with (non-lazy) dependency ids of services, when provided
+        """
+        definition_map = self._configuration.definition_map
+        definition_alias_map = self._configuration.definition_alias_map
+
+        level_map: typing.Dict[str, int] = {}
+        if dependency_map is None:
+            dependency_map = {}
+        for root_id in root_id_list:
+            stack = [(definition_alias_map.get(root_id, root_id), False)]
+            while stack:
+                id_, is_expanded = stack.pop()
+                if id_ in level_map:
+                    continue
+
+                if is_expanded:
+                    # dependency which is not leveled yet is a circular reference (e.g. by calls), it is ignored
+                    level_map[id_] = 1 + max(
+                        (level_map.get(dependency_id, -1) for dependency_id in dependency_map[id_]),
+                        default=-1,
+                    )
+                    continue
+
+                if id_ in dependency_map:
+                    continue  # is being expanded, circular reference
+
+                definition = definition_map.get(id_)
+                dependency_map[id_] = [
+                    definition_alias_map.get(reference_.id, reference_.id)
+                    for reference_ in (_iterate_definition_references(definition=definition) if definition else ())
+                    if not reference_.lazy
+                ]
+                stack.append((id_, True))
+                stack.extend(
+                    (dependency_id, False) for dependency_id in dependency_map[id_] if dependency_id not in level_map
+                )
+
+        level_list: typing.List[typing.List[str]] = []
+        for id_, level in level_map.items():
+            definition = definition_map.get(id_)
+            if (
+                not definition or not definition.shared or definition.lazy or definition.scope is not None or
+                id_ == 'md.di.Container'
+            ):
+                # non-shared services are created by dependant services; lazy and scoped ones are not created in advance
+                continue
+
+            while len(level_list) <= level:
+                level_list.append([])
+            level_list[level].append(id_)
+        return [id_list for id_list in level_list if id_list]
+
+    def prepare_for_fork(self, tag: str = None, fork_unsafe_tag: str = 'fork_unsafe', freeze_gc: bool = False) -> None:
+        """
+        Creates public (or tagged with `tag`) shared services with their dependencies before worker processes fork,
+        so workers share them (copy-on-write).
+        Services tagged with `fork_unsafe_tag` (e.g. sockets, thread pools) and services depending on them
+        are not created, they are created by worker on demand, see `after_fork`.
+        When `freeze_gc` is set, objects are moved into permanent generation (`gc.freeze()`),
+        so garbage collector of worker does not write into shared memory pages.
+        """
+        self._fork_unsafe_id_set = self._find_dependant_id_set(
+            id_list=[id_ for id_, _ in self._configuration.find_tagged(tag=fork_unsafe_tag)]
+        )
+
+        for id_list in self._create_warm_up_level_list(tag=tag):
+            for id_ in id_list:
+                if id_ not in self._fork_unsafe_id_set:
+                    self._get_instance(id_=id_)
+
+        if freeze_gc:
+            gc.collect()
+            gc.freeze()
+
+    def after_fork(self) -> None:
+        """ Drops fork-unsafe services (see `prepare_for_fork`) in worker process, they are created again on demand """
+        for id_ in self._fork_unsafe_id_set:
+            self._instance_map.pop(id_, None)
+        self._retrieval_map.clear()
+        self._pool_map.clear()  # pool lock could be held by another thread of parent process
+        self._retention_store.after_fork(id_set=self._fork_unsafe_id_set)
+
+    def _find_dependant_id_set(self, id_list: typing.List[str], eager: bool = False) -> typing.FrozenSet[str]:
+        """
+        Returns service ids with ids of services, which (transitively) depend on them;
+        when `eager` is set, services holding them are returned only (lazy references and tagged services are skipped)
+        """
+        definition_alias_map = self._configuration.definition_alias_map
+        configuration = None if eager else self._configuration  # tagged services are yielded with configuration
+
+        dependant_map: typing.Dict[str, typing.List[str]] = {}  # service id -> ids of services depending on it
+        if id_list:
+            for id_, definition in self._configuration.definition_map.items():
+                for reference_ in _iterate_definition_references(definition=definition, configuration=configuration):
+                    if eager and reference_.lazy:
+                        continue
+                    dependant_map.setdefault(definition_alias_map.get(reference_.id, reference_.id), []).append(id_)
+
+        dependant_id_set = set()
+        pending_id_list = [definition_alias_map.get(id_, id_) for id_ in id_list]
+        while pending_id_list:
+            id_ = pending_id_list.pop()
+            if id_ not in dependant_id_set:
+                dependant_id_set.add(id_)
+                pending_id_list.extend(dependant_map.get(id_, ()))
+        return frozenset(dependant_id_set)
+
+    def invalidate(self) -> None:
+        """
+        Drops definition plans (precomputed instantiation instructions),
+        it is required when configuration definitions are modified in place after container usage
+        (replaced definition is detected automatically); also drops configuration tag index
+        and resolves parameters again (e.g. when environment variables are changed)
+        """
+        self._plan_map.clear()  # definitions modified in place are used by other containers of the configuration
+        self._parameter_resolver.load()
+        self._plan_map = self._get_plan_map()
+        self._retrieval_map.clear()
+        self._configuration.reindex()
+
+    def scope(self, name: str = 'request') -> 'Scope':
+        """ Returns new container scope, services bound to the scope are disposed on its exit """
+        return Scope(parent=self, name=name)
+
+    def current_scope(self) -> 'Container':
+        """ Returns innermost scope of the container entered in current context (thread or task), or container itself """
+        scope = _current_scope.get()
+        container = scope
+        while container is not None:
+            if container is self:
+                return scope
+            container = container._parent
+        return self
+
+    def set_instrumentation(self, instrumentation: typing.Optional['InstrumentationInterface']) -> None:
+        """
+        Sets instrumentation, which receives service retrieval and construction events (`None` removes it).
+        Container methods are replaced with instrumented ones, so container without instrumentation has no overhead
+        """
+        self.__dict__.pop('_get_instance', None)
+        self.__dict__.pop('_create_instance', None)
+        self.__dict__.pop('_remember', None)
+        self._instrumentation = instrumentation
+        if instrumentation is not None:
+            _instrument(container=self, instrumentation=instrumentation)
+
+    def _find_tagged_id_list(self, tagged: Tagged) -> typing.List[str]:
+        """ Returns tagged service ids (service tagged several times is taken once), ordered by priority (when provided) """
+        tagged_list = self._configuration.find_tagged(tag=tagged.tag)
+        if tagged.priority:
+            # stable sort, services of the same priority stay in definition order
+            tagged_list = sorted(tagged_list, key=lambda item: item[1].get(tagged.priority, 0), reverse=True)
+        return list(dict.fromkeys(id_ for id_, _ in tagged_list))
 
     def get(self, id_: typing.Union[str, type]) -> object:
-        id_ = reference(id_=id_)
-        definition = self._get_definition(id_=id_)
+        try:
+            return self._retrieval_map[id_]  # shared service has been retrieved by the same id
+        except KeyError:
+            pass
+
+        service_id = self._reference(id_=id_)
+        definition = self._get_definition(id_=service_id)
+
+        if not definition.public:
+            raise InvalidDefinitionConfigurationException(f'Definition `{service_id!s}` is private')
+
+        instance = self._get_instance(id_=service_id, definition=definition)
+        if definition.shared:
+            self._remember(id_=id_, service_id=service_id, instance=instance)
+        return instance
 
+    def acquire(self, id_: typing.Union[str, type]) -> object:
+        """
+        Takes pooled service instance from the pool (or creates new one, when pool is empty),
+        instance must be returned with `release` (see also `pooled`); thread-safe
+        """
+        service_id = self._reference(id_=id_)
+        definition = self._get_definition(id_=service_id)
         if not definition.public:
-            raise InvalidDefinitionConfigurationException(f'Definition `{id_!s}` is private')
+            raise InvalidDefinitionConfigurationException(f'Definition `{service_id!s}` is private')
+
+        pool = self._get_pool(id_=service_id, definition=definition)
+        instance = pool.take()
+        if instance is _undefined:
+            instance = self._instantiate(id_=service_id, definition=definition)
+        return instance
+
+    def release(self, id_: typing.Union[str, type], instance: object) -> None:
+        """ Resets service instance (see `Definition.reset`) and returns it into the pool, see `acquire` """
+        service_id = self._reference(id_=id_)
+        pool = self._get_pool(id_=service_id, definition=self._get_definition(id_=service_id))
+        try:
+            self._perform_call_list(id_=service_id, instance=instance, call_list=pool.reset_call_list)
+        except Exception:
+            pool.discard()  # instance state is unknown
+            raise
+        pool.put(instance=instance)
+
+    @contextlib.contextmanager
+    def pooled(self, id_: typing.Union[str, type]) -> typing.Iterator[object]:
+        """ Takes pooled service instance for `with` block, e.g. `with container.pooled(Parser) as parser:` """
+        instance = self.acquire(id_=id_)
+        try:
+            yield instance
+        finally:
+            self.release(id_=id_, instance=instance)
+
+    def get_pool_statistics(self, id_: typing.Union[str, type]) -> PoolStatistics:
+        service_id = self._reference(id_=id_)
+        return self._get_pool(id_=service_id, definition=self._get_definition(id_=service_id)).get_statistics()
+
+    def _get_pool(self, id_: str, definition: Definition) -> '_Pool':
+        id_ = self._configuration.definition_alias_map.get(id_, id_)
+        try:
+            return self._pool_map[id_]
+        except KeyError:
+            pass
+
+        if not definition.pool or definition.shared:
+            raise InvalidDefinitionConfigurationException(
+                f'Service `{id_!s}` is not pooled, definition must be non-shared and have `pool` size'
+            )
+        # the same pool is kept, when pool is created concurrently
+        return self._pool_map.setdefault(id_, _Pool(
+            size=definition.pool,
+            reset_call_list=self._compile_call_list(call_list=definition.reset),
+        ))
+
+    def get_many(self, id_list: typing.Iterable[typing.Union[str, type]]) -> typing.List[object]:
+        """
+        Returns services in requested order, shared services (with their dependencies) are created in advance,
+        in dependency order, once.
+        Raises `ServiceRetrievalException` with errors of all services, which could not be retrieved
+        """
+        return self._get_many(id_list=id_list, create_level=self._create_level)
+
+    def iterate_many(
+        self,
+        id_list: typing.Iterable[typing.Union[str, type]],
+    ) -> typing.Iterator[typing.Tuple[typing.Union[str, type], object]]:
+        """
+        Yields (requested id, service) pairs in requested order, service is retrieved when iteration reaches it.
+        Services, which could not be retrieved, are skipped, `ServiceRetrievalException` is raised after iteration
+        """
+        error_map = {}
+        instance_map = {}
+        for id_ in id_list:
+            try:
+                instance = instance_map[id_] = self.get(id_=id_)
+            except Exception as e:
+                error_map[id_] = e
+                continue
+            yield id_, instance
+
+        if error_map:
+            raise ServiceRetrievalException(error_map=error_map, instance_map=instance_map)
 
-        return self._get_instance(id_=id_, definition=definition)
+    def _get_many(
+        self,
+        id_list: typing.Iterable[typing.Union[str, type]],
+        create_level: typing.Callable[[typing.List[str]], typing.Dict[str, Exception]],
+    ) -> typing.List[object]:
+        requested_id_list = list(id_list)
+        error_map: typing.Dict[typing.Union[str, type], Exception] = {}
+        definition_map: typing.Dict[str, Definition] = {}  # service id -> definition
+        service_id_list: typing.List[typing.Optional[str]] = []  # `None` when service could not be retrieved
+        for id_ in requested_id_list:
+            try:
+                service_id = self._reference(id_=id_)
+                definition = definition_map[service_id] = self._get_definition(id_=service_id)
+                if not definition.public:
+                    raise InvalidDefinitionConfigurationException(f'Definition `{service_id!s}` is private')
+            except Exception as e:
+                error_map[id_] = e
+                service_id = None
+            service_id_list.append(service_id)
+
+        dependency_map: typing.Dict[str, typing.List[str]] = {}
+        # service id -> the first error of service creation, failed service is not created again
+        failure_map: typing.Dict[str, Exception] = {}
+        created_id_set: typing.Set[str] = set()  # services of created levels
+        for level_id_list in self._create_level_list(
+            root_id_list=[
+                service_id for id_, service_id in zip(requested_id_list, service_id_list)
+                if service_id is not None and id_ not in self._retrieval_map
+            ],
+            dependency_map=dependency_map,
+        ):
+            creatable_id_list = []
+            for id_ in level_id_list:
+                failure = _find_dependency_failure(
+                    id_=id_, dependency_map=dependency_map, failure_map=failure_map, created_id_set=created_id_set,
+                )
+                if failure is None:
+                    creatable_id_list.append(id_)
+                else:
+                    failure_map[id_] = failure  # service depends on failed one
+            failure_map.update(create_level(creatable_id_list))
+            created_id_set.update(level_id_list)
+
+        instance_list = []
+        instance_map = {}
+        for id_, service_id in zip(requested_id_list, service_id_list):
+            instance = None
+            if service_id is not None:
+                definition = definition_map[service_id]
+                instance_id = self._configuration.definition_alias_map.get(service_id, service_id)
+                failure = failure_map.get(instance_id) or _find_dependency_failure(
+                    id_=instance_id, dependency_map=dependency_map, failure_map=failure_map, created_id_set=created_id_set,
+                )
+                try:
+                    if failure is not None:
+                        raise failure
+                    instance = instance_map[id_] = self._get_instance(id_=service_id, definition=definition)
+                except Exception as e:
+                    error_map[id_] = e
+                else:
+                    if definition.shared:
+                        self._remember(id_=id_, service_id=service_id, instance=instance)
+            instance_list.append(instance)
+
+        if error_map:
+            error_map = {id_: error_map[id_] for id_ in requested_id_list if id_ in error_map}  # in requested order
+            raise ServiceRetrievalException(error_map=error_map, instance_map=instance_map)
+        return instance_list
+
+    def _create_level(self, id_list: typing.List[str]) -> typing.Dict[str, Exception]:
+        """
+        Creates shared services, which are independent of each other; returns errors by service id,
+        error is reported on retrieval of requested service, which depends on the service
+        """
+        error_map = {}
+        for id_ in id_list:
+            try:
+                self._get_instance(id_=id_)
+            except Exception as e:
+                error_map[id_] = e
+        return error_map
+
+    def _reference(self, id_: typing.Union[str, type]) -> str:
+        """ Returns service id, class reference is computed once """
+        if id_.__class__ is str:
+            return id_
+
+        try:
+            return self._service_id_map[id_]
+        except KeyError:
+            service_id = self._service_id_map[id_] = reference(id_=id_)
+            return service_id
+
+    def _remember(self, id_: typing.Union[str, type], service_id: str, instance: object) -> None:
+        """ Keeps retrieved shared service instance by requested id, when instance is held by container (or parent) """
+        if type(instance) is LazyProxy:
+            return  # proxy is replaced with service instance, once it is resolved
+
+        instance_id = self._configuration.definition_alias_map.get(service_id, service_id)
+        container = self
+        while container is not None:
+            if container._instance_map.get(instance_id) is instance:
+                self._retrieval_map[id_] = instance
+                return
+            container = container._parent
 
     def has(self, id_: typing.Union[str, type]) -> bool:
+        if id_ in self._retrieval_map:
+            return True
+
         try:
-            definition = self._get_definition(id_=reference(id_=id_))
+            definition = self._get_definition(id_=self._reference(id_=id_))
         except ClassNotFoundException:
             return False
 
@@ -350,22 +1376,829 @@ class Container(psr.container.ContainerInterface):
         # todo consider to check is instance exists
         # todo consider to check is definition id exists
         self._instance_map[id_] = instance
+        self._retrieval_map.clear()
+
+
+class Scope(Container):
+    """
+    Container scope (e.g. request or task): holds instances of services bound to the scope,
+    other shared services are retrieved from the parent container.
+    Scope is created in constant time: configuration and definition plans are shared with the parent.
+    """
+    def __init__(self, parent: Container, name: str = 'request') -> None:  # parent initialization is not repeated
+        self._parent = parent
+        self._scope_name = name
+        self._configuration = parent._configuration
+        self._validated = parent._validated
+        self._parameter_resolver = parent._parameter_resolver
+        self._plan_map = parent._plan_map  # plan resolvers take container, so plans are scope independent
+        self._service_id_map = parent._service_id_map
+        self._pool_map = parent._pool_map
+        self._retention_store = parent._retention_store
+        self._checked_retention_id_set = parent._checked_retention_id_set
+
+        # runtime
+        self._instance_map: typing.Dict[str, object] = dict.fromkeys(_container_id_set, self)  # synthetic service
+        self._loading_service_list: typing.List[str] = []
+        self._construction_map: typing.Dict[str, Definition] = {}
+        self._retrieval_map: typing.Dict[typing.Union[str, type], object] = {}
+        self._token: typing.Optional[contextvars.Token] = None
+
+        if parent._instrumentation is not None:
+            self.set_instrumentation(instrumentation=parent._instrumentation)
+
+    def _get_instance(self, id_: str, definition: Definition = None) -> object:
+        id_ = self._configuration.definition_alias_map.get(id_, id_)
+        if id_ in self._instance_map:
+            return self._instance_map[id_]
+
+        try:
+            if definition is None:
+                id_ = self._parent._reference(id_=id_)  # e.g. live container resolves interface id
+                definition = self._get_definition(id_=id_)
+        except Exception as e:
+            raise Exception(f'Unable to retrieve service instance `{id_!s}`') from e  # fixme
+
+        if definition.scope is None:
+            if definition.shared:
+                return self._parent._get_instance(id_=id_, definition=definition)
+            return self._instantiate(id_=id_, definition=definition)  # dependencies could be bound to the scope
+
+        if definition.scope != self._scope_name:
+            return self._parent._get_instance(id_=id_, definition=definition)  # outer scope
+
+        return self._instantiate(id_=id_, definition=definition)
+
+    def _get_definition(self, id_: str) -> Definition:
+        return self._parent._get_definition(id_=id_)  # e.g. live container creates definitions on fly
+
+    def _reference(self, id_: typing.Union[str, type]) -> str:
+        return self._parent._reference(id_=id_)
+
+    def close(self, max_workers: int = None, timeout: float = None) -> None:
+        """ Disposes services bound to the scope, see `Container.close` """
+        super().close(max_workers=max_workers, timeout=timeout)
+
+    def __enter__(self) -> 'Scope':
+        self._token = _current_scope.set(self)
+        return self
+
+    def __exit__(self, *args) -> None:
+        _current_scope.reset(self._token)
+        self._token = None
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'<scope {self._scope_name!r} of {self._parent!r}>'
+
+
+class InstrumentationInterface:
+    """ Receives container events, see `Container.set_instrumentation` (e.g. `md.di.profiling.Profiler`) """
+    def hit(self, id_: str) -> None:
+        """ Shared service is retrieved, it is created already """
+        raise NotImplementedError
+
+    def before_construction(self, id_: str, definition: Definition, depth: int) -> None:
+        """ Service is going to be created, `depth` is a number of services being created, which require it """
+        raise NotImplementedError
+
+    def after_construction(self, id_: str, definition: Definition, depth: int, elapsed: float) -> None:
+        """ Service is created (or failed), `elapsed` time (seconds) includes creation of service dependencies """
+        raise NotImplementedError
+
+
+class LazyProxy:
+    """ Service proxy, creates service on first access and forwards to it """
+    __slots__ = ('_LazyProxy__factory', '_LazyProxy__instance')
+
+    def __init__(self, factory: typing.Callable[[], object]) -> None:
+        object.__setattr__(self, '_LazyProxy__factory', factory)
+        object.__setattr__(self, '_LazyProxy__instance', _undefined)
+
+    @property
+    def __class__(self) -> type:  # makes `isinstance` check pass
+        return type(_resolve_proxy(proxy=self))
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(_resolve_proxy(proxy=self), name)
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        setattr(_resolve_proxy(proxy=self), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(_resolve_proxy(proxy=self), name)
+
+    def __dir__(self) -> typing.Iterable[str]:
+        return dir(_resolve_proxy(proxy=self))
+
+    def __call__(self, *args, **kwargs) -> typing.Any:
+        return _resolve_proxy(proxy=self)(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return repr(_resolve_proxy(proxy=self))
+
+    def __str__(self) -> str:
+        return str(_resolve_proxy(proxy=self))
+
+    def __bool__(self) -> bool:
+        return bool(_resolve_proxy(proxy=self))
+
+    def __hash__(self) -> int:
+        return hash(_resolve_proxy(proxy=self))
+
+    def __eq__(self, other: typing.Any) -> bool:
+        return _resolve_proxy(proxy=self) == other
+
+    def __ne__(self, other: typing.Any) -> bool:
+        return _resolve_proxy(proxy=self) != other
+
+    def __len__(self) -> int:
+        return len(_resolve_proxy(proxy=self))
+
+    def __iter__(self) -> typing.Iterator:
+        return iter(_resolve_proxy(proxy=self))
+
+    def __contains__(self, item: typing.Any) -> bool:
+        return item in _resolve_proxy(proxy=self)
+
+    def __getitem__(self, key: typing.Any) -> typing.Any:
+        return _resolve_proxy(proxy=self)[key]
+
+    def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+        _resolve_proxy(proxy=self)[key] = value
+
+    def __delitem__(self, key: typing.Any) -> None:
+        del _resolve_proxy(proxy=self)[key]
+
+    def __enter__(self) -> typing.Any:
+        return _resolve_proxy(proxy=self).__enter__()
+
+    def __exit__(self, *args) -> typing.Any:
+        return _resolve_proxy(proxy=self).__exit__(*args)
+
+
+class _TaggedIterable:
+    """ Iterable of tagged services, service is retrieved from container when iteration reaches it """
+    __slots__ = ('_container', '_id_list')
+
+    def __init__(self, container: Container, id_list: typing.List[str]) -> None:
+        self._container = container
+        self._id_list = id_list
+
+    def __iter__(self) -> typing.Iterator[object]:
+        for id_ in self._id_list:
+            yield self._container._get_instance(id_=id_)
+
+    def __len__(self) -> int:
+        return len(self._id_list)
+
+    def __repr__(self) -> str:
+        return f'<tagged services {self._id_list!r}>'
+
+
+class _Pool:
+    """ Bounded pool of idle service instances, thread-safe """
+    __slots__ = ('size', 'reset_call_list', '_instance_list', '_lock', '_hit_count', '_miss_count', '_discard_count')
+
+    def __init__(self, size: int, reset_call_list: tuple) -> None:
+        self.size = size
+        self.reset_call_list = reset_call_list
+        self._instance_list: typing.List[object] = []
+        self._lock = threading.Lock()
+        self._hit_count = 0
+        self._miss_count = 0
+        self._discard_count = 0
+
+    def take(self) -> object:
+        """ Returns idle instance, or `_undefined` when pool is empty """
+        with self._lock:
+            if self._instance_list:
+                self._hit_count += 1
+                return self._instance_list.pop()
+            self._miss_count += 1
+            return _undefined
+
+    def put(self, instance: object) -> None:
+        with self._lock:
+            if len(self._instance_list) < self.size:
+                self._instance_list.append(instance)
+            else:
+                self._discard_count += 1
+
+    def discard(self) -> None:
+        with self._lock:
+            self._discard_count += 1
+
+    def get_statistics(self) -> PoolStatistics:
+        with self._lock:
+            return PoolStatistics(
+                size=self.size,
+                idle_count=len(self._instance_list),
+                hit_count=self._hit_count,
+                miss_count=self._miss_count,
+                discard_count=self._discard_count,
+            )
+
+
+class _RetentionStore:
+    """ Holds instances of shared services with retention policy (see `Retention`), thread-safe """
+    def __init__(self) -> None:
+        # service id -> [instance or weak reference, definition, last access time]
+        self._entry_map: typing.Dict[str, list] = {}
+        # group -> service ids, least recently used first
+        self._group_map: typing.Dict[str, typing.OrderedDict[str, None]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, id_: str, now: float) -> typing.Tuple[object, typing.List[typing.Tuple[str, object]]]:
+        """ Returns held instance (or `_undefined`) and instances evicted by policies """
+        with self._lock:
+            evicted_list = self._evict(now=now)
+            entry = self._entry_map.get(id_)
+            if entry is None:
+                return _undefined, evicted_list
+
+            instance, definition, _ = entry
+            if definition.retention.weak:
+                instance = instance()
+                if instance is None:  # collected
+                    self._remove(id_=id_)
+                    return _undefined, evicted_list
+
+            entry[2] = now
+            if definition.retention.group is not None:
+                self._group_map[definition.retention.group].move_to_end(id_)
+            return instance, evicted_list
+
+    def put(
+        self,
+        id_: str,
+        definition: Definition,
+        instance: object,
+        now: float,
+    ) -> typing.List[typing.Tuple[str, object]]:
+        """ Holds instance, returns instances evicted by policies """
+        retention = definition.retention
+        held_instance = instance
+        if retention.weak:
+            try:
+                held_instance = weakref.ref(instance)
+            except TypeError as e:
+                raise InvalidDefinitionConfigurationException(
+                    f'Service `{id_!s}` instance does not support weak references'
+                ) from e
+
+        with self._lock:
+            evicted_list = self._remove(id_=id_)
+            self._entry_map[id_] = [held_instance, definition, now]
+
+            group = retention.group
+            if group is not None:
+                id_map = self._group_map.setdefault(group, collections.OrderedDict())
+                id_map[id_] = None
+                while len(id_map) > 1 and (
+                    retention.capacity is not None and len(id_map) > retention.capacity or
+                    retention.memory_budget is not None and self._get_memory(group=group) > retention.memory_budget
+                ):
+                    evicted_list += self._remove(id_=next(iter(id_map)))  # least recently used one
+
+            evicted_list += self._evict(now=now)
+            return evicted_list
+
+    def remove(self, id_: str) -> typing.List[typing.Tuple[str, object]]:
+        with self._lock:
+            return self._remove(id_=id_)
+
+    def clear(self) -> typing.List[typing.Tuple[str, object]]:
+        """ Drops all instances """
+        with self._lock:
+            evicted_list = []
+            for id_ in list(self._entry_map):
+                evicted_list += self._remove(id_=id_)
+            return evicted_list
+
+    def evict(self, now: float) -> typing.List[typing.Tuple[str, object]]:
+        """ Drops instances, which idle time is expired, or which are collected """
+        with self._lock:
+            return self._evict(now=now)
+
+    def after_fork(self, id_set: typing.AbstractSet[str]) -> None:
+        """ Drops instances of `id_set` services (they are not disposed, parent process uses them) """
+        self._lock = threading.Lock()  # lock could be held by another thread of parent process
+        for id_ in id_set:
+            self._remove(id_=id_)
+
+    def _evict(self, now: float) -> typing.List[typing.Tuple[str, object]]:
+        evicted_list = []
+        for id_, (instance, definition, access_time) in list(self._entry_map.items()):
+            retention = definition.retention
+            if (
+                retention.idle_ttl is not None and now - access_time > retention.idle_ttl or
+                retention.weak and instance() is None
+            ):
+                evicted_list += self._remove(id_=id_)
+        return evicted_list
+
+    def _remove(self, id_: str) -> typing.List[typing.Tuple[str, object]]:
+        entry = self._entry_map.pop(id_, None)
+        if entry is None:
+            return []
+
+        instance, definition, _ = entry
+        if definition.retention.group is not None:
+            self._group_map[definition.retention.group].pop(id_, None)
+        if definition.retention.weak:
+            instance = instance()
+            if instance is None:
+                return []  # instance is collected, it could not be disposed
+        return [(id_, instance)]
+
+    def _get_memory(self, group: str) -> int:
+        """ Returns memory of held group services, service memory is `memory` attribute of its group tag """
+        memory = 0
+        for id_ in self._group_map[group]:
+            for tag in self._entry_map[id_][1].find_tags(tag=group):
+                memory += tag.get('memory', 0)
+                break
+        return memory
 
 
 # Internals
-def dereference(class_qualname: str) -> type:
-    """ Dereferences string class pointer to a class object """
+_container_alias_map: typing.Dict[str, str] = {  # container itself is a synthetic service
+    'container': 'md.di.Container',
+    'psr.container.ContainerInterface': 'md.di.Container',
+}
+_container_id_set: typing.FrozenSet[str] = frozenset(('md.di.Container', *_container_alias_map))
+_container_definition = Definition(class_=Container)  # container instance is always in the instance map
+# innermost container scope entered in current context, is inherited by asyncio tasks
+_current_scope: contextvars.ContextVar = contextvars.ContextVar('md.di.current_scope', default=None)
+
+
+def _create_tag_index(
+    definition_map: typing.Mapping[str, Definition],
+) -> typing.Dict[str, typing.List[typing.Tuple[str, DefinitionTagType]]]:
+    tag_index = {}
+    for id_, definition in definition_map.items():
+        for tag_ in definition.tags:  # each tag occurrence, e.g. listener of several events
+            tag_index.setdefault(tag_['name'], []).append((id_, tag_))
+    return tag_index
+
+
+class _FrozenList(tuple):
+    """ List value of frozen configuration """
+    __slots__ = ()
+
+
+class _FrozenDict(dict):
+    """ Dictionary value of frozen configuration """
+    __slots__ = ()
+
+    def _modify(self, *args, **kwargs) -> typing.NoReturn:
+        raise TypeError('Frozen configuration could not be modified')
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _modify
+
+
+def _modify_frozen(self, *args) -> typing.NoReturn:
+    raise TypeError('Frozen configuration could not be modified')
+
+
+class _FrozenReference(Reference):
+    __slots__ = ()
+    __setattr__ = __delattr__ = _modify_frozen
+
+
+class _FrozenDefinition(Definition):
+    __slots__ = ()
+    __setattr__ = __delattr__ = _modify_frozen
+
+
+class _FrozenCallable(Callable):
+    __slots__ = ()
+    __setattr__ = __delattr__ = _modify_frozen
+
+
+class _FrozenTagged(Tagged):
+    __slots__ = ()
+    __setattr__ = __delattr__ = _modify_frozen
+
+
+class _FrozenRetention(Retention):
+    __slots__ = ()
+    __setattr__ = __delattr__ = _modify_frozen
+
+
+class _FrozenParameter(Parameter):
+    __slots__ = ()
+    __setattr__ = __delattr__ = _modify_frozen
+
+
+class _FrozenEnv(Env):
+    __slots__ = ()
+    __setattr__ = __delattr__ = _modify_frozen
+
+
+class _FrozenConfiguration(Configuration):
+    __slots__ = ()
+    __setattr__ = __delattr__ = _modify_frozen
+
+    def reindex(self) -> None:
+        pass  # tag index is built on freeze, definitions could not be modified
+
+    def freeze(self) -> Configuration:
+        return self
+
+
+class _Freezer:
+    """ Creates frozen configuration copy, used once per `Configuration.freeze` call """
+    def __init__(self) -> None:
+        self._reference_map: typing.Dict[typing.Tuple[str, bool], Reference] = {}  # (id, lazy) -> shared reference
+        self._definition_map: typing.Dict[int, Definition] = {}  # id(definition) -> frozen definition
+
+    def freeze_configuration(self, configuration: Configuration) -> Configuration:
+        definition_map = types.MappingProxyType({
+            _intern(value=id_): self.freeze_definition(definition=definition)
+            for id_, definition in configuration.definition_map.items()
+        })
+        return _create_frozen(
+            frozen_class=_FrozenConfiguration,
+            parameter_map=types.MappingProxyType({
+                _intern(value=key): self.freeze_value(value=value) for key, value in configuration.parameter_map.items()
+            }),
+            definition_map=definition_map,
+            definition_alias_map=types.MappingProxyType({
+                _intern(value=alias): _intern(value=id_) for alias, id_ in configuration.definition_alias_map.items()
+            }),
+            _tag_index=types.MappingProxyType({
+                tag: tuple(tagged_list) for tag, tagged_list in _create_tag_index(definition_map=definition_map).items()
+            }),
+        )
+
+    def freeze_definition(self, definition: Definition) -> Definition:
+        frozen_definition = self._definition_map.get(id(definition))
+        if frozen_definition is not None:  # the same definition is used twice
+            return frozen_definition
+
+        factory = definition.factory
+        if isinstance(factory, tuple):
+            factory = (self.freeze_value(value=factory[0]), _intern(value=factory[1]))
+        elif isinstance(factory, Reference):
+            factory = self.freeze_value(value=factory)
+
+        frozen_definition = self._definition_map[id(definition)] = _create_frozen(
+            frozen_class=_FrozenDefinition,
+            class_=_intern(value=definition.class_),
+            factory=factory,
+            arguments=types.MappingProxyType({
+                _intern(value=key): self.freeze_value(value=value) for key, value in definition.arguments.items()
+            }),
+            calls=self.freeze_call_list(call_list=definition.calls),
+            public=definition.public,
+            shared=definition.shared,
+            tags=tuple(types.MappingProxyType(dict(tag)) for tag in definition.tags),
+            lazy=definition.lazy,
+            scope=definition.scope,
+            pool=definition.pool,
+            reset=self.freeze_call_list(call_list=definition.reset),
+            retention=self.freeze_value(value=definition.retention),
+            dispose=definition.dispose,
+        )
+        return frozen_definition
+
+    def freeze_call_list(self, call_list: typing.Iterable[DefinitionCallType]) -> tuple:
+        return tuple(
+            (
+                _intern(value=method_name),
+                tuple(self.freeze_value(value=value) for value in argument_list),
+                types.MappingProxyType({
+                    _intern(value=key): self.freeze_value(value=value) for key, value in argument_map.items()
+                }),
+            )
+            for method_name, argument_list, argument_map in call_list
+        )
+
+    def freeze_value(self, value: typing.Any) -> typing.Any:
+        if isinstance(value, Reference):
+            key = (value.id, value.lazy)
+            reference_ = self._reference_map.get(key)
+            if reference_ is None:
+                reference_ = self._reference_map[key] = _create_frozen(
+                    frozen_class=_FrozenReference, id=_intern(value=value.id), lazy=value.lazy
+                )
+            return reference_
+
+        if isinstance(value, Definition):
+            return self.freeze_definition(definition=value)
+
+        if isinstance(value, Callable):
+            return _create_frozen(frozen_class=_FrozenCallable, holder=self.freeze_value(value=value.holder), method=value.method)
+
+        if isinstance(value, Tagged):
+            return _create_frozen(frozen_class=_FrozenTagged, tag=value.tag, priority=value.priority)
+
+        if isinstance(value, Retention):
+            return _create_frozen(
+                frozen_class=_FrozenRetention,
+                idle_ttl=value.idle_ttl,
+                weak=value.weak,
+                group=value.group,
+                capacity=value.capacity,
+                memory_budget=value.memory_budget,
+            )
+
+        if isinstance(value, Parameter):
+            return _create_frozen(frozen_class=_FrozenParameter, name=_intern(value=value.name))
+
+        if isinstance(value, Env):
+            return _create_frozen(frozen_class=_FrozenEnv, name=value.name, cast=value.cast, default=value.default)
+
+        if isinstance(value, list):
+            return _FrozenList(self.freeze_value(value=item) for item in value)
+
+        if isinstance(value, dict):
+            return _FrozenDict((key, self.freeze_value(value=item)) for key, item in value.items())
+
+        return value
+
+
+def _create_frozen(frozen_class: type, **attribute_map) -> typing.Any:
+    instance = object.__new__(frozen_class)
+    for name, value in attribute_map.items():
+        object.__setattr__(instance, name, value)
+    return instance
+
+
+def _intern(value: typing.Any) -> typing.Any:
+    """ Equal strings (service ids, argument names) share memory """
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class _ParameterResolver:
+    """
+    Resolves configuration parameters (placeholders, references to other parameters, environment variables)
+    on container load, resolved values are kept, so parameters add no cost to service instantiation
+    """
+    def __init__(self, configuration: Configuration) -> None:
+        self._configuration = configuration
+        self._value_map: typing.Dict[str, typing.Any] = {}  # parameter name -> resolved value
+        self._loading_parameter_list: typing.List[str] = []  # stack of resolving parameters
+        self._placeholder_pattern: typing.Pattern = _create_placeholder_pattern(name_list=())
+
+    def load(self) -> None:
+        self._value_map = {}
+        self._placeholder_pattern = _create_placeholder_pattern(name_list=list(self._configuration.parameter_map))
+        for name in self._configuration.parameter_map:
+            self.get(name=name)
+
+    @property
+    def value_map(self) -> typing.Dict[str, typing.Any]:
+        """ Resolved parameter values """
+        return self._value_map
+
+    def has(self, name: str) -> bool:
+        return name in self._value_map or name in self._configuration.parameter_map
+
+    def get(self, name: str) -> typing.Any:
+        try:
+            return self._value_map[name]
+        except KeyError:
+            pass
+
+        if name not in self._configuration.parameter_map:
+            raise ParameterNotFoundException(f'Parameter `{name!s}` not found')
+
+        if name in self._loading_parameter_list:
+            raise InvalidParameterConfigurationException(
+                f'The parameter `{name!s}` has a circular reference to itself: ' +
+                ' -> '.join(self._loading_parameter_list + [name])
+            )
+
+        self._loading_parameter_list.append(name)
+        try:
+            value = self._value_map[name] = self.resolve(value=self._configuration.parameter_map[name])
+        finally:
+            self._loading_parameter_list.pop()
+        return value
+
+    def resolve(self, value: typing.Any) -> typing.Any:
+        """ Returns value with resolved parameters, or the value itself, when it contains no parameters """
+        if isinstance(value, str):
+            if '%' not in value:
+                return value
+            match = self._placeholder_pattern.fullmatch(value)
+            if match and match.group(1):  # value is a single placeholder, parameter value type is kept
+                return self.get(name=match.group(1))
+            return self._placeholder_pattern.sub(
+                lambda match_: str(self.get(name=match_.group(1))) if match_.group(1) else '%', value
+            )
+
+        if isinstance(value, Parameter):
+            return self.get(name=value.name)
+
+        if isinstance(value, Env):
+            return _read_environment_variable(env=value)
+
+        if isinstance(value, (list, _FrozenList)):
+            item_list = [self.resolve(value=item) for item in value]
+            if all(item is resolved_item for item, resolved_item in zip(value, item_list)):
+                return value
+            return _FrozenList(item_list) if isinstance(value, _FrozenList) else item_list
+
+        if isinstance(value, dict):
+            item_map = {key: self.resolve(value=item) for key, item in value.items()}
+            if all(value[key] is item for key, item in item_map.items()):
+                return value
+            return _FrozenDict(item_map) if isinstance(value, _FrozenDict) else item_map
+
+        return value
+
+
+def _create_placeholder_pattern(name_list: typing.Iterable[str]) -> typing.Pattern:
+    """
+    Returns pattern of `%name%` placeholder of declared parameter, or `%%` escaped percent sign;
+    other strings with percent signs (e.g. `%H:%M:%S` or `%s%s` format) are kept as is
+    """
+    name_pattern = '|'.join(re.escape(name) for name in sorted(name_list, key=len, reverse=True))
+    return re.compile(f'%%|%({name_pattern!s})%')
+
+
+def _read_environment_variable(env: Env) -> typing.Any:
+    value = os.environ.get(env.name)
+    if value is None:
+        if env.default is _undefined:
+            raise ParameterNotFoundException(f'Environment variable `{env.name!s}` is not set')
+        return env.default
+
+    cast = _cast_bool if env.cast is bool else env.cast
     try:
-        definition = md.python.dereference(reference_=class_qualname)
-    except md.python.DereferenceException as e:
-        raise ClassNotFoundException(f'Unable to resolve `{class_qualname!s}`') from e
+        return cast(value)
+    except (TypeError, ValueError) as e:
+        raise InvalidParameterConfigurationException(
+            f'Environment variable `{env.name!s}` value {value!r} could not be converted with `{env.cast!r}`'
+        ) from e
+
+
+def _cast_bool(value: str) -> bool:
+    value = value.strip().lower()
+    if value in ('1', 'true', 'yes', 'on'):
+        return True
+    if value in ('', '0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f'Invalid boolean value {value!r}')
+
+
+def _iterate_references(value: typing.Any, configuration: Configuration = None) -> typing.Iterator[Reference]:
+    """
+    Yields references value contains (including nested definitions);
+    tagged services are yielded as lazy references, when configuration is provided
+    """
+    if isinstance(value, Reference):
+        yield value
+    elif isinstance(value, Definition):
+        yield from _iterate_definition_references(definition=value, configuration=configuration)
+    elif isinstance(value, Callable):
+        yield from _iterate_references(value=value.holder, configuration=configuration)
+    elif isinstance(value, Tagged):
+        if configuration is not None:
+            for id_, _ in configuration.find_tagged(tag=value.tag):
+                yield Reference(id_=id_, lazy=True)
+    elif isinstance(value, (list, _FrozenList)):
+        for item in value:
+            yield from _iterate_references(value=item, configuration=configuration)
+    elif isinstance(value, (dict, types.MappingProxyType)):
+        for item in value.values():
+            yield from _iterate_references(value=item, configuration=configuration)
+
+
+def _iterate_definition_references(definition: Definition, configuration: Configuration = None) -> typing.Iterator[Reference]:
+    """ Yields references of definition arguments, factory, calls and reset calls """
+    yield from _iterate_references(value=definition.arguments, configuration=configuration)
+
+    factory = definition.factory
+    if isinstance(factory, tuple):
+        factory = factory[0]
+    if isinstance(factory, Reference):
+        yield factory
+
+    for _, argument_list, argument_map in (*definition.calls, *definition.reset):
+        yield from _iterate_references(value=list(argument_list), configuration=configuration)
+        yield from _iterate_references(value=argument_map, configuration=configuration)
+
+
+def _resolve_proxy(proxy: LazyProxy) -> object:
+    instance = proxy._LazyProxy__instance
+    if instance is _undefined:
+        instance = proxy._LazyProxy__factory()
+        object.__setattr__(proxy, '_LazyProxy__instance', instance)
+        object.__setattr__(proxy, '_LazyProxy__factory', None)
+    return instance
+
 
+def dereference(class_qualname: str) -> type:
+    """ Dereferences string class pointer to a class object """
+    definition = _import(qualname=class_qualname)
     if not isinstance(definition, type):
         raise ClassNotFoundException(f'`{class_qualname!s}` is not a class')
 
     return definition
 
 
+@functools.lru_cache(maxsize=None)
+def _import(qualname: str) -> typing.Any:
+    """ Returns module, class or function by path, path is resolved once per process (failure is not cached) """
+    try:
+        return md.python.dereference(reference_=qualname)
+    except md.python.DereferenceException as e:
+        raise ClassNotFoundException(f'Unable to resolve `{qualname!s}`') from e
+
+
+def _instrument(container: Container, instrumentation: InstrumentationInterface) -> None:
+    """ Replaces container methods with ones, which notify instrumentation """
+    get_instance = type(container)._get_instance.__get__(container)
+    create_instance = type(container)._create_instance.__get__(container)
+    definition_alias_map = container._configuration.definition_alias_map
+    local = threading.local()  # construction depth per thread
+
+    def instrumented_get_instance(id_: str, definition: Definition = None) -> object:
+        instance_id = definition_alias_map.get(id_, id_)
+        if instance_id in container._instance_map:
+            instrumentation.hit(id_=instance_id)
+        return get_instance(id_=id_, definition=definition)
+
+    def instrumented_create_instance(id_: str, definition: Definition) -> object:
+        depth = getattr(local, 'depth', 0)
+        instrumentation.before_construction(id_=id_, definition=definition, depth=depth)
+        local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            return create_instance(id_=id_, definition=definition)
+        finally:
+            elapsed = time.perf_counter() - start
+            local.depth = depth
+            instrumentation.after_construction(id_=id_, definition=definition, depth=depth, elapsed=elapsed)
+
+    container._get_instance = instrumented_get_instance
+    container._create_instance = instrumented_create_instance
+    container._remember = lambda id_, service_id, instance: None  # retrieval is reported each time
+    container._retrieval_map.clear()
+
+
+def _find_dependency_failure(
+    id_: str,
+    dependency_map: typing.Dict[str, typing.List[str]],
+    failure_map: typing.Dict[str, Exception],
+    created_id_set: typing.Set[str],
+) -> typing.Optional[Exception]:
+    """
+    Returns creation error of service dependency (directly or through non-shared services),
+    services of created levels have their dependency errors in `failure_map` already
+    """
+    visited_id_set = {id_}
+    pending_id_list = list(dependency_map.get(id_, ()))
+    while pending_id_list:
+        dependency_id = pending_id_list.pop()
+        if dependency_id in failure_map:
+            return failure_map[dependency_id]
+        if dependency_id not in visited_id_set and dependency_id not in created_id_set:
+            visited_id_set.add(dependency_id)
+            pending_id_list.extend(dependency_map.get(dependency_id, ()))
+    return None
+
+
+def _dispose(instance: object, definition: Definition = None) -> None:
+    dispose = _find_disposal(instance=instance, definition=definition)
+    if dispose is not None:
+        dispose()
+
+
+def _find_disposal(
+    instance: object,
+    definition: typing.Optional[Definition],
+    method_name_list: typing.Tuple[str, ...] = ('close', '__exit__'),
+) -> typing.Optional[typing.Callable[[], typing.Any]]:
+    """ Returns disposal method declared by definition (see `Definition.dispose`), or the first found one of the list """
+    method_name = None if definition is None else definition.dispose
+    if method_name is False or isinstance(instance, LazyProxy):
+        return None  # lazy service is not used
+
+    if method_name is None:
+        for method_name in method_name_list:
+            if callable(getattr(instance, method_name, None)):
+                break
+        else:
+            return None
+
+    method = getattr(instance, method_name)
+    if method_name in ('__exit__', '__aexit__'):
+        return functools.partial(method, None, None, None)
+    return method
+
+
+def _constant_resolver(value: typing.Any) -> ResolverType:
+    return lambda container: value
+
+
 def reference(id_: typing.Union[str, type], explicit: bool = True) -> str:
     """ References class object to a string pointer """
     return md.python.reference(definition=id_, explicit=explicit)
@@ -0,0 +1,490 @@
+import asyncio
+import contextvars
+import inspect
+import time
+import typing
+
+import md.di
+
+from ._di import (
+    Callable,
+    Configuration,
+    Definition,
+    InstrumentationInterface,
+    InvalidDefinitionConfigurationException,
+    Reference,
+    ServiceCircularReferenceException,
+    ServiceDisposalException,
+    Tagged,
+    _FrozenDict,
+    _FrozenList,
+    _Plan,
+    _current_scope,
+    _find_disposal,
+    _undefined,
+)
+
+__all__ = ('Container', 'Scope')
+
+AsyncResolverType = typing.Callable[['Container'], typing.Awaitable[typing.Any]]  # resolves argument value in container
+
+# stack of loading services, it is inherited by tasks created to resolve arguments concurrently
+_loading_service_stack: contextvars.ContextVar = contextvars.ContextVar('md.di.aio.loading_service_stack', default=())
+
+
+class Container(md.di.Container):
+    """
+    Asyncio container: `aget` awaits coroutine factories and service calls,
+    independent definition arguments are resolved concurrently,
+    shared service is built once even when it is requested concurrently.
+    """
+    def __init__(self, configuration: Configuration = None, validated: bool = False) -> None:
+        super().__init__(configuration=configuration, validated=validated)
+        # definition -> plan with async resolvers
+        self._async_plan_map: typing.Dict[Definition, _Plan] = self._get_plan_map(name='async_plan')
+        self._pending_map: typing.Dict[str, asyncio.Future] = {}  # service id -> shared service construction
+        self._await_map: typing.Dict[str, typing.Set[str]] = {}  # service id -> ids its construction awaits
+
+    async def aget(self, id_: typing.Union[str, type]) -> object:
+        try:
+            return self._retrieval_map[id_]  # shared service has been retrieved by the same id
+        except KeyError:
+            pass
+
+        service_id = self._reference(id_=id_)
+        definition = self._get_definition(id_=service_id)
+
+        if not definition.public:
+            raise InvalidDefinitionConfigurationException(f'Definition `{service_id!s}` is private')
+
+        instance = await self._aget_instance(id_=service_id, definition=definition)
+        if definition.shared:
+            self._remember(id_=id_, service_id=service_id, instance=instance)
+        return instance
+
+    async def _aget_instance(self, id_: str, definition: Definition = None) -> object:
+        try:
+            definition = definition or self._get_definition(id_=id_)  # aliased or native id is here, get native definition
+        except Exception as e:
+            raise Exception(f'Unable to retrieve service instance `{id_!s}`') from e  # fixme
+
+        if not definition.shared:
+            return await self._acreate_instance(id_=id_, definition=definition)
+
+        if id_ in self._configuration.definition_alias_map:
+            id_ = self._configuration.definition_alias_map[id_]
+
+        future = self._pending_map.get(id_)
+        if future is None:
+            if id_ in self._instance_map:
+                return self._instance_map[id_]
+
+            if definition.retention is not None and definition.scope is None:
+                instance = self._find_retained_instance(id_=id_)
+                if instance is not _undefined:
+                    return instance
+                self._check_retention(id_=id_, definition=definition)
+
+            future = self._pending_map[id_] = asyncio.ensure_future(
+                self._acreate_shared_instance(id_=id_, definition=definition)
+            )
+
+        loading_service_stack = _loading_service_stack.get()
+        if loading_service_stack:
+            loading_id = loading_service_stack[-1]
+            if self._is_awaited_by(id_=loading_id, awaiting_id=id_):
+                if id_ in self._instance_map:
+                    # service is created, but it's calls are not performed yet, e.g. it calls for the service
+                    # which depends on it; behaviour is the same as for synchronous container
+                    return self._instance_map[id_]
+
+                raise ServiceCircularReferenceException(
+                    f'The service `{id_!s}` has a circular reference to itself: ' +
+                    ' -> '.join(loading_service_stack + (id_, ))
+                )
+            self._await_map.setdefault(loading_id, set()).add(id_)
+
+        return await asyncio.shield(future)  # construction should not be cancelled for other awaiting parties
+
+    async def aclose(self, timeout: float = None) -> None:
+        """
+        Disposes created shared services concurrently (see `md.di.Container.close`):
+        service is disposed once services depending on it are disposed, disposal is awaited for `timeout` seconds.
+        `aclose` (or `__aexit__`) method is preferred, when disposal method is not declared by definition;
+        synchronous disposal method is called in executor thread
+        """
+        instance_map = self._take_disposable_instance_map()
+        dependency_map = self._create_disposal_dependency_map(id_list=list(instance_map))
+        dependant_map: typing.Dict[str, typing.List[str]] = {id_: [] for id_ in instance_map}
+        for id_, dependency_id_list in dependency_map.items():
+            for dependency_id in dependency_id_list:
+                dependant_map[dependency_id].append(id_)
+
+        error_map: typing.Dict[str, Exception] = {}
+        task_map: typing.Dict[str, asyncio.Future] = {}
+
+        async def dispose(id_: str) -> None:
+            dependant_task_list = [task_map[dependant_id] for dependant_id in dependant_map[id_]]
+            if dependant_task_list:
+                await asyncio.wait(dependant_task_list)
+
+            instance, definition = instance_map[id_]
+            method = _find_disposal(
+                instance=instance,
+                definition=definition,
+                method_name_list=('aclose', '__aexit__', 'close', '__exit__'),
+            )
+            if method is None:
+                return
+
+            try:
+                if inspect.iscoroutinefunction(method):
+                    await asyncio.wait_for(method(), timeout=timeout)
+                else:
+                    await asyncio.wait_for(asyncio.get_running_loop().run_in_executor(None, method), timeout=timeout)
+            except asyncio.TimeoutError:
+                error_map[id_] = TimeoutError(f'Service `{id_!s}` is not disposed in {timeout!s} seconds')
+            except Exception as e:  # rest services are disposed anyway
+                error_map[id_] = e
+
+        for id_ in reversed(list(instance_map)):  # all tasks are created before the first one awaits dependants
+            task_map[id_] = asyncio.ensure_future(dispose(id_=id_))
+        if task_map:
+            await asyncio.wait(list(task_map.values()))
+
+        if error_map:
+            error_map = {id_: error_map[id_] for id_ in task_map if id_ in error_map}  # in disposal order
+            raise ServiceDisposalException(error_map=error_map) from next(iter(error_map.values()))
+
+    async def __aenter__(self) -> 'Container':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    def scope(self, name: str = 'request') -> 'Scope':
+        """ Returns new container scope, see `md.di.Container.scope` """
+        return Scope(parent=self, name=name)
+
+    def set_instrumentation(self, instrumentation: typing.Optional[InstrumentationInterface]) -> None:
+        self.__dict__.pop('_aget_instance', None)
+        self.__dict__.pop('_acreate_instance', None)
+        super().set_instrumentation(instrumentation=instrumentation)
+        if instrumentation is not None:
+            _instrument(container=self, instrumentation=instrumentation)
+
+    def after_fork(self) -> None:
+        # event loop of parent process is not used in worker, pending constructions are dropped
+        self._pending_map.clear()
+        self._await_map.clear()
+        super().after_fork()
+
+    def _is_awaited_by(self, id_: str, awaiting_id: str) -> bool:
+        """ Checks is `id_` service (transitively) awaited by construction of `awaiting_id` service """
+        visited_id_set = set()
+        id_list = [awaiting_id]
+        while id_list:
+            current_id = id_list.pop()
+            if current_id == id_:
+                return True
+            if current_id in visited_id_set:
+                continue
+            visited_id_set.add(current_id)
+            id_list.extend(self._await_map.get(current_id, ()))
+        return False
+
+    async def _acreate_shared_instance(self, id_: str, definition: Definition) -> object:
+        try:
+            await self._acreate_instance(id_=id_, definition=definition)
+            if definition.retention is not None and definition.scope is None:
+                return self._retain(id_=id_, definition=definition)
+            return self._instance_map[id_]
+        finally:
+            del self._pending_map[id_]
+
+    async def _acreate_instance(self, id_: str, definition: Definition) -> object:
+        """ Creates and returns new instance """
+        if definition.scope is not None and definition.scope != self._scope_name:
+            raise InvalidDefinitionConfigurationException(
+                f'Unable to retrieve service `{id_!s}` out of `{definition.scope!s}` scope'
+            )
+
+        plan = self._get_async_plan(definition=definition)
+
+        loading_service_stack = _loading_service_stack.get()
+        if id_ in loading_service_stack:
+            raise ServiceCircularReferenceException(
+                f'The service `{id_!s}` has a circular reference to itself: ' +
+                ' -> '.join(loading_service_stack + (id_, ))
+            )
+
+        # service stays in loading stack during calls, to detect services awaiting each other
+        token = _loading_service_stack.set(loading_service_stack + (id_, ))
+        try:
+            return await self._aperform_instance_creation(id_=id_, definition=definition, plan=plan)
+        finally:
+            _loading_service_stack.reset(token)
+            self._await_map.pop(id_, None)
+
+    async def _aperform_instance_creation(self, id_: str, definition: Definition, plan: _Plan) -> object:
+        resolved_argument_map = plan.argument_map.copy()
+        resolved_argument_map.update(
+            zip(
+                [argument_key for argument_key, _ in plan.argument_resolver_list],
+                await _gather([resolver(self) for _, resolver in plan.argument_resolver_list]),
+            )
+        )
+
+        factory = plan.factory
+        if plan.factory_resolver:
+            factory = await plan.factory_resolver(self)
+
+        try:
+            instance = factory(**resolved_argument_map)
+            if inspect.isawaitable(instance):
+                instance = await instance
+        except TypeError as e:  # should never happen
+            raise InvalidDefinitionConfigurationException(
+                f'Unable to initialize service `{id_!s}`. Definition has invalid configuration.'
+            ) from e
+        except Exception as e:
+            raise InvalidDefinitionConfigurationException(
+                f'Unable to initialize service `{id_!s}`'
+            ) from e
+
+        if not definition.shared:
+            await self._aperform_call_list(id_=id_, instance=instance, call_list=plan.call_list)
+            return instance
+
+        self._instance_map[id_] = instance
+        try:
+            await self._aperform_call_list(id_=id_, instance=instance, call_list=plan.call_list)
+        finally:  # instance is kept when calls fail, so it is disposed as well
+            self._record_construction(id_=id_, definition=definition)
+        return instance
+
+    async def _aperform_call_list(self, id_: str, instance: object, call_list: tuple) -> None:
+        for method_name, argument_resolver_list, argument_resolver_map in call_list:
+            try:
+                instance_method = getattr(instance, method_name)
+            except AttributeError as e:
+                # this check could not be fully moved into validation on build phase, because method could be magic
+                raise InvalidDefinitionConfigurationException(
+                    f'Unable to initialize service. Definition `{id_!s}` has no method `{method_name!s}`'
+                ) from e
+
+            # Perform call
+            result = instance_method(
+                *await _gather([resolver(self) for resolver in argument_resolver_list]),
+                **dict(zip(
+                    [argument_key for argument_key, _ in argument_resolver_map],
+                    await _gather([resolver(self) for _, resolver in argument_resolver_map]),
+                ))
+            )
+            if inspect.isawaitable(result):
+                await result
+
+    def invalidate(self) -> None:
+        self._async_plan_map.clear()
+        super().invalidate()
+        self._async_plan_map = self._get_plan_map(name='async_plan')
+
+    def _get_async_plan(self, definition: Definition) -> _Plan:
+        try:
+            return self._async_plan_map[definition]
+        except KeyError:
+            plan = self._async_plan_map[definition] = self._create_async_plan(definition=definition)
+            return plan
+
+    def _create_async_plan(self, definition: Definition) -> _Plan:
+        argument_map = {}
+        argument_resolver_list = []
+        resolve_parameters = self._parameter_resolver.resolve
+        for argument_key, argument_value in definition.arguments.items():
+            argument_value = resolve_parameters(value=argument_value)
+            resolver = self._acompile_argument(argument=argument_value)
+            if resolver is None:
+                argument_map[argument_key] = argument_value
+            else:
+                argument_resolver_list.append((argument_key, resolver))
+
+        call_list = []
+        for method_name, argument_list, call_argument_map in definition.calls:
+            argument_list = [resolve_parameters(value=value) for value in argument_list]
+            call_argument_map = {key: resolve_parameters(value=value) for key, value in call_argument_map.items()}
+            call_list.append((
+                method_name,
+                tuple(self._acompile_argument(argument=value) or _constant_resolver(value) for value in argument_list),
+                tuple(
+                    (key, self._acompile_argument(argument=value) or _constant_resolver(value))
+                    for key, value in call_argument_map.items()
+                ),
+            ))
+
+        factory, factory_resolver = self._acompile_factory(definition=definition)
+        return _Plan(
+            definition=definition,
+            argument_map=argument_map,
+            argument_resolver_list=tuple(argument_resolver_list),
+            factory=factory,
+            factory_resolver=factory_resolver,
+            call_list=tuple(call_list),
+        )
+
+    def _acompile_argument(self, argument: typing.Any) -> typing.Optional[AsyncResolverType]:
+        """ Returns async argument resolver, or `None` when argument is a value and requires no resolution """
+        if isinstance(argument, Reference):
+            id_ = argument.id
+            return lambda container: container._aget_instance(id_=id_)
+
+        if isinstance(argument, Definition):
+            definition_id = str(hash(argument))
+            return lambda container: container._aget_instance(id_=definition_id, definition=argument)
+
+        if isinstance(argument, Callable):
+            holder, method_name = argument.holder, argument.method
+
+            async def resolve_callable(container: Container) -> typing.Callable:
+                holder_ = holder
+                if isinstance(holder, Reference):
+                    holder_ = await container._aget_instance(id_=holder.id)
+                return container._resolve_callable(holder_reference=holder_, method_name=method_name)
+            return resolve_callable
+
+        if isinstance(argument, Tagged):  # iteration could not await, so services are created in advance
+            return self._acompile_argument(argument=[
+                Reference(id_=id_) for id_ in self._find_tagged_id_list(tagged=argument)
+            ])
+
+        if isinstance(argument, (list, _FrozenList)):
+            resolver_list = [self._acompile_argument(argument=value) for value in argument]
+            if not any(resolver_list) and isinstance(argument, list):
+                return None  # frozen list is resolved into new list
+
+            resolver_list = [
+                _constant_resolver(value) if resolver is None else resolver
+                for value, resolver in zip(argument, resolver_list)
+            ]
+
+            async def resolve_list(container: Container) -> list:
+                return await _gather([resolver(container) for resolver in resolver_list])
+            return resolve_list
+
+        if isinstance(argument, dict):
+            resolver_map = {key: self._acompile_argument(argument=value) for key, value in argument.items()}
+            if not any(resolver_map.values()) and not isinstance(argument, _FrozenDict):
+                return None  # frozen dictionary is resolved into new dictionary
+
+            resolver_map = {
+                key: _constant_resolver(argument[key]) if resolver is None else resolver
+                for key, resolver in resolver_map.items()
+            }
+
+            async def resolve_dict(container: Container) -> dict:
+                return dict(zip(resolver_map, await _gather([resolver(container) for resolver in resolver_map.values()])))
+            return resolve_dict
+        return None
+
+    def _acompile_factory(
+        self,
+        definition: Definition,
+    ) -> typing.Tuple[typing.Optional[typing.Callable[..., object]], typing.Optional[AsyncResolverType]]:
+        factory = definition.factory
+        if isinstance(factory, tuple) and isinstance(factory[0], Reference):
+            holder_reference, method_name = factory
+
+            async def resolve_factory(container: Container) -> typing.Callable:
+                holder = await container._aget_instance(id_=holder_reference.id)
+                return container._resolve_callable(holder_reference=holder, method_name=method_name)
+            return None, resolve_factory
+
+        if isinstance(factory, Reference):
+            async def resolve_factory(container: Container) -> typing.Callable:
+                instance = await container._aget_instance(id_=factory.id)
+                assert callable(instance)
+                return instance
+            return None, resolve_factory
+
+        return self._compile_factory(definition=definition)
+
+
+class Scope(md.di.Scope, Container):
+    """
+    Asyncio container scope (e.g. request or task), see `md.di.Scope`.
+    `async with` enters the scope in current context, so it is current scope of the task (and tasks it creates)
+    """
+    def __init__(self, parent: Container, name: str = 'request') -> None:
+        super().__init__(parent=parent, name=name)
+        self._async_plan_map = parent._async_plan_map
+        self._pending_map: typing.Dict[str, asyncio.Future] = {}
+        self._await_map: typing.Dict[str, typing.Set[str]] = {}
+
+    async def _aget_instance(self, id_: str, definition: Definition = None) -> object:
+        id_ = self._configuration.definition_alias_map.get(id_, id_)
+        if id_ in self._instance_map:
+            return self._instance_map[id_]
+
+        try:
+            if definition is None:
+                id_ = self._parent._reference(id_=id_)
+                definition = self._get_definition(id_=id_)
+        except Exception as e:
+            raise Exception(f'Unable to retrieve service instance `{id_!s}`') from e  # fixme
+
+        if definition.scope is None:
+            if definition.shared:
+                return await self._parent._aget_instance(id_=id_, definition=definition)
+            return await self._acreate_instance(id_=id_, definition=definition)  # dependencies could be bound to the scope
+
+        if definition.scope != self._scope_name:
+            return await self._parent._aget_instance(id_=id_, definition=definition)  # outer scope
+
+        return await super()._aget_instance(id_=id_, definition=definition)
+
+    async def __aenter__(self) -> 'Scope':
+        self._token = _current_scope.set(self)
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        _current_scope.reset(self._token)
+        self._token = None
+        await self.aclose()
+
+
+def _instrument(container: Container, instrumentation: InstrumentationInterface) -> None:
+    """ Replaces async container methods with ones, which notify instrumentation, see `md.di._di._instrument` """
+    aget_instance = type(container)._aget_instance.__get__(container)
+    acreate_instance = type(container)._acreate_instance.__get__(container)
+    definition_alias_map = container._configuration.definition_alias_map
+
+    async def instrumented_aget_instance(id_: str, definition: Definition = None) -> object:
+        instance_id = definition_alias_map.get(id_, id_)
+        if instance_id in container._instance_map and instance_id not in container._pending_map:
+            instrumentation.hit(id_=instance_id)
+        return await aget_instance(id_=id_, definition=definition)
+
+    async def instrumented_acreate_instance(id_: str, definition: Definition) -> object:
+        depth = len(_loading_service_stack.get())  # construction depth of the task
+        instrumentation.before_construction(id_=id_, definition=definition, depth=depth)
+        start = time.perf_counter()
+        try:
+            return await acreate_instance(id_=id_, definition=definition)
+        finally:
+            elapsed = time.perf_counter() - start
+            instrumentation.after_construction(id_=id_, definition=definition, depth=depth, elapsed=elapsed)
+
+    container._aget_instance = instrumented_aget_instance
+    container._acreate_instance = instrumented_acreate_instance
+
+
+async def _gather(awaitable_list: typing.List[typing.Awaitable[typing.Any]]) -> typing.List[typing.Any]:
+    """ Awaits concurrently, task is not created when there is nothing to await concurrently """
+    if len(awaitable_list) == 1:
+        return [await awaitable_list[0]]
+    return list(await asyncio.gather(*awaitable_list))
+
+
+def _constant_resolver(value: typing.Any) -> AsyncResolverType:
+    async def resolve(container: Container) -> typing.Any:
+        return value
+    return resolve
@@ -0,0 +1,245 @@
+import inspect
+import typing
+
+from ._di import (
+    ClassNotFoundException,
+    Configuration,
+    Definition,
+    InvalidDefinitionConfigurationException,
+    Reference,
+    ServiceCircularReferenceException,
+    _container_alias_map,
+    _import,
+    _iterate_definition_references,
+    _iterate_references,
+)
+
+__all__ = ('Analyzer', 'Report')
+
+NodeType = typing.TypeVar('NodeType')
+
+
+class Report:
+    """ Container configuration analysis report """
+    def __init__(self) -> None:
+        # service id lists, which definitions require each other on construction (by arguments or factory)
+        self.circular_reference_list: typing.List[typing.List[str]] = []
+        # (definition id, referenced service id) pairs, where referenced service has no definition
+        self.dangling_reference_list: typing.List[typing.Tuple[str, str]] = []
+        # alias chains (alias to another alias, or to missing definition), container resolves alias once
+        self.alias_chain_list: typing.List[typing.List[str]] = []
+        # (definition id, argument name, reason) triples, where definition argument does not match factory signature
+        self.argument_mismatch_list: typing.List[typing.Tuple[str, str, str]] = []
+        # private definitions, which are not used by any public one (warning)
+        self.unreachable_private_id_list: typing.List[str] = []
+
+    @property
+    def is_valid(self) -> bool:
+        """ Is configuration free of errors (unreachable private definitions are not an error) """
+        return not (
+            self.circular_reference_list or
+            self.dangling_reference_list or
+            self.alias_chain_list or
+            self.argument_mismatch_list
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f'Report(circular_reference_list={self.circular_reference_list!r}, '
+            f'dangling_reference_list={self.dangling_reference_list!r}, '
+            f'alias_chain_list={self.alias_chain_list!r}, '
+            f'argument_mismatch_list={self.argument_mismatch_list!r}, '
+            f'unreachable_private_id_list={self.unreachable_private_id_list!r})'
+        )
+
+
+class Analyzer:
+    """ Analyzes container configuration without services instantiation """
+    def analyze(self, configuration: Configuration) -> Report:
+        report = Report()
+        definition_map = configuration.definition_map
+        definition_alias_map = configuration.definition_alias_map
+
+        def is_defined(id_: str) -> bool:
+            return id_ in definition_map or _container_alias_map.get(id_, id_) == 'md.di.Container'
+
+        for alias, id_ in definition_alias_map.items():
+            if alias in _container_alias_map:
+                continue
+            if not is_defined(id_):
+                chain = [alias, id_]
+                while chain[-1] in definition_alias_map and chain[-1] not in chain[:-1]:
+                    chain.append(definition_alias_map[chain[-1]])
+                report.alias_chain_list.append(chain)
+
+        construction_dependency_map: typing.Dict[str, typing.List[str]] = {}
+        dependency_map: typing.Dict[str, typing.List[str]] = {}
+        for id_, definition in definition_map.items():
+            if id_ == 'md.di.Container':
+                continue
+
+            construction_dependency_list = []
+            for reference_ in _iterate_construction_references(definition=definition):
+                dependency_id = definition_alias_map.get(reference_.id, reference_.id)
+                if not reference_.lazy and dependency_id in definition_map:
+                    construction_dependency_list.append(dependency_id)
+            construction_dependency_map[id_] = construction_dependency_list
+
+            dependency_list = []
+            for reference_ in _iterate_definition_references(definition=definition, configuration=configuration):
+                dependency_id = definition_alias_map.get(reference_.id, reference_.id)
+                if not is_defined(dependency_id):
+                    report.dangling_reference_list.append((id_, reference_.id))
+                dependency_list.append(dependency_id)
+            dependency_map[id_] = dependency_list
+
+            report.argument_mismatch_list.extend(
+                (id_, argument, reason) for argument, reason in _find_argument_mismatch_list(definition=definition)
+            )
+
+        for component in find_strongly_connected_component_list(
+            node_list=list(construction_dependency_map),
+            get_dependency_list=construction_dependency_map.__getitem__,
+        ):
+            if len(component) > 1 or component[0] in construction_dependency_map[component[0]]:
+                report.circular_reference_list.append(list(reversed(component)))
+
+        reachable_id_set = set()
+        pending_id_list = [id_ for id_, definition in definition_map.items() if definition.public]
+        while pending_id_list:
+            id_ = pending_id_list.pop()
+            if id_ in reachable_id_set:
+                continue
+            reachable_id_set.add(id_)
+            pending_id_list.extend(dependency_map.get(id_, ()))
+
+        report.unreachable_private_id_list = [
+            id_ for id_ in dependency_map if id_ not in reachable_id_set
+        ]
+        return report
+
+    def validate(self, configuration: Configuration) -> None:
+        """ Raises exception, when configuration has errors """
+        report = self.analyze(configuration=configuration)
+
+        if report.circular_reference_list:
+            raise ServiceCircularReferenceException(
+                'Configuration has circular references: ' +
+                '; '.join(' -> '.join(component + component[:1]) for component in report.circular_reference_list)
+            )
+
+        if not report.is_valid:
+            raise InvalidDefinitionConfigurationException(f'Configuration is invalid: {report!r}')
+
+
+def find_strongly_connected_component_list(
+    node_list: typing.List[NodeType],
+    get_dependency_list: typing.Callable[[NodeType], typing.List[NodeType]],
+) -> typing.List[typing.List[NodeType]]:
+    """ Returns strongly connected components of dependency graph (Tarjan's algorithm, iterative) """
+    index_map: typing.Dict[NodeType, int] = {}
+    low_link_map: typing.Dict[NodeType, int] = {}
+    stack: typing.List[NodeType] = []
+    stack_set: typing.Set[NodeType] = set()
+    component_list: typing.List[typing.List[NodeType]] = []
+
+    for root in node_list:
+        if root in index_map:
+            continue
+
+        work_list = [(root, 0)]
+        while work_list:
+            node, dependency_index = work_list.pop()
+            dependency_list = get_dependency_list(node)
+
+            if dependency_index == 0:
+                index_map[node] = low_link_map[node] = len(index_map)
+                stack.append(node)
+                stack_set.add(node)
+            else:  # returned from dependency
+                child = dependency_list[dependency_index - 1]
+                low_link_map[node] = min(low_link_map[node], low_link_map[child])
+
+            for next_index in range(dependency_index, len(dependency_list)):
+                dependency = dependency_list[next_index]
+                if dependency not in index_map:
+                    work_list.append((node, next_index + 1))
+                    work_list.append((dependency, 0))
+                    break
+                if dependency in stack_set:
+                    low_link_map[node] = min(low_link_map[node], index_map[dependency])
+            else:
+                if low_link_map[node] == index_map[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        stack_set.discard(member)
+                        component.append(member)
+                        if member is node:
+                            break
+                    component_list.append(component)
+
+    return component_list
+
+
+def _iterate_construction_references(definition: Definition) -> typing.Iterator[Reference]:
+    """ Yields references required to create instance (arguments and factory), but calls """
+    yield from _iterate_references(value=definition.arguments)
+
+    factory = definition.factory
+    if isinstance(factory, tuple):
+        factory = factory[0]
+    if isinstance(factory, Reference):
+        yield factory
+
+
+def _find_argument_mismatch_list(definition: Definition) -> typing.List[typing.Tuple[str, str]]:
+    """ Returns (argument name, reason) pairs for arguments, that are not accepted or missing """
+    factory = definition.class_ or definition.factory
+    path = factory[0] if isinstance(factory, tuple) else factory
+    if isinstance(path, str):  # deferred import, module is imported for analysis
+        try:
+            imported = _import(qualname=path)
+        except ClassNotFoundException:
+            return [(path, 'factory not found')]
+        factory = (imported, factory[1]) if isinstance(factory, tuple) else imported
+
+    if isinstance(factory, tuple):
+        holder, method_name = factory
+        if isinstance(holder, Reference):
+            return []  # service method signature is not known before service instantiation
+        factory = getattr(holder, method_name, None)
+        if factory is None:
+            return [(method_name, 'factory method not found')]
+
+    if isinstance(factory, Reference) or not callable(factory):
+        return []
+
+    try:
+        signature = inspect.signature(factory)
+    except (TypeError, ValueError):  # e.g. builtin without signature
+        return []
+
+    mismatch_list = []
+    has_var_keyword = any(parameter.kind is parameter.VAR_KEYWORD for parameter in signature.parameters.values())
+    for argument in definition.arguments:
+        parameter = signature.parameters.get(argument)
+        if parameter is None:
+            if not has_var_keyword:
+                mismatch_list.append((argument, 'unknown argument'))
+        elif (
+            parameter.kind is parameter.POSITIONAL_ONLY or
+            # e.g. `args` argument is collected by `**kwargs` parameter
+            parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD) and not has_var_keyword
+        ):
+            mismatch_list.append((argument, 'argument could not be passed by name'))
+
+    for name, parameter in signature.parameters.items():
+        if (
+            name not in definition.arguments and
+            parameter.default is parameter.empty and
+            parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY)
+        ):
+            mismatch_list.append((name, 'missing argument'))
+
+    return mismatch_list
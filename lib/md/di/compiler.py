@@ -0,0 +1,427 @@
+import keyword
+import types
+import typing
+
+from ._di import (
+    Callable,
+    Configuration,
+    Container,
+    Definition,
+    Env,
+    InstrumentationInterface,
+    Parameter,
+    Reference,
+    Tagged,
+    _container_id_set,
+    _FrozenDict,
+    _FrozenList,
+)
+from .analysis import find_strongly_connected_component_list
+
+__all__ = ('Compiler', 'CompiledContainer')
+
+_literal_type_set: set = {str, int, bool, bytes, type(None)}
+
+
+class CompiledContainer(Container):
+    """ Base class for containers generated by `Compiler`, see `Compiler.compile` """
+    _getter_name_map: typing.Dict[str, str] = {}  # public service id (or alias) -> factory method name
+
+    def __init__(self, configuration: Configuration = None, validated: bool = False) -> None:
+        super().__init__(configuration=configuration, validated=validated)
+        self._bind(configuration=self._configuration)
+        self._getter_map: typing.Dict[str, typing.Callable[[], object]] = self._create_getter_map()
+
+    def _create_getter_map(self) -> typing.Dict[str, typing.Callable[[], object]]:
+        return {id_: getattr(self, method_name) for id_, method_name in self._getter_name_map.items()}
+
+    def _bind(self, configuration: Configuration) -> None:
+        """ Binds configuration values (classes, factories, objects) referenced by generated code """
+        pass
+
+    def invalidate(self) -> None:
+        super().invalidate()
+        self._bind(configuration=self._configuration)  # bound parameter values are resolved again
+
+    def set_instrumentation(self, instrumentation: typing.Optional[InstrumentationInterface]) -> None:
+        super().set_instrumentation(instrumentation=instrumentation)
+        # generated methods are not instrumented, so services are created by interpreter while instrumentation is set
+        self._getter_map = {} if instrumentation is not None else self._create_getter_map()
+
+    def get(self, id_: typing.Union[str, type]) -> object:
+        try:
+            return self._retrieval_map[id_]  # shared service has been retrieved by the same id
+        except KeyError:
+            pass
+
+        service_id = self._reference(id_=id_)
+        try:
+            getter = self._getter_map[service_id]
+        except KeyError:  # private, synthetic or unknown service, let interpreter handle it
+            return super().get(id_=id_)
+
+        instance = getter()
+        self._remember(id_=id_, service_id=service_id, instance=instance)  # non-shared instance is not held
+        return instance
+
+
+class _Node:
+    """ Compiled service (definition) """
+    def __init__(self, id_: str, definition: Definition, path: str, method_name: str) -> None:
+        self.id = id_
+        self.definition = definition
+        self.path = path  # python expression which evaluates to the definition
+        self.method_name = method_name
+        self.dependency_list: typing.List['_Node'] = []  # argument dependencies, used for circular reference check
+        # generated method source parts, argument resolution is wrapped with circular reference check when required
+        self.head_line_list: typing.List[str] = []
+        self.argument_line_list: typing.List[str] = []
+        self.tail_line_list: typing.List[str] = []
+
+
+class _Writer:
+    """ Generates container module source, used once per `Compiler.compile` call """
+    def __init__(self, configuration: Configuration, class_name: str) -> None:
+        self._configuration = configuration
+        self._class_name = class_name
+        self._node_map: typing.Dict[str, _Node] = {}  # service id -> node
+        self._anonymous_node_map: typing.Dict[int, _Node] = {}  # id(definition) -> node, for inline definitions
+        self._node_list: typing.List[_Node] = []
+        self._bind_list: typing.List[str] = []  # expressions of bound values, index is a bound attribute suffix
+
+    def write(self) -> str:
+        definition_map = self._configuration.definition_map
+        for id_, definition in definition_map.items():
+            if id_ in _container_id_set:
+                continue
+            self._node_map[id_] = self._add_node(id_=id_, definition=definition, path=f'definition_map[{id_!r}]')
+
+        index = 0
+        while index < len(self._node_list):  # inline definitions are appended on fly
+            self._write_method(node=self._node_list[index])
+            index += 1
+
+        circular_node_set = self._find_circular_node_set()
+
+        getter_name_map = {}
+        for id_, node in self._node_map.items():
+            if node.definition.public:
+                getter_name_map[id_] = node.method_name
+
+        for alias, id_ in self._configuration.definition_alias_map.items():
+            if alias in _container_id_set:
+                continue
+            node = self._node_map.get(self._resolve_alias(id_=id_))
+            if node and node.definition.public:
+                getter_name_map[alias] = node.method_name
+
+        line_list = [
+            '# This module is generated by `md.di.compiler`, do not edit it manually',
+            'import md.di',
+            'import md.di.compiler',
+            '',
+            f'__all__ = ({self._class_name!r}, )',
+            '',
+            '',
+            f'class {self._class_name!s}(md.di.compiler.CompiledContainer):',
+            '    _getter_name_map = {',
+        ]
+        for id_, method_name in getter_name_map.items():
+            line_list.append(f'        {id_!r}: {method_name!r},')
+        line_list.append('    }')
+        line_list.append('')
+        line_list.append('    def _bind(self, configuration: md.di.Configuration) -> None:')
+        line_list.append('        definition_map = configuration.definition_map')
+        for bind_index, expression in enumerate(self._bind_list):
+            line_list.append(f'        self._v{bind_index!s} = {expression!s}')
+        line_list.append('')
+
+        for node in self._node_list:
+            line_list += node.head_line_list
+            if node in circular_node_set:
+                message = f'The service `{node.id!s}` has a circular reference to itself: '
+                line_list += [
+                    '        loading_service_list = self._loading_service_list',
+                    f'        if {node.id!r} in loading_service_list:',
+                    '            raise md.di.ServiceCircularReferenceException(',
+                    f'                {message!r} + \' -> \'.join(loading_service_list + [{node.id!r}])',
+                    '            )',
+                    f'        loading_service_list.append({node.id!r})',
+                    '        try:',
+                ]
+                line_list += [f'            {line!s}' for line in node.argument_line_list or ['pass']]
+                line_list += [
+                    '        finally:',
+                    '            loading_service_list.pop()',
+                ]
+            else:
+                line_list += [f'        {line!s}' for line in node.argument_line_list]
+            line_list += node.tail_line_list
+
+        return '\n'.join(line_list) + '\n'
+
+    def _add_node(self, id_: str, definition: Definition, path: str) -> _Node:
+        node = _Node(id_=id_, definition=definition, path=path, method_name=f'_get_{len(self._node_list)!s}')
+        self._node_list.append(node)
+        return node
+
+    def _resolve_alias(self, id_: str) -> str:
+        return self._configuration.definition_alias_map.get(id_, id_)
+
+    def _bind(self, expression: str) -> str:
+        self._bind_list.append(expression)
+        return f'self._v{len(self._bind_list) - 1!s}'
+
+    def _bind_resolved(self, path: str) -> str:
+        """ Binds value with resolved parameters, parameters are resolved on container load """
+        return self._bind(expression=f'self._parameter_resolver.resolve(value={path!s})')
+
+    def _write_reference(self, id_: str, dependency_list: typing.Optional[list]) -> str:
+        id_ = self._resolve_alias(id_=id_)
+        if id_ in _container_id_set:
+            return 'self'
+
+        if id_ not in self._node_map:  # synthetic or missing service, let interpreter handle it
+            return f'self._get_instance(id_={id_!r})'
+
+        node = self._node_map[id_]
+        if dependency_list is not None:
+            dependency_list.append(node)
+        return f'self.{node.method_name!s}()'
+
+    def _write_value(self, value: typing.Any, path: str, dependency_list: typing.Optional[list]) -> typing.Tuple[str, bool]:
+        """ Returns expression and flag is expression dynamic (requires evaluation on each instantiation) """
+        if isinstance(value, Reference):
+            if value.lazy:  # proxy does not create service while argument is resolved
+                return f'self._get_lazy_instance(id_={self._resolve_alias(id_=value.id)!r})', True
+            return self._write_reference(id_=value.id, dependency_list=dependency_list), True
+
+        if isinstance(value, Definition):
+            node = self._anonymous_node_map.get(id(value))
+            if not node:
+                node = self._add_node(id_=path, definition=value, path=path)
+                self._anonymous_node_map[id(value)] = node
+            if dependency_list is not None:
+                dependency_list.append(node)
+            return f'self.{node.method_name!s}()', True
+
+        if isinstance(value, Callable):
+            if isinstance(value.holder, Reference):
+                holder = self._write_reference(id_=value.holder.id, dependency_list=dependency_list)
+            else:
+                holder = self._bind(expression=f'{path!s}.holder')
+            return f'self._resolve_callable({holder!s}, {value.method!r})', True
+
+        if isinstance(value, (Parameter, Env)) or isinstance(value, str) and '%' in value:
+            # parameters are resolved on container load, parameter value of frozen configuration is resolved once
+            return self._bind(expression=f'self._resolve_argument(argument={path!s})'), False
+
+        if isinstance(value, Tagged):  # tagged services are resolved by interpreter
+            return f'{self._bind(expression=f"self._compile_argument({path!s})")!s}(self)', True
+
+        if isinstance(value, (list, _FrozenList)):
+            item_list = [
+                self._write_value(value=item, path=f'{path!s}[{index!s}]', dependency_list=dependency_list)
+                for index, item in enumerate(value)
+            ]
+            if any(is_dynamic for _, is_dynamic in item_list):
+                return '[' + ', '.join(expression for expression, _ in item_list) + ']', True
+            if isinstance(value, _FrozenList):  # frozen list is resolved into new list
+                return f'list({self._bind_resolved(path=path)!s})', True
+            return self._bind_resolved(path=path), False
+
+        if isinstance(value, dict):
+            item_list = []
+            is_dynamic = False
+            for key, item in value.items():
+                key_expression = repr(key) if type(key) in _literal_type_set else self._bind(expression=f'list({path!s})[{len(item_list)!s}]')
+                item_expression, is_item_dynamic = self._write_value(
+                    value=item, path=f'{path!s}[{key_expression!s}]', dependency_list=dependency_list
+                )
+                is_dynamic = is_dynamic or is_item_dynamic
+                item_list.append(f'{key_expression!s}: {item_expression!s}')
+            if is_dynamic:
+                return '{' + ', '.join(item_list) + '}', True
+            if isinstance(value, _FrozenDict):  # frozen dictionary is resolved into new dictionary
+                return f'dict({self._bind_resolved(path=path)!s})', True
+            return self._bind_resolved(path=path), False
+
+        if type(value) in _literal_type_set:
+            return repr(value), False
+
+        return self._bind(expression=path), False
+
+    def _write_method(self, node: _Node) -> None:
+        definition = node.definition
+        path = node.path
+        id_ = node.id
+
+        node.head_line_list = [
+            '',
+            f'    def {node.method_name!s}(self) -> object:',
+            f'        """ {id_!s} """',
+        ]
+        if definition.scope is not None or definition.retention is not None:
+            # scoped service is retrieved by container scope (interpreter raises here), retained one is held by interpreter
+            node.head_line_list.append(
+                f'        return self._get_instance(id_={id_!r}, definition={self._bind(expression=path)!s})'
+            )
+            return
+
+        if definition.shared:
+            node.head_line_list += [
+                f'        if {id_!r} in self._instance_map:',
+                f'            return self._instance_map[{id_!r}]',
+            ]
+
+        if definition.lazy:  # method returns proxy, instance is created by separate method
+            node.head_line_list.append(f'        proxy = md.di.LazyProxy(factory=self._create{node.method_name!s})')
+            if definition.shared:
+                node.head_line_list.append(f'        self._instance_map[{id_!r}] = proxy')
+            node.head_line_list += [
+                '        return proxy',
+                '',
+                f'    def _create{node.method_name!s}(self) -> object:',
+            ]
+
+        argument_list = []
+        for index, (key, value) in enumerate(definition.arguments.items()):
+            expression, is_dynamic = self._write_value(
+                value=value, path=f'{path!s}.arguments[{key!r}]', dependency_list=node.dependency_list
+            )
+            if is_dynamic:
+                node.argument_line_list.append(f'a{index!s} = {expression!s}')
+                expression = f'a{index!s}'
+            argument_list.append((key, expression))
+
+        line_list = node.tail_line_list
+        factory = definition.factory
+        if isinstance(definition.class_, str) or isinstance(factory, str) or (
+            isinstance(factory, tuple) and isinstance(factory[0], str)
+        ):
+            factory_expression = self._bind(expression='None')
+            line_list += [
+                f'        if {factory_expression!s} is None:  # module is imported on first instantiation',
+                f'            {factory_expression!s} = self._compile_factory({self._bind(expression=path)!s})[0]',
+            ]
+        elif not factory:
+            factory_expression = self._bind(expression=f'{path!s}.class_')
+        elif isinstance(factory, tuple):
+            holder, method_name = factory
+            if isinstance(holder, Reference):
+                line_list.append(
+                    f'        factory = self._resolve_callable('
+                    f'{self._write_reference(id_=holder.id, dependency_list=None)!s}, {method_name!r})'
+                )
+                factory_expression = 'factory'
+            else:
+                factory_expression = self._bind(expression=f'self._resolve_callable({path!s}.factory[0], {method_name!r})')
+        elif callable(factory):
+            factory_expression = self._bind(expression=f'{path!s}.factory')
+        elif isinstance(factory, Reference):
+            line_list.append(f'        factory = {self._write_reference(id_=factory.id, dependency_list=None)!s}')
+            factory_expression = 'factory'
+        else:
+            raise NotImplementedError
+
+        line_list += [
+            '        try:',
+            f'            instance = {factory_expression!s}({_write_argument_list(argument_list=argument_list)!s})',
+            '        except TypeError as e:',
+            '            raise md.di.InvalidDefinitionConfigurationException(',
+            f'                {f"Unable to initialize service `{id_!s}`. Definition has invalid configuration."!r}',
+            '            ) from e',
+            '        except Exception as e:',
+            f'            raise md.di.InvalidDefinitionConfigurationException({f"Unable to initialize service `{id_!s}`"!r}) from e',
+        ]
+
+        if definition.shared:
+            line_list.append(f'        self._instance_map[{id_!r}] = instance')
+
+        call_line_list = []
+        for call_index, (method_name, call_argument_list, call_argument_map) in enumerate(definition.calls):
+            call_path = f'{path!s}.calls[{call_index!s}]'
+            message = f'Unable to initialize service. Definition `{id_!s}` has no method `{method_name!s}`'
+            call_line_list += [
+                '        try:',
+                f'            method = getattr(instance, {method_name!r})',
+                '        except AttributeError as e:',
+                f'            raise md.di.InvalidDefinitionConfigurationException({message!r}) from e',
+            ]
+            call_expression_list = [
+                (None, self._write_value(value=value, path=f'{call_path!s}[1][{index!s}]', dependency_list=None)[0])
+                for index, value in enumerate(call_argument_list)
+            ]
+            call_expression_list += [
+                (key, self._write_value(value=value, path=f'{call_path!s}[2][{key!r}]', dependency_list=None)[0])
+                for key, value in call_argument_map.items()
+            ]
+            call_line_list.append(f'        method({_write_argument_list(argument_list=call_expression_list)!s})')
+
+        record_line = f'self._record_construction(id_={id_!r}, definition={self._bind(expression=path)!s})'
+        if not definition.shared:
+            line_list += call_line_list
+        elif call_line_list:  # instance is kept when calls fail, so it is disposed as well
+            line_list += ['        try:', *(f'    {line!s}' for line in call_line_list), '        finally:']
+            line_list.append(f'            {record_line!s}')
+        else:
+            line_list.append(f'        {record_line!s}')
+        line_list.append('        return instance')
+
+    def _find_circular_node_set(self) -> typing.Set[_Node]:
+        """ Returns nodes which are part of argument dependency cycle """
+        circular_node_set = set()
+        for component in find_strongly_connected_component_list(
+            node_list=self._node_list,
+            get_dependency_list=lambda node: node.dependency_list,
+        ):
+            if len(component) > 1 or component[0] in component[0].dependency_list:
+                circular_node_set.update(component)
+        return circular_node_set
+
+
+def _write_argument_list(argument_list: typing.List[typing.Tuple[typing.Optional[str], str]]) -> str:
+    """ Writes call argument list source, argument without name is positional """
+    expression_list = []
+    unpacked_expression_list = []
+    for key, expression in argument_list:
+        if key is None:
+            expression_list.append(expression)
+        elif key.isidentifier() and not keyword.iskeyword(key):
+            expression_list.append(f'{key!s}={expression!s}')
+        else:
+            unpacked_expression_list.append(f'{key!r}: {expression!s}')
+
+    if unpacked_expression_list:
+        expression_list.append('**{' + ', '.join(unpacked_expression_list) + '}')
+    return ', '.join(expression_list)
+
+
+class Compiler:
+    """
+    Compiles container configuration into python module source with container class,
+    which has a factory method per service definition: aliases are resolved and argument kinds
+    dispatched once on compilation instead of every instantiation.
+
+    Compiled container is a snapshot: configuration changes made after compilation are not observed.
+    """
+    def compile(self, configuration: Configuration, class_name: str = 'Container') -> str:
+        """ Returns module source, that contains `CompiledContainer` subclass """
+        return _Writer(configuration=configuration, class_name=class_name).write()
+
+    def dump(self, configuration: Configuration, path: str, class_name: str = 'Container') -> None:
+        """ Writes compiled container module into file, so it could be imported later """
+        with open(path, 'w') as file:
+            file.write(self.compile(configuration=configuration, class_name=class_name))
+
+    def load(
+        self,
+        configuration: Configuration,
+        class_name: str = 'Container',
+        module_name: str = 'md.di.compiled',
+    ) -> typing.Type[CompiledContainer]:
+        """ Compiles configuration and returns container class, without writing it on disk """
+        module = types.ModuleType(module_name)
+        source = self.compile(configuration=configuration, class_name=class_name)
+        exec(compile(source, f'<{module_name!s}>', 'exec'), module.__dict__)
+        return getattr(module, class_name)
@@ -0,0 +1,213 @@
+import concurrent.futures
+import threading
+import typing
+
+import md.di
+
+from ._di import (
+    Configuration,
+    Definition,
+    LazyProxy,
+    ServiceCircularReferenceException,
+)
+
+__all__ = ('Container', )
+
+
+class Container(md.di.Container):
+    """
+    Thread-safe container:
+    built shared services are returned without locking, shared service construction is guarded by
+    a lock per service id (so unrelated services are built in parallel), circular reference is tracked per thread.
+    """
+    def __init__(self, configuration: Configuration = None, validated: bool = False) -> None:
+        self._local = threading.local()  # loading service stack is per thread
+        super().__init__(configuration=configuration, validated=validated)
+
+        self._ready_instance_map: typing.Dict[str, object] = dict(self._instance_map)  # fully initialized shared services
+        self._condition = threading.Condition()  # guards maps below, notifies waiting threads on construction end
+        self._owner_map: typing.Dict[str, int] = {}  # service id -> thread ident, that builds the service
+        self._waiting_map: typing.Dict[int, str] = {}  # thread ident -> service id, construction thread waits for
+
+    @property
+    def _loading_service_list(self) -> typing.List[str]:
+        try:
+            return self._local.loading_service_list
+        except AttributeError:
+            loading_service_list = self._local.loading_service_list = []
+            return loading_service_list
+
+    @_loading_service_list.setter
+    def _loading_service_list(self, loading_service_list: typing.List[str]) -> None:
+        self._local.loading_service_list = loading_service_list
+
+    def _get_instance(self, id_: str, definition: Definition = None) -> object:
+        try:
+            definition = definition or self._get_definition(id_=id_)  # aliased or native id is here, get native definition
+        except Exception as e:
+            raise Exception(f'Unable to retrieve service instance `{id_!s}`') from e  # fixme
+
+        if not definition.shared:
+            return self._instantiate(id_=id_, definition=definition)  # scope and lazy options are checked
+
+        if id_ in self._configuration.definition_alias_map:
+            id_ = self._configuration.definition_alias_map[id_]
+
+        try:
+            return self._ready_instance_map[id_]  # fast path, lock-free
+        except KeyError:
+            pass
+
+        ident = threading.get_ident()
+        if self._owner_map.get(id_) == ident:
+            # re-entrance from service calls (setter injection), service instance is not fully initialized yet,
+            # behaviour is the same as for non thread-safe container
+            if id_ in self._instance_map:
+                return self._instance_map[id_]
+            return self._instantiate(id_=id_, definition=definition)  # raises circular reference exception
+
+        if not self._acquire(id_=id_, ident=ident):
+            # threads wait for each other, current one takes instance created but not initialized with calls yet,
+            # behaviour is the same as for non thread-safe container
+            return self._instance_map[id_]
+
+        try:
+            if definition.retention is not None and definition.scope is None:
+                return self._get_retained_instance(id_=id_, definition=definition)
+
+            if id_ not in self._ready_instance_map:
+                if id_ not in self._instance_map:
+                    self._instantiate(id_=id_, definition=definition)
+                self._ready_instance_map[id_] = self._instance_map[id_]
+            return self._ready_instance_map[id_]
+        finally:
+            self._release(id_=id_)
+
+    def _create_lazy_instance(self, id_: str, definition: Definition) -> object:
+        if not definition.shared:
+            return self._create_instance(id_=id_, definition=definition)
+
+        ident = threading.get_ident()
+        is_owner = self._owner_map.get(id_) == ident
+        if not is_owner and not self._acquire(id_=id_, ident=ident):
+            return self._instance_map[id_]
+
+        try:
+            if id_ not in self._instance_map or isinstance(self._instance_map[id_], LazyProxy):
+                self._create_instance(id_=id_, definition=definition)  # proxy is not resolved by another thread yet
+            instance = self._ready_instance_map[id_] = self._instance_map[id_]
+            return instance
+        finally:
+            if not is_owner:
+                self._release(id_=id_)
+
+    def _acquire(self, id_: str, ident: int) -> bool:
+        """
+        Takes service construction ownership, waits when service is built by another thread.
+        Returns `False` when waiting causes deadlock and instance (not fully initialized) could be used instead
+        """
+        with self._condition:
+            while True:
+                owner = self._owner_map.get(id_)
+                if owner is None:
+                    self._owner_map[id_] = ident
+                    return True
+
+                waited_id_list = self._find_waited_id_list(id_=id_, ident=ident)
+                if waited_id_list is not None:  # deadlock
+                    if id_ in self._instance_map:
+                        return False
+
+                    if not any(waited_id in self._instance_map for waited_id in waited_id_list):
+                        raise ServiceCircularReferenceException(
+                            f'The service `{id_!s}` has a circular reference to itself: ' +
+                            ' -> '.join(waited_id_list + [id_]) + ' (between threads)'
+                        )
+                    self._condition.notify_all()  # let thread, which could take created instance, to continue
+
+                self._waiting_map[ident] = id_
+                self._condition.wait()
+                del self._waiting_map[ident]
+
+    def _find_waited_id_list(self, id_: str, ident: int) -> typing.Optional[typing.List[str]]:
+        """ Returns service ids threads wait for each other, when owner of `id_` (transitively) waits for `ident` """
+        waited_id_list = [id_]
+        owner = self._owner_map.get(id_)
+        while owner is not None:
+            if owner == ident:
+                return waited_id_list
+
+            waited_id = self._waiting_map.get(owner)
+            if waited_id is None:
+                return None
+            waited_id_list.append(waited_id)
+            owner = self._owner_map.get(waited_id)
+        return None
+
+    def _release(self, id_: str) -> None:
+        with self._condition:
+            del self._owner_map[id_]
+            self._condition.notify_all()
+
+    def _remember(self, id_: typing.Union[str, type], service_id: str, instance: object) -> None:
+        if type(instance) is LazyProxy:
+            return  # proxy is replaced with service instance, once it is resolved
+
+        instance_id = self._configuration.definition_alias_map.get(service_id, service_id)
+        if self._ready_instance_map.get(instance_id) is instance:  # instance could be not fully initialized yet
+            self._retrieval_map[id_] = instance
+
+    def set(self, id_: str, instance: object) -> None:
+        super().set(id_=id_, instance=instance)
+        self._ready_instance_map[id_] = instance
+
+    def evict(self, id_: str = None) -> None:
+        if id_ is not None:
+            self._ready_instance_map.pop(self._configuration.definition_alias_map.get(id_, id_), None)
+        super().evict(id_=id_)
+
+    def _take_disposable_instance_map(self) -> typing.Dict[str, typing.Tuple[object, Definition]]:
+        instance_map = super()._take_disposable_instance_map()
+        self._ready_instance_map = dict(self._instance_map)
+        return instance_map
+
+    def after_fork(self) -> None:
+        # threads of parent process do not exist in worker, their construction state is dropped
+        self._local = threading.local()
+        self._condition = threading.Condition()
+        self._owner_map.clear()
+        self._waiting_map.clear()
+
+        super().after_fork()
+        for id_ in self._fork_unsafe_id_set:
+            self._ready_instance_map.pop(id_, None)
+
+    def get_many(
+        self,
+        id_list: typing.Iterable[typing.Union[str, type]],
+        max_workers: int = None,
+    ) -> typing.List[object]:
+        """ See `md.di.Container.get_many`, independent services are created in parallel when `max_workers` is set """
+        if max_workers is None:
+            return super().get_many(id_list=id_list)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def create_level(level_id_list: typing.List[str]) -> typing.Dict[str, Exception]:
+                # error is reported on retrieval of requested service, which depends on the service
+                future_map = {id_: executor.submit(self._get_instance, id_) for id_ in level_id_list}
+                concurrent.futures.wait(list(future_map.values()))
+                return {
+                    id_: future.exception() for id_, future in future_map.items() if future.exception() is not None
+                }
+            return self._get_many(id_list=id_list, create_level=create_level)
+
+    def warm_up(self, tag: str = None, max_workers: int = None) -> None:
+        """
+        Creates public (or tagged with `tag`) shared services with their dependencies in advance,
+        independent services are created in parallel (in `max_workers` threads)
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for id_list in self._create_warm_up_level_list(tag=tag):
+                future_list = [executor.submit(self._get_instance, id_) for id_ in id_list]
+                for future in future_list:
+                    future.result()  # raises first error
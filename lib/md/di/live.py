@@ -1,4 +1,11 @@
+import collections.abc
+import importlib
 import inspect
+import os
+import pickle
+import pkgutil
+import sys
+import tempfile
 import typing
 import builtins
 
@@ -11,7 +18,12 @@ from ._di import (
     Reference,
     dereference,
     reference,
+    ClassNotFoundException,
     InvalidDefinitionConfigurationException,
+    _container_definition,
+    _container_id_set,
+    _import,
+    _iterate_definition_references,
 )
 
 _builtin_qualname_set: set = {
@@ -21,7 +33,160 @@ _builtin_qualname_set: set = {
     'tuple', 'frozenset',
 }
 
-__all__ = ('Container', )
+# generic types, which arguments are autowired with list of implementations, e.g. `typing.List[HandlerInterface]`
+_collection_origin_set: set = {list, collections.abc.Sequence, collections.abc.Iterable, collections.abc.Collection}
+
+__all__ = ('Container', 'DefinitionCache', 'ImplementationIndex')
+
+ArgumentSpecificationType = typing.Tuple[
+    typing.Tuple[
+        str,  # argument name
+        bool,  # is value a service reference id
+        typing.Any  # service reference id or default argument value
+    ],
+    ...
+]
+
+
+class DefinitionCache:
+    """
+    Autowired definition cache, keeps definition arguments discovered with class introspection,
+    so it is performed once per class in a process, (optionally) persisted between processes.
+    Persisted entry is invalidated when class module file is modified.
+    """
+    def __init__(self, path: str = None) -> None:
+        self._path = path
+        self._class_map: typing.Dict[type, ArgumentSpecificationType] = {}  # entries validated in current process
+        # class qualname -> (module file fingerprint, argument specification), loaded from disk
+        self._entry_map: typing.Dict[str, typing.Tuple[typing.Tuple[int, int], ArgumentSpecificationType]] = {}
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'rb') as file:
+                    self._entry_map = pickle.load(file)
+            except Exception:  # broken or incompatible cache file is ignored, it is rewritten on save
+                self._entry_map = {}
+
+    def get(self, class_: type) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """ Returns autowired definition arguments, if class is known """
+        specification = self._class_map.get(class_)
+
+        if specification is None and self._entry_map:
+            qualname = reference(id_=class_)
+            if qualname in self._entry_map:
+                fingerprint, specification = self._entry_map[qualname]
+                if fingerprint != _fingerprint(class_=class_):
+                    del self._entry_map[qualname]
+                    return None
+                self._class_map[class_] = specification
+
+        if specification is None:
+            return None
+
+        return {
+            argument: Reference(id_=value) if is_reference else value
+            for argument, is_reference, value in specification
+        }
+
+    def set(self, class_: type, arguments: typing.Dict[str, typing.Any]) -> None:
+        specification = tuple(
+            (argument, True, value.id) if isinstance(value, Reference) else (argument, False, value)
+            for argument, value in arguments.items()
+        )
+        self._class_map[class_] = specification
+
+        fingerprint = _fingerprint(class_=class_)
+        if fingerprint is not None:
+            self._entry_map[reference(id_=class_)] = (fingerprint, specification)
+
+    def save(self) -> None:
+        """ Persists cache entries (entries with not serializable default argument values are skipped) """
+        assert self._path, 'Cache file path is not provided'
+
+        entry_map = {}
+        for qualname, entry in self._entry_map.items():
+            try:
+                pickle.dumps(entry)
+            except Exception:
+                continue
+            entry_map[qualname] = entry
+
+        directory = os.path.dirname(os.path.abspath(self._path))
+        with tempfile.NamedTemporaryFile('wb', dir=directory, delete=False) as file:
+            pickle.dump(entry_map, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(file.name, self._path)
+
+    def clear(self) -> None:
+        self._class_map.clear()
+        self._entry_map.clear()
+
+
+def _fingerprint(class_: type) -> typing.Optional[typing.Tuple[int, int]]:
+    """ Returns class module file modification time and size """
+    module = sys.modules.get(class_.__module__)
+    path = getattr(module, '__file__', None)
+    if not path:
+        return None
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+_definition_cache = DefinitionCache()  # process-wide cache, used by default
+
+
+class ImplementationIndex:
+    """
+    Index of interface (or abstract class) implementations, defined in modules of package roots (e.g. `app`).
+    Module is indexed once, after it is imported: index is updated on lookup, when new modules are imported
+    """
+    def __init__(self, package_list: typing.Iterable[str]) -> None:
+        self._package_list = tuple(package_list)
+        self._implementation_map: typing.Dict[type, typing.List[type]] = {}  # base class -> concrete subclasses
+        self._indexed_module_set: typing.Set[str] = set()
+        self._module_count = 0  # count of imported modules on last update
+
+    def find(self, interface: type) -> typing.List[type]:
+        """ Returns concrete subclasses of interface, ordered by reference """
+        if len(sys.modules) != self._module_count:
+            self._update()
+        return sorted(self._implementation_map.get(interface, ()), key=reference)
+
+    def load(self) -> None:
+        """ Imports all modules of package roots, so implementations are found before their modules are used """
+        for package_name in self._package_list:
+            package = importlib.import_module(package_name)
+            for module_info in pkgutil.walk_packages(getattr(package, '__path__', []), prefix=f'{package_name!s}.'):
+                importlib.import_module(module_info.name)
+        self._update()
+
+    def _update(self) -> None:
+        self._module_count = len(sys.modules)
+        for module_name, module in list(sys.modules.items()):
+            if module_name in self._indexed_module_set or not self._is_indexed(module_name=module_name):
+                continue
+
+            if getattr(getattr(module, '__spec__', None), '_initializing', False):
+                continue  # module is being imported, its classes are not defined yet
+
+            self._indexed_module_set.add(module_name)
+            for value in list(vars(module).values()):
+                if isinstance(value, type) and value.__module__ == module_name and not _is_interface(class_=value):
+                    for base in value.__mro__[1:-1]:  # except class itself and `object`
+                        self._implementation_map.setdefault(base, []).append(value)
+
+    def _is_indexed(self, module_name: str) -> bool:
+        return any(
+            module_name == package_name or module_name.startswith(f'{package_name!s}.')
+            for package_name in self._package_list
+        )
+
+
+def _is_interface(class_: type) -> bool:
+    return inspect.isabstract(class_) or class_.__name__.lower().endswith('interface')
 
 
 class Container(md.di.Container):
@@ -30,10 +195,25 @@ class Container(md.di.Container):
         super().__init__(configuration=configuration)
         self._definition_map: typing.Dict[str, Definition] = {}
         self.logger = None
+        self._definition_cache = _definition_cache
+        self._implementation_index: typing.Optional[ImplementationIndex] = None
+        self._implementation_id_map: typing.Dict[str, str] = {}  # service id -> implementation id (for interface id)
 
     def set_logger(self, logger: psr.log.LoggerInterface) -> None:
         self.logger = logger
 
+    def set_definition_cache(self, definition_cache: DefinitionCache) -> None:
+        self._definition_cache = definition_cache
+
+    def set_implementation_index(self, implementation_index: ImplementationIndex) -> None:
+        """ Enables autowiring of interfaces with their implementations (interface could be configured explicitly) """
+        self._implementation_index = implementation_index
+        self._implementation_id_map.clear()
+        self._plan_map.clear()  # plan resolvers could be bound to definitions of implementations
+
+    def _get_plan_map(self, name: str = 'plan') -> typing.Dict[Definition, typing.Any]:
+        return {}  # definitions are created by container, so their plans are not shared
+
     def get(self, id_: typing.Union[str, type]) -> object:
         try:
             return super().get(id_=id_)
@@ -41,8 +221,92 @@ class Container(md.di.Container):
             # FIXME id_ could be an instance, eg. `Exception: Unable to retrieve service `<class 'psr.http.server.RequestHandlerInterface'>``
             raise Exception(f'Unable to retrieve service `{id_!s}`') from e
 
+    def discover(self, id_list: typing.Iterable[typing.Union[str, type]]) -> None:
+        """ Creates definitions of services and (transitively) their dependencies, without services instantiation """
+        pending_id_list = [reference(id_=id_) for id_ in id_list]
+        discovered_id_set = set()
+
+        while pending_id_list:
+            id_ = pending_id_list.pop()
+            if id_ in discovered_id_set or id_ in _container_id_set:
+                continue
+
+            discovered_id_set.add(id_)
+            definition = self._get_definition(id_=id_)
+            pending_id_list.extend(
+                reference_.id
+                for reference_ in _iterate_definition_references(definition=definition, configuration=self._configuration)
+            )
+
+    def export(self) -> Configuration:
+        """
+        Returns configuration with configured and created on fly (discovered) definitions,
+        which could be used with `md.di.Container` without introspection
+        """
+        definition_map = dict(self._configuration.definition_map)
+        definition_map.update(self._definition_map)
+
+        definition_alias_map = dict(self._configuration.definition_alias_map)
+        definition_alias_map.update(
+            (id_, implementation_id) for id_, implementation_id in self._implementation_id_map.items()
+            if id_ != implementation_id
+        )
+
+        return Configuration(
+            parameter_map=dict(self._configuration.parameter_map),
+            definition_map=definition_map,
+            definition_alias_map=definition_alias_map,
+        )
+
+    def _reference(self, id_: typing.Union[str, type]) -> str:
+        return self._resolve_implementation_id(id_=super()._reference(id_=id_))
+
+    def _get_instance(self, id_: str, definition: Definition = None) -> object:
+        if definition is None:  # referenced interface is retrieved as its implementation
+            id_ = self._resolve_implementation_id(id_=id_)
+        return super()._get_instance(id_=id_, definition=definition)
+
+    def _resolve_implementation_id(self, id_: str) -> str:
+        """ Returns id of the only interface implementation (see `ImplementationIndex`), or the same id otherwise """
+        try:
+            return self._implementation_id_map[id_]
+        except KeyError:
+            pass
+
+        implementation_id = id_
+        if (
+            self._implementation_index is not None and
+            id_ not in _container_id_set and
+            id_ not in self._configuration.definition_map and
+            id_ not in self._configuration.definition_alias_map
+        ):
+            try:
+                class_ = dereference(class_qualname=id_)
+            except ClassNotFoundException:
+                class_ = None  # unknown service error is raised on definition creation
+
+            if class_ is not None and _is_interface(class_=class_):
+                implementation_list = self._implementation_index.find(interface=class_)
+                if len(implementation_list) != 1:
+                    raise InvalidDefinitionConfigurationException(
+                        f'Unable to autowire interface `{id_!s}`: ' + (
+                            'implementation not found' if not implementation_list else
+                            'several implementations found: ' +
+                            ', '.join(f'`{reference(id_=class_)!s}`' for class_ in implementation_list)
+                        )
+                    )
+                implementation_id = reference(id_=implementation_list[0])
+
+        self._implementation_id_map[id_] = implementation_id
+        return implementation_id
+
     def _get_definition(self, id_: str) -> Definition:
         """ Returns class definition if exists or creates new else """
+        if id_ in _container_id_set:
+            return _container_definition
+
+        id_ = self._resolve_implementation_id(id_=id_)
+
         if id_ in self._configuration.definition_alias_map:
             id_ = self._configuration.definition_alias_map[id_]
 
@@ -55,6 +319,8 @@ class Container(md.di.Container):
 
                 if implicit_id in self._configuration.definition_map:
                     definition_class = self._configuration.definition_map[implicit_id].class_
+                    if isinstance(definition_class, str):
+                        definition_class = dereference(class_qualname=definition_class)
                     assert definition_class is class_
                     id_ = implicit_id
 
@@ -70,10 +336,29 @@ class Container(md.di.Container):
 
         if id_ in self._configuration.definition_map:
             definition = self._configuration.definition_map[id_]
+            # arguments are autowired into a copy, configuration is not modified (it could be frozen)
+            definition = Definition(
+                class_=definition.class_,
+                factory=definition.factory,
+                arguments=dict(definition.arguments),
+                calls=definition.calls,
+                public=definition.public,
+                shared=definition.shared,
+                tags=definition.tags,
+                lazy=definition.lazy,
+                scope=definition.scope,
+                pool=definition.pool,
+                reset=definition.reset,
+                retention=definition.retention,
+                dispose=definition.dispose,
+            )
 
             if definition.class_:
-                assert isinstance(definition.class_, type)
-                factory = definition.class_.__init__
+                class_ = definition.class_
+                if isinstance(class_, str):
+                    class_ = dereference(class_qualname=class_)
+                assert isinstance(class_, type)
+                factory = class_.__init__
 
             if definition.factory:
                 f = None
@@ -82,6 +367,8 @@ class Container(md.di.Container):
                 if isinstance(definition.factory, (list, tuple)):  # todo replace with `tuple` only
                     assert len(definition.factory) == 2
                     f, v = definition.factory
+                    if isinstance(f, str):
+                        f = _import(qualname=f)
 
                 if isinstance(definition.factory, Reference):
                     f = self._get_instance(id_=definition.factory.id)
@@ -93,6 +380,9 @@ class Container(md.di.Container):
                 if callable(definition.factory):
                     factory = definition.factory
 
+                if isinstance(definition.factory, str):
+                    factory = _import(qualname=definition.factory)
+
             factory_signature = inspect.signature(obj=factory)
 
             has_var_keyword = False  # **kwargs
@@ -132,16 +422,25 @@ class Container(md.di.Container):
                             f'`{reference(definition.arguments[argument])!s}` given.'
                         )
         else:
-            if id_.lower().endswith('interface'):
-                raise Exception(f'Cannot autowire interface `{id_!s}`')  # fixme wrong exception when interface is asked as a service from container
-
             assert class_
-            factory_signature = inspect.signature(class_.__init__)
-            definition = Definition(class_=class_, public=True)
+            if _is_interface(class_=class_):
+                raise InvalidDefinitionConfigurationException(
+                    f'Unable to create definition `{id_!s}`: interface could not be autowired, '
+                    f'configure implementation (or alias) or set implementation index'
+                )
 
             if self.logger:
                 self.logger.debug('definition created', {'id': id_})
 
+            arguments = self._definition_cache.get(class_=class_)
+            if arguments is not None:  # class has been already introspected
+                return Definition(class_=class_, public=True, arguments=arguments)
+
+            factory_signature = inspect.signature(class_.__init__)
+            definition = Definition(class_=class_, public=True)
+
+        is_cacheable = True  # list of implementations is not cached, it depends on imported modules
+
         # fixme lambda could be used in factory instead, and has no parameters
         # if 'self' not in factory.parameters:
         #     raise NotImplementedError
@@ -185,6 +484,12 @@ class Container(md.di.Container):
                 definition.arguments[argument] = Reference(id_=resolved_class.__name__ + '.' + class_path_list[-1])
                 continue
 
+            implementation_list = self._find_collection_implementation_list(annotation=argument_signature.annotation)
+            if implementation_list is not None:
+                definition.arguments[argument] = [Reference(id_=reference(id_=class_)) for class_ in implementation_list]
+                is_cacheable = False
+                continue
+
             if argument_signature.annotation.__module__ == 'typing':
                 raise InvalidDefinitionConfigurationException(
                     f'Unable to create definition `{id_!s}`: unable to autowire `{argument!s}: {argument_signature.annotation}` argument'
@@ -203,4 +508,17 @@ class Container(md.di.Container):
                 )
 
             definition.arguments[argument] = Reference(id_=argument_class_qualname)
+
+        if id_ not in self._configuration.definition_map and is_cacheable:
+            self._definition_cache.set(class_=class_, arguments=definition.arguments)
         return definition
+
+    def _find_collection_implementation_list(self, annotation: typing.Any) -> typing.Optional[typing.List[type]]:
+        """ Returns implementations of collection item class, e.g. for `typing.List[HandlerInterface]` """
+        if self._implementation_index is None or getattr(annotation, '__origin__', None) not in _collection_origin_set:
+            return None
+
+        argument_list = getattr(annotation, '__args__', None) or ()
+        if len(argument_list) != 1 or not isinstance(argument_list[0], type):
+            return None
+        return self._implementation_index.find(interface=argument_list[0])
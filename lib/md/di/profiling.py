@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+import typing
+
+from ._di import (
+    Definition,
+    InstrumentationInterface,
+)
+
+__all__ = ('Profiler', 'ServiceStatistics')
+
+
+class ServiceStatistics:
+    """ Service retrieval counters and construction time (seconds) """
+    def __init__(self, id_: str) -> None:
+        self.id = id_
+        self.hit_count = 0  # shared service is retrieved, it is created already
+        self.miss_count = 0  # service is created
+        self.inclusive_time = 0.0  # construction time with dependencies construction
+        self.exclusive_time = 0.0  # construction time without dependencies construction
+
+    def __repr__(self) -> str:
+        return (
+            f'ServiceStatistics(id_={self.id!r}, hit_count={self.hit_count!r}, miss_count={self.miss_count!r}, '
+            f'inclusive_time={self.inclusive_time!r}, exclusive_time={self.exclusive_time!r})'
+        )
+
+
+class Profiler(InstrumentationInterface):
+    """
+    Collects service statistics and construction trace, e.g.:
+
+        profiler = md.di.profiling.Profiler()
+        container.set_instrumentation(profiler)
+        ...
+        profiler.dump_chrome_trace(path='trace.json')  # open with chrome://tracing or https://ui.perfetto.dev
+    """
+    def __init__(self) -> None:
+        self.statistics_map: typing.Dict[str, ServiceStatistics] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()  # construction stack per thread
+        self._start = time.perf_counter()
+        self._event_list: typing.List[typing.Dict[str, typing.Any]] = []  # chrome trace events
+        self._folded_stack_map: typing.Dict[str, float] = {}  # `root;dependency` -> exclusive time
+
+    def hit(self, id_: str) -> None:
+        with self._lock:
+            self._get_statistics(id_=id_).hit_count += 1
+
+    def before_construction(self, id_: str, definition: Definition, depth: int) -> None:
+        stack = self._get_stack()
+        # service id, start time, dependencies construction time
+        stack.append([id_, time.perf_counter(), 0.0])
+
+    def after_construction(self, id_: str, definition: Definition, depth: int, elapsed: float) -> None:
+        stack = self._get_stack()
+        folded_stack = ';'.join(frame[0] for frame in stack)
+        _, start, dependency_elapsed = stack.pop()
+        if stack:
+            stack[-1][2] += elapsed
+        exclusive_elapsed = elapsed - dependency_elapsed
+
+        with self._lock:
+            statistics = self._get_statistics(id_=id_)
+            statistics.miss_count += 1
+            statistics.inclusive_time += elapsed
+            statistics.exclusive_time += exclusive_elapsed
+
+            self._folded_stack_map[folded_stack] = self._folded_stack_map.get(folded_stack, 0.0) + exclusive_elapsed
+            self._event_list.append({
+                'name': id_,
+                'cat': 'construction',
+                'ph': 'X',  # complete event
+                'ts': (start - self._start) * 1e6,  # microseconds
+                'dur': elapsed * 1e6,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': {'depth': depth},
+            })
+
+    def get_statistics_list(self) -> typing.List[ServiceStatistics]:
+        """ Returns service statistics, slowest services (by exclusive time) go first """
+        with self._lock:
+            return sorted(self.statistics_map.values(), key=lambda statistics: statistics.exclusive_time, reverse=True)
+
+    def create_chrome_trace(self) -> typing.Dict[str, typing.Any]:
+        """ Returns construction trace in Chrome trace event format """
+        with self._lock:
+            return {'traceEvents': list(self._event_list), 'displayTimeUnit': 'ms'}
+
+    def dump_chrome_trace(self, path: str) -> None:
+        with open(path, 'w') as file:
+            json.dump(self.create_chrome_trace(), file)
+
+    def create_folded_stack_list(self) -> typing.List[str]:
+        """
+        Returns construction stacks in folded format (`root;dependency microseconds`),
+        which is accepted by flame graph tools (e.g. flamegraph.pl, speedscope)
+        """
+        with self._lock:
+            return [
+                f'{folded_stack!s} {round(elapsed * 1e6)!s}' for folded_stack, elapsed in self._folded_stack_map.items()
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.statistics_map.clear()
+            self._event_list.clear()
+            self._folded_stack_map.clear()
+
+    def _get_statistics(self, id_: str) -> ServiceStatistics:
+        statistics = self.statistics_map.get(id_)
+        if statistics is None:
+            statistics = self.statistics_map[id_] = ServiceStatistics(id_=id_)
+        return statistics
+
+    def _get_stack(self) -> typing.List[list]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+            return stack
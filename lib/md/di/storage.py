@@ -0,0 +1,329 @@
+import math
+import mmap
+import pickle
+import struct
+import types
+import typing
+
+from ._di import (
+    Callable,
+    Configuration,
+    Definition,
+    DefinitionTagType,
+    Env,
+    InvalidDefinitionConfigurationException,
+    Parameter,
+    Reference,
+    Retention,
+    Tagged,
+    _create_tag_index,
+    _FrozenList,
+    _undefined,
+)
+
+__all__ = ('dump', 'load', 'dump_indexed', 'load_indexed', 'write_python')
+
+_definition_attribute_list: typing.List[str] = [  # same as constructor argument names
+    'class_', 'factory', 'arguments', 'calls', 'public', 'shared', 'tags', 'lazy', 'scope', 'pool', 'reset', 'retention',
+    'dispose',
+]
+_default_definition_map: typing.Dict[str, typing.Any] = {
+    'arguments': {}, 'calls': [], 'public': False, 'shared': True, 'tags': [], 'lazy': False, 'scope': None,
+    'pool': None, 'reset': [], 'retention': None, 'dispose': None,
+}
+_collection_definition_attribute_set: typing.Set[str] = {'arguments', 'calls', 'tags', 'reset'}
+# indexed configuration file header: signature, format version, index offset
+_indexed_header = struct.Struct('<8sBQ')
+_indexed_signature = b'md.di\x00\x00\x00'
+_indexed_version = 1
+
+
+def dump(configuration: Configuration, path: str) -> None:
+    """ Writes configuration into file (pickle), all definition values must be serializable (configuration is not frozen) """
+    with open(path, 'wb') as file:
+        pickle.dump(configuration, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load(path: str) -> Configuration:
+    """ Reads configuration written with `dump` """
+    with open(path, 'rb') as file:
+        configuration = pickle.load(file)
+
+    assert isinstance(configuration, Configuration)
+    return configuration
+
+
+def dump_indexed(configuration: Configuration, path: str) -> None:
+    """
+    Writes configuration into indexed file: definitions are stored separately (pickle) and followed by index
+    (service id -> definition position, aliases, parameters, tags), so `load_indexed` reads index only
+    """
+    with open(path, 'wb') as file:
+        file.write(_indexed_header.pack(_indexed_signature, _indexed_version, 0))  # index offset is written last
+
+        position_map = {}  # service id -> (offset, size)
+        for id_, definition in configuration.definition_map.items():
+            data = pickle.dumps(_thaw(value=definition), protocol=pickle.HIGHEST_PROTOCOL)
+            position_map[id_] = (file.tell(), len(data))
+            file.write(data)
+
+        index_offset = file.tell()
+        pickle.dump(
+            (
+                position_map,
+                dict(configuration.definition_alias_map),
+                _thaw(value=dict(configuration.parameter_map)),
+                {
+                    tag: [(id_, dict(tag_)) for id_, tag_ in tagged_list]
+                    for tag, tagged_list in _create_tag_index(definition_map=configuration.definition_map).items()
+                },
+            ),
+            file,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        file.seek(0)
+        file.write(_indexed_header.pack(_indexed_signature, _indexed_version, index_offset))
+
+
+def load_indexed(path: str) -> Configuration:
+    """
+    Returns read-only configuration of file written with `dump_indexed`, file is memory mapped
+    and definition is decoded (and its module is imported) on first access, so configuration load time
+    does not depend on definitions count (but index size)
+    """
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    signature, version, index_offset = _indexed_header.unpack_from(buffer)
+    if signature != _indexed_signature or version != _indexed_version or not index_offset:
+        raise InvalidDefinitionConfigurationException(f'File `{path!s}` is not an indexed container configuration')
+
+    position_map, definition_alias_map, parameter_map, tag_index = pickle.loads(buffer[index_offset:])
+    return _IndexedConfiguration(
+        parameter_map=parameter_map,
+        definition_map=_IndexedDefinitionMap(buffer=buffer, position_map=position_map),
+        definition_alias_map=types.MappingProxyType(definition_alias_map),
+        tag_index=tag_index,
+    )
+
+
+class _IndexedDefinitionMap(typing.Mapping[str, Definition]):
+    """ Read-only definition map, which decodes definition on first access """
+    def __init__(self, buffer: mmap.mmap, position_map: typing.Dict[str, typing.Tuple[int, int]]) -> None:
+        self._buffer = buffer
+        self._position_map = position_map  # service id -> (offset, size)
+        self._definition_map: typing.Dict[str, Definition] = {}  # decoded definitions
+
+    def __getitem__(self, id_: str) -> Definition:
+        try:
+            return self._definition_map[id_]
+        except KeyError:
+            pass
+
+        offset, size = self._position_map[id_]
+        definition = pickle.loads(self._buffer[offset:offset + size])
+        return self._definition_map.setdefault(id_, definition)  # the same definition, when decoded concurrently
+
+    def __contains__(self, id_: object) -> bool:
+        return id_ in self._position_map
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._position_map)
+
+    def __len__(self) -> int:
+        return len(self._position_map)
+
+    def __repr__(self) -> str:
+        return f'<indexed definitions ({len(self._definition_map)!s} of {len(self._position_map)!s} decoded)>'
+
+
+class _IndexedConfiguration(Configuration):
+    """ Configuration loaded with `load_indexed`, tag index is read from file """
+    __slots__ = ()
+
+    def __init__(
+        self,
+        parameter_map: typing.Dict[str, typing.Any],
+        definition_map: _IndexedDefinitionMap,
+        definition_alias_map: typing.Mapping[str, str],
+        tag_index: typing.Dict[str, typing.List[typing.Tuple[str, DefinitionTagType]]],
+    ) -> None:
+        super().__init__(parameter_map=parameter_map)
+        self.definition_map = definition_map
+        self.definition_alias_map = definition_alias_map
+        self._tag_index = tag_index
+
+    def reindex(self) -> None:
+        pass  # definitions are read-only, index could not become stale
+
+
+def _thaw(value: typing.Any) -> typing.Any:
+    """ Returns picklable copy of (frozen) configuration value """
+    if isinstance(value, Definition):
+        return Definition(
+            class_=value.class_,
+            factory=_thaw(value=value.factory),
+            arguments=_thaw(value=value.arguments),
+            calls=[
+                (method_name, _thaw(value=argument_list), _thaw(value=argument_map))
+                for method_name, argument_list, argument_map in value.calls
+            ],
+            reset=[
+                (method_name, _thaw(value=argument_list), _thaw(value=argument_map))
+                for method_name, argument_list, argument_map in value.reset
+            ],
+            pool=value.pool,
+            retention=_thaw(value=value.retention),
+            dispose=value.dispose,
+            public=value.public,
+            shared=value.shared,
+            tags=[dict(tag) for tag in value.tags],
+            lazy=value.lazy,
+            scope=value.scope,
+        )
+
+    if isinstance(value, Reference):
+        return Reference(id_=value.id, lazy=value.lazy)
+
+    if isinstance(value, Callable):
+        return Callable(holder=_thaw(value=value.holder), method=value.method)
+
+    if isinstance(value, Tagged):
+        return Tagged(tag=value.tag, priority=value.priority)
+
+    if isinstance(value, Retention):
+        return Retention(
+            idle_ttl=value.idle_ttl,
+            weak=value.weak,
+            group=value.group,
+            capacity=value.capacity,
+            memory_budget=value.memory_budget,
+        )
+
+    if isinstance(value, Parameter):
+        return Parameter(name=value.name)
+
+    if isinstance(value, Env):
+        return Env(name=value.name, cast=value.cast, default=value.default)
+
+    if isinstance(value, (list, _FrozenList)):
+        return [_thaw(value=item) for item in value]
+
+    if isinstance(value, tuple):  # e.g. factory
+        return tuple(_thaw(value=item) for item in value)
+
+    if isinstance(value, (dict, types.MappingProxyType)):
+        return {key: _thaw(value=item) for key, item in value.items()}
+
+    return value
+
+
+def write_python(configuration: Configuration, name: str = 'configuration') -> str:
+    """
+    Returns python module source, which contains configuration as `name` variable.
+    Classes and functions are imported by qualified name, so they must be module-level;
+    other values must be literals.
+    """
+    writer = _PythonWriter()
+    source = writer.write_value(value=configuration)
+    import_list = ['import md.di'] + [f'import {module!s}' for module in sorted(writer.module_set)]
+
+    return (
+        '# This module is generated by `md.di.storage`, do not edit it manually\n' +
+        '\n'.join(import_list) + '\n\n' +
+        f'{name!s} = {source!s}\n'
+    )
+
+
+class _PythonWriter:
+    def __init__(self) -> None:
+        self.module_set: typing.Set[str] = set()
+
+    def write_value(self, value: typing.Any, indent: str = '') -> str:
+        next_indent = indent + '    '
+
+        if isinstance(value, Configuration):
+            return self._write_call('md.di.Configuration', [
+                ('parameter_map', self.write_value(value=value.parameter_map, indent=next_indent)),
+                ('definition_map', self.write_value(value=value.definition_map, indent=next_indent)),
+                ('definition_alias_map', self.write_value(value=value.definition_alias_map, indent=next_indent)),
+            ], indent=indent)
+
+        if isinstance(value, Definition):
+            argument_list = []
+            for attribute in _definition_attribute_list:
+                attribute_value = getattr(value, attribute)
+                if attribute_value is None or attribute in _default_definition_map and (
+                    attribute_value == _default_definition_map[attribute] or
+                    # e.g. empty tuple of frozen definition
+                    attribute in _collection_definition_attribute_set and not attribute_value
+                ):
+                    continue  # default values are omitted
+                argument_list.append((attribute, self.write_value(value=attribute_value, indent=next_indent)))
+            return self._write_call('md.di.Definition', argument_list, indent=indent)
+
+        if isinstance(value, Reference):
+            argument_list = [('id_', repr(value.id))]
+            if value.lazy:
+                argument_list.append(('lazy', 'True'))
+            return 'md.di.Reference(' + ', '.join(f'{key!s}={item!s}' for key, item in argument_list) + ')'
+
+        if isinstance(value, Tagged):
+            return f'md.di.Tagged(tag={value.tag!r}, priority={value.priority!r})'
+
+        if isinstance(value, Parameter):
+            return f'md.di.Parameter(name={value.name!r})'
+
+        if isinstance(value, Retention):
+            return (
+                f'md.di.Retention(idle_ttl={value.idle_ttl!r}, weak={value.weak!r}, group={value.group!r}, '
+                f'capacity={value.capacity!r}, memory_budget={value.memory_budget!r})'
+            )
+
+        if isinstance(value, Env):
+            argument_list = [('name', repr(value.name))]
+            if value.cast is not str:
+                argument_list.append(('cast', self.write_value(value=value.cast)))
+            if value.default is not _undefined:
+                argument_list.append(('default', self.write_value(value=value.default)))
+            return 'md.di.Env(' + ', '.join(f'{key!s}={item!s}' for key, item in argument_list) + ')'
+
+        if isinstance(value, Callable):
+            return f'md.di.Callable(holder={self.write_value(value=value.holder)!s}, method={value.method!r})'
+
+        if isinstance(value, (dict, types.MappingProxyType)):  # frozen configuration maps are read-only proxies
+            if not value:
+                return '{}'
+            item_list = [
+                f'{next_indent!s}{self.write_value(value=key)!s}: {self.write_value(value=item, indent=next_indent)!s},'
+                for key, item in value.items()
+            ]
+            return '{\n' + '\n'.join(item_list) + f'\n{indent!s}}}'
+
+        if isinstance(value, (list, tuple)):
+            item_list = [self.write_value(value=item, indent=next_indent) for item in value]
+            if isinstance(value, tuple) and not isinstance(value, _FrozenList):
+                return '(' + ''.join(f'{item!s}, ' for item in item_list).rstrip() + ')'
+            return '[' + ', '.join(item_list) + ']'
+
+        if isinstance(value, float) and not math.isfinite(value):
+            return f'float({str(value)!r})'
+
+        if value is None or isinstance(value, (str, int, float, bool, bytes)):
+            return repr(value)
+
+        module = getattr(value, '__module__', None)
+        qualname = getattr(value, '__qualname__', None)
+        if module and qualname and '<' not in qualname and (isinstance(value, type) or callable(value)):
+            self.module_set.add(module)
+            return f'{module!s}.{qualname!s}'
+
+        raise InvalidDefinitionConfigurationException(f'Value `{value!r}` could not be written as python source')
+
+    def _write_call(self, callable_name: str, argument_list: typing.List[typing.Tuple[str, str]], indent: str) -> str:
+        next_indent = indent + '    '
+        return (
+            f'{callable_name!s}(\n' +
+            ''.join(f'{next_indent!s}{key!s}={value!s},\n' for key, value in argument_list) +
+            f'{indent!s})'
+        )
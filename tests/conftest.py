@@ -0,0 +1,32 @@
+import os
+import sys
+import typing
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lib'))
+
+import md.di  # noqa: E402
+import md.di.compiler  # noqa: E402
+import md.di.concurrent  # noqa: E402
+
+
+def create_compiled_container(configuration: md.di.Configuration) -> md.di.Container:
+    class_ = md.di.compiler.Compiler().load(configuration=configuration)
+    return class_(configuration=configuration)
+
+
+@pytest.fixture(params=[False, True], ids=['mutable', 'frozen'])
+def frozen(request) -> bool:
+    return request.param
+
+
+@pytest.fixture(
+    params=[md.di.Container, create_compiled_container, md.di.concurrent.Container],
+    ids=['interpreted', 'compiled', 'concurrent'],
+)
+def create_container(request, frozen) -> typing.Callable[[md.di.Configuration], md.di.Container]:
+    """ Returns container factory, which (optionally) freezes configuration """
+    def create(configuration: md.di.Configuration) -> md.di.Container:
+        return request.param(configuration.freeze() if frozen else configuration)
+    return create
@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+import pytest
+
+import md.di
+import md.di.aio
+
+
+class Service:
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+        self.call_list = []
+
+    async def call(self, *args) -> None:
+        self.call_list.append(args)
+
+
+async def create_service(**kwargs) -> Service:
+    await asyncio.sleep(0)
+    return Service(**kwargs)
+
+
+def test_aget() -> None:
+    configuration = md.di.Configuration(
+        definition_map={
+            'dependency': md.di.Definition(factory=create_service),
+            'service': md.di.Definition(
+                factory=create_service,
+                arguments={'dependency': md.di.Reference('dependency'), 'list': [md.di.Reference('alias')]},
+                calls=[('call', [md.di.Reference('dependency')], {})],
+                public=True,
+            ),
+            'non_shared': md.di.Definition(class_=Service, shared=False, public=True),
+        },
+        definition_alias_map={'alias': 'dependency'},
+    )
+    container = md.di.aio.Container(configuration=configuration)
+
+    async def main() -> None:
+        service, other_service = await asyncio.gather(container.aget('service'), container.aget('service'))
+        assert service is other_service
+        dependency = service.kwargs['dependency']
+        assert service.kwargs['list'] == [dependency]
+        assert service.call_list == [(dependency, )]
+        assert await container.aget('non_shared') is not await container.aget('non_shared')
+    asyncio.run(main())
+
+
+def test_circular_reference() -> None:
+    configuration = md.di.Configuration(definition_map={
+        'first': md.di.Definition(class_=Service, arguments={'second': md.di.Reference('second')}, public=True),
+        'second': md.di.Definition(class_=Service, arguments={'first': md.di.Reference('first')}),
+    })
+    container = md.di.aio.Container(configuration=configuration)
+
+    with pytest.raises(md.di.ServiceCircularReferenceException):
+        asyncio.run(container.aget('first'))
+
+
+def test_concurrent_arguments() -> None:
+    created_list = []
+
+    async def create_slow(name: str) -> str:
+        created_list.append(name)
+        await asyncio.sleep(0.1)
+        return name
+
+    configuration = md.di.Configuration(definition_map={
+        'first': md.di.Definition(factory=create_slow, arguments={'name': 'first'}),
+        'second': md.di.Definition(factory=create_slow, arguments={'name': 'second'}),
+        'service': md.di.Definition(
+            class_=Service,
+            arguments={'first': md.di.Reference('first'), 'second': md.di.Reference('second')},
+            public=True,
+        ),
+    })
+    container = md.di.aio.Container(configuration=configuration)
+
+    async def main() -> None:
+        started_at = time.monotonic()
+        service, other_service = await asyncio.gather(container.aget('service'), container.aget('service'))
+        assert time.monotonic() - started_at < 0.19  # arguments are awaited concurrently
+        assert service is other_service
+        assert service.kwargs == {'first': 'first', 'second': 'second'}
+    asyncio.run(main())
+    assert sorted(created_list) == ['first', 'second']
+
+
+def test_invalidate() -> None:
+    definition = md.di.Definition(class_=Service, arguments={'value': 1}, shared=False, public=True)
+    container = md.di.aio.Container(configuration=md.di.Configuration(definition_map={'service': definition}))
+    assert asyncio.run(container.aget('service')).kwargs['value'] == 1
+
+    definition.arguments['value'] = 2
+    container.invalidate()
+    assert container.get('service').kwargs['value'] == 2
+    assert asyncio.run(container.aget('service')).kwargs['value'] == 2
+
+
+class Instrumentation(md.di.InstrumentationInterface):
+    def __init__(self) -> None:
+        self.event_list = []
+
+    def hit(self, id_: str) -> None:
+        self.event_list.append(('hit', id_))
+
+    def before_construction(self, id_: str, definition: md.di.Definition, depth: int) -> None:
+        self.event_list.append(('before', id_, depth))
+
+    def after_construction(self, id_: str, definition: md.di.Definition, depth: int, elapsed: float) -> None:
+        self.event_list.append(('after', id_, depth))
+
+
+def test_instrumentation() -> None:
+    configuration = md.di.Configuration(definition_map={
+        'dependency': md.di.Definition(factory=create_service),
+        'service': md.di.Definition(
+            factory=create_service, arguments={'dependency': md.di.Reference('dependency')}, public=True,
+        ),
+    })
+    container = md.di.aio.Container(configuration=configuration)
+    instrumentation = Instrumentation()
+    container.set_instrumentation(instrumentation)
+
+    async def main() -> None:
+        await container.aget('service')
+        await container.aget('service')
+    asyncio.run(main())
+    assert instrumentation.event_list == [
+        ('before', 'service', 0),
+        ('before', 'dependency', 1),
+        ('after', 'dependency', 1),
+        ('after', 'service', 0),
+        ('hit', 'service'),
+    ]
+
+
+def test_scope() -> None:
+    closed_list = []
+
+    class Connection:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        async def aclose(self) -> None:
+            closed_list.append(self.name)
+
+    configuration = md.di.Configuration(definition_map={
+        'dependency': md.di.Definition(factory=create_service, public=True),
+        'connection': md.di.Definition(
+            class_=Connection, arguments={'name': 'connection'}, scope='request', public=True,
+        ),
+        'service': md.di.Definition(
+            factory=create_service,
+            arguments={'connection': md.di.Reference('connection'), 'dependency': md.di.Reference('dependency')},
+            shared=False,
+            public=True,
+        ),
+    })
+    container = md.di.aio.Container(configuration=configuration)
+
+    async def handle() -> Service:
+        scope = container.current_scope()
+        service = await scope.aget('service')
+        assert service.kwargs['connection'] is await scope.aget('connection')
+        return service
+
+    async def request() -> Service:
+        async with container.scope() as scope:
+            assert container.current_scope() is scope
+            return await asyncio.ensure_future(handle())  # task inherits current scope
+
+    async def main() -> None:
+        with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+            await container.aget('connection')
+
+        service, other_service = await asyncio.gather(request(), request())
+        assert service.kwargs['connection'] is not other_service.kwargs['connection']
+        assert service.kwargs['dependency'] is other_service.kwargs['dependency'] is await container.aget('dependency')
+        assert container.current_scope() is container
+    asyncio.run(main())
+    assert closed_list == ['connection', 'connection']
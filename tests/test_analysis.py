@@ -0,0 +1,104 @@
+import pytest
+
+import md.di
+import md.di.analysis
+
+
+class Service:
+    def __init__(self, dependency, value=1) -> None:
+        self.dependency = dependency
+        self.value = value
+
+    def call(self, dependency) -> None:
+        self.called_with = dependency
+
+
+class VariadicService:
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+
+def create_configuration() -> md.di.Configuration:
+    return md.di.Configuration(
+        definition_map={
+            'first': md.di.Definition(
+                class_=Service,
+                arguments={'dependency': md.di.Reference('second'), 'unknown': 1},
+                public=True,
+            ),
+            'second': md.di.Definition(class_=Service, arguments={'dependency': md.di.Reference('first_alias')}),
+            'missing_argument': md.di.Definition(class_=Service),
+            'dangling': md.di.Definition(class_=Service, arguments={'dependency': md.di.Reference('missing')}, public=True),
+            'self_call': md.di.Definition(
+                class_=Service,
+                arguments={'dependency': md.di.Reference('md.di.Container')},
+                calls=[('call', [md.di.Reference('self_call')], {})],  # calls do not form circular reference
+                public=True,
+            ),
+            'variadic': md.di.Definition(class_=VariadicService, arguments={'any': 1}, public=True),
+        },
+        definition_alias_map={'first_alias': 'first', 'chain': 'first_alias', 'broken': 'missing'},
+    )
+
+
+def test_analyze() -> None:
+    report = md.di.analysis.Analyzer().analyze(configuration=create_configuration())
+
+    assert not report.is_valid
+    assert report.circular_reference_list == [['first', 'second']]
+    assert report.dangling_reference_list == [('dangling', 'missing')]
+    assert report.alias_chain_list == [['chain', 'first_alias', 'first'], ['broken', 'missing']]
+    assert report.argument_mismatch_list == [
+        ('first', 'unknown', 'unknown argument'),
+        ('missing_argument', 'dependency', 'missing argument'),
+    ]
+    assert report.unreachable_private_id_list == ['missing_argument']
+
+
+class PositionalService:
+    def __init__(self, *args) -> None:
+        self.args = args
+
+
+@pytest.mark.parametrize('class_, argument_map, mismatch_list', [
+    (VariadicService, {'args': 1, 'kwargs': 2}, []),  # arguments are collected by `**kwargs`
+    (PositionalService, {'args': 1}, [('service', 'args', 'argument could not be passed by name')]),
+])
+def test_variadic_argument(class_: type, argument_map: dict, mismatch_list: list) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'service': md.di.Definition(class_=class_, arguments=argument_map, public=True),
+    })
+    report = md.di.analysis.Analyzer().analyze(configuration=configuration)
+    assert report.argument_mismatch_list == mismatch_list
+
+
+def test_valid_configuration() -> None:
+    configuration = md.di.Configuration(definition_map={
+        'dependency': md.di.Definition(class_=VariadicService),
+        'service': md.di.Definition(class_=Service, arguments={'dependency': md.di.Reference('dependency')}, public=True),
+    })
+
+    report = md.di.analysis.Analyzer().analyze(configuration=configuration)
+    assert report.is_valid
+    assert report.unreachable_private_id_list == []
+    md.di.analysis.Analyzer().validate(configuration=configuration)
+
+
+def test_validate() -> None:
+    with pytest.raises(md.di.ServiceCircularReferenceException):
+        md.di.analysis.Analyzer().validate(configuration=create_configuration())
+
+    configuration = create_configuration()
+    del configuration.definition_map['second']
+    with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+        md.di.analysis.Analyzer().validate(configuration=configuration)
+
+
+def test_validated_container() -> None:
+    configuration = md.di.Configuration(definition_map={
+        'service': md.di.Definition(class_=Service, arguments={'dependency': 1}, public=True),
+    })
+
+    container = md.di.Container(configuration=configuration, validated=True)
+    assert container.get('service').dependency == 1
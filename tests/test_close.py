@@ -0,0 +1,216 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import md.di
+import md.di.aio
+import md.di.concurrent
+
+
+class Service:
+    def __init__(self, name: str, **dependency_map) -> None:
+        self.name = name
+        self.dependency_map = dependency_map
+
+
+def create_configuration(disposed_list: list, delay: float = 0) -> md.di.Configuration:
+    class Disposable(Service):
+        def close(self) -> None:
+            disposed_list.append(self.name)
+
+    class Slow(Service):
+        def close(self) -> None:
+            time.sleep(delay)
+            disposed_list.append(self.name)
+
+    class Context(Service):
+        def __exit__(self, *args) -> None:
+            disposed_list.append(f'exit:{self.name!s}')
+
+    class Custom(Service):
+        def shutdown(self) -> None:
+            disposed_list.append(f'shutdown:{self.name!s}')
+
+    class Broken(Service):
+        def close(self) -> None:
+            raise ValueError('Unable to close')
+
+    class FailingCall(Disposable):
+        def fail(self) -> None:
+            raise ValueError('Unable to call')
+
+    def define(class_: type, name: str, *dependency_id_list, **kwargs) -> md.di.Definition:
+        return md.di.Definition(
+            class_=class_,
+            arguments={'name': name, **{id_: md.di.Reference(id_) for id_ in dependency_id_list}},
+            **kwargs,
+        )
+
+    return md.di.Configuration(definition_map={
+        'database': define(Disposable, 'database'),
+        'pool': define(Slow, 'pool'),
+        'helper': define(Disposable, 'helper', shared=False),  # non-shared service is not disposed
+        'repository': define(Disposable, 'repository', 'database', 'helper', public=True),
+        'api': define(Disposable, 'api', public=True),
+        'application': define(Disposable, 'application', 'repository', 'api', 'pool', public=True),
+        'context': define(Context, 'context', public=True),
+        'custom': define(Custom, 'custom', dispose='shutdown', public=True),
+        'not_disposed': define(Disposable, 'not_disposed', dispose=False, public=True),
+        'broken': define(Broken, 'broken', public=True),
+        'scoped': define(Disposable, 'scoped', scope='request', public=True),
+        'failing_call': define(FailingCall, 'failing_call', 'database', calls=[('fail', [], {})], public=True),
+        'idle': define(Disposable, 'idle', retention=md.di.Retention(idle_ttl=0.05), public=True),
+    })
+
+
+def test_close(create_container) -> None:
+    disposed_list = []
+    container = create_container(create_configuration(disposed_list=disposed_list))
+
+    application = container.get('application')
+    for id_ in ('context', 'custom', 'not_disposed'):
+        container.get(id_)
+    with container.scope() as scope:
+        scope.get('scoped')
+    assert disposed_list == ['scoped']
+    disposed_list.clear()
+
+    container.close()
+    assert disposed_list == [
+        'shutdown:custom', 'exit:context', 'application', 'pool', 'api', 'repository', 'database',
+    ]
+    assert container.get('application') is not application
+
+
+def test_close_errors(create_container) -> None:
+    disposed_list = []
+    container = create_container(create_configuration(disposed_list=disposed_list))
+    container.get('broken')
+    container.get('api')
+
+    with pytest.raises(md.di.ServiceDisposalException) as exception_info:
+        container.close()
+    assert list(exception_info.value.error_map) == ['broken']
+    assert disposed_list == ['api']  # rest services are disposed anyway
+
+
+def test_close_service_with_failed_calls(create_container) -> None:
+    disposed_list = []
+    container = create_container(create_configuration(disposed_list=disposed_list))
+
+    with pytest.raises(ValueError):
+        container.get('failing_call')
+    container.close()
+    assert disposed_list == ['failing_call', 'database']  # instance is created, so it is disposed
+
+
+def test_close_recreated_service(create_container) -> None:
+    disposed_list = []
+    container = create_container(create_configuration(disposed_list=disposed_list))
+
+    container.get('idle')
+    container.get('api')
+    time.sleep(0.06)
+    container.evict()
+    assert disposed_list == ['idle']
+    disposed_list.clear()
+
+    container.get('idle')  # created again after api, so it is disposed before api
+    container.close()
+    assert disposed_list == ['idle', 'api']
+
+
+def test_context_manager(create_container) -> None:
+    disposed_list = []
+    with create_container(create_configuration(disposed_list=disposed_list)) as container:
+        container.get('api')
+    assert disposed_list == ['api']
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_concurrent_close(create_container, max_workers) -> None:
+    disposed_list = []
+    container = create_container(create_configuration(disposed_list=disposed_list))
+    container.get('application')
+    container.get('broken')
+
+    with pytest.raises(md.di.ServiceDisposalException) as exception_info:
+        container.close(max_workers=max_workers)
+    assert list(exception_info.value.error_map) == ['broken']
+    assert sorted(disposed_list) == ['api', 'application', 'database', 'pool', 'repository']
+    for dependant, dependency in (('application', 'api'), ('application', 'pool'), ('repository', 'database')):
+        assert disposed_list.index(dependant) < disposed_list.index(dependency)
+
+
+def test_close_timeout() -> None:
+    disposed_list = []
+    container = md.di.concurrent.Container(configuration=create_configuration(disposed_list=disposed_list, delay=0.3))
+    container.get('application')
+
+    started_at = time.monotonic()
+    with pytest.raises(md.di.ServiceDisposalException) as exception_info:
+        container.close(timeout=0.1)
+    assert time.monotonic() - started_at < 0.25  # slow disposal is not awaited
+    assert list(exception_info.value.error_map) == ['pool']
+    assert 'pool' not in disposed_list and disposed_list.index('application') < disposed_list.index('database')
+
+    for thread in threading.enumerate():  # timed out disposal is not interrupted
+        if thread is not threading.current_thread() and thread.name.startswith('ThreadPoolExecutor'):
+            thread.join()
+    assert 'pool' in disposed_list
+
+
+def test_aclose() -> None:
+    disposed_list = []
+
+    class Connection(Service):
+        async def aclose(self) -> None:
+            await asyncio.sleep(0)
+            disposed_list.append('connection')
+
+    class Repository(Service):
+        def close(self) -> None:
+            disposed_list.append('repository')
+
+    configuration = md.di.Configuration(definition_map={
+        'connection': md.di.Definition(class_=Connection, arguments={'name': 'connection'}),
+        'repository': md.di.Definition(
+            class_=Repository, arguments={'name': 'repository', 'connection': md.di.Reference('connection')}, public=True,
+        ),
+    })
+
+    async def main() -> None:
+        async with md.di.aio.Container(configuration=configuration) as container:
+            await container.aget('repository')
+
+    asyncio.run(main())
+    assert disposed_list == ['repository', 'connection']
+
+
+def test_aclose_timeout() -> None:
+    disposed_list = []
+    container = md.di.aio.Container(configuration=create_configuration(disposed_list=disposed_list, delay=0.3))
+
+    async def main() -> None:
+        await container.aget('application')
+        with pytest.raises(md.di.ServiceDisposalException) as exception_info:
+            await container.aclose(timeout=0.1)
+        assert list(exception_info.value.error_map) == ['pool']
+        assert disposed_list.index('application') < disposed_list.index('database')
+
+    asyncio.run(main())
+
+
+def test_aclose_service_with_failed_calls() -> None:
+    disposed_list = []
+    container = md.di.aio.Container(configuration=create_configuration(disposed_list=disposed_list))
+
+    async def main() -> None:
+        with pytest.raises(ValueError):
+            await container.aget('failing_call')
+        await container.aclose()
+
+    asyncio.run(main())
+    assert disposed_list == ['failing_call', 'database']
@@ -0,0 +1,47 @@
+import importlib.util
+
+import md.di
+import md.di.compiler
+
+
+class Service:
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+
+def create_configuration() -> md.di.Configuration:
+    return md.di.Configuration(
+        definition_map={
+            'dependency': md.di.Definition(class_=Service),
+            'service': md.di.Definition(
+                class_=Service,
+                arguments={'dependency': md.di.Reference('alias'), 'value': [1, 'value']},
+                public=True,
+            ),
+        },
+        definition_alias_map={'alias': 'dependency'},
+    )
+
+
+def test_compile() -> None:
+    source = md.di.compiler.Compiler().compile(configuration=create_configuration(), class_name='ApplicationContainer')
+
+    namespace = {}
+    exec(source, namespace)
+    assert issubclass(namespace['ApplicationContainer'], md.di.compiler.CompiledContainer)
+
+
+def test_dump(tmp_path) -> None:
+    path = str(tmp_path / 'container.py')
+    md.di.compiler.Compiler().dump(configuration=create_configuration(), path=path)
+
+    spec = importlib.util.spec_from_file_location('container', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    container = module.Container(configuration=create_configuration())
+    service = container.get('service')
+    assert isinstance(service.kwargs['dependency'], Service)
+    assert service is container.get('service')
+    assert service.kwargs['value'] == [1, 'value']
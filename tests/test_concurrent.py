@@ -0,0 +1,101 @@
+import threading
+import time
+import typing
+
+import pytest
+
+import md.di
+import md.di.concurrent
+
+
+class Service:
+    def __init__(self, *args, **kwargs) -> None:
+        time.sleep(0.02)  # lets other threads to start construction of the same service
+        self.args = args
+        self.kwargs = kwargs
+
+    def set_dependency(self, dependency: 'Service') -> None:
+        self.dependency = dependency
+
+
+def get_in_threads(container: md.di.Container, id_list: typing.List[str]) -> typing.List[typing.Any]:
+    result_list = [None] * len(id_list)
+
+    def get(index: int, id_: str) -> None:
+        try:
+            result_list[index] = container.get(id_)
+        except Exception as e:
+            result_list[index] = e
+
+    thread_list = [threading.Thread(target=get, args=(index, id_)) for index, id_ in enumerate(id_list)]
+    for thread in thread_list:
+        thread.start()
+    for thread in thread_list:
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    return result_list
+
+
+def test_shared_service_is_created_once() -> None:
+    created_list = []
+
+    def create() -> Service:
+        created_list.append(None)
+        return Service()
+
+    configuration = md.di.Configuration(definition_map={
+        'service': md.di.Definition(factory=create, public=True),
+        'dependant': md.di.Definition(class_=Service, arguments={'service': md.di.Reference('service')}, public=True),
+    })
+    container = md.di.concurrent.Container(configuration=configuration)
+
+    result_list = get_in_threads(container=container, id_list=['service'] * 8 + ['dependant'] * 8)
+    assert len(created_list) == 1
+    assert all(result is result_list[0] for result in result_list[:8])
+    assert all(result is result_list[8] for result in result_list[8:])
+    assert result_list[8].kwargs['service'] is result_list[0]
+
+
+def test_circular_reference_by_calls_between_threads() -> None:
+    configuration = md.di.Configuration(definition_map={
+        'first': md.di.Definition(
+            class_=Service, calls=[('set_dependency', [md.di.Reference('second')], {})], public=True,
+        ),
+        'second': md.di.Definition(class_=Service, arguments={'first': md.di.Reference('first')}, public=True),
+    })
+    container = md.di.concurrent.Container(configuration=configuration)
+
+    first, second = get_in_threads(container=container, id_list=['first', 'second'])
+    assert first is container.get('first') and second is container.get('second')
+    assert first.dependency is second and second.kwargs['first'] is first
+
+
+def test_circular_reference_between_threads() -> None:
+    configuration = md.di.Configuration(definition_map={
+        'first': md.di.Definition(class_=Service, arguments={'second': md.di.Reference('second')}, public=True),
+        'second': md.di.Definition(class_=Service, arguments={'first': md.di.Reference('first')}, public=True),
+    })
+    container = md.di.concurrent.Container(configuration=configuration)
+
+    for result in get_in_threads(container=container, id_list=['first', 'second']):
+        assert isinstance(result, Exception)
+        while result is not None and not isinstance(result, md.di.ServiceCircularReferenceException):
+            result = result.__cause__
+        assert result is not None
+
+
+def test_failed_construction_is_retried() -> None:
+    attempt_list = []
+
+    def create() -> Service:
+        attempt_list.append(None)
+        if len(attempt_list) == 1:
+            raise ValueError('Temporary failure')
+        return Service()
+
+    configuration = md.di.Configuration(definition_map={'service': md.di.Definition(factory=create, public=True)})
+    container = md.di.concurrent.Container(configuration=configuration)
+
+    with pytest.raises(Exception):
+        container.get('service')
+    assert isinstance(container.get('service'), Service)
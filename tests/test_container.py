@@ -0,0 +1,185 @@
+import typing
+
+import pytest
+
+import md.di
+
+
+class Service:
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+        self.call_list = []
+
+    def call(self, *args, **kwargs) -> None:
+        self.call_list.append((args, kwargs))
+
+    def create(self, value: typing.Any = None) -> 'Service':
+        return Service(value)
+
+    @classmethod
+    def create_from_class(cls, value: typing.Any = None) -> 'Service':
+        return cls(value)
+
+
+def create_service(value: typing.Any = None) -> Service:
+    return Service(value)
+
+
+def test_shared_and_non_shared(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'shared': md.di.Definition(class_=Service, public=True),
+        'non_shared': md.di.Definition(class_=Service, shared=False, public=True),
+        'private': md.di.Definition(class_=Service),
+    })
+    container = create_container(configuration)
+
+    assert container.get('shared') is container.get('shared')
+    assert container.get('non_shared') is not container.get('non_shared')
+    assert container.has('shared')
+    assert not container.has('private')
+    with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+        container.get('private')
+
+
+def test_arguments_and_references(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'dependency': md.di.Definition(class_=Service),
+        'service': md.di.Definition(
+            class_=Service,
+            arguments={
+                'dependency': md.di.Reference('dependency'),
+                'list': [1, md.di.Reference('dependency')],
+                'dict': {'key': md.di.Reference('dependency')},
+                'value': 'value',
+            },
+            public=True,
+        ),
+    })
+    container = create_container(configuration)
+
+    service = container.get('service')
+    dependency = service.kwargs['dependency']
+    assert isinstance(dependency, Service)
+    assert service.kwargs['list'] == [1, dependency]
+    assert service.kwargs['dict'] == {'key': dependency}
+    assert service.kwargs['value'] == 'value'
+
+
+def test_alias(create_container) -> None:
+    configuration = md.di.Configuration(
+        definition_map={
+            'service': md.di.Definition(class_=Service, public=True),
+            'dependant': md.di.Definition(class_=Service, arguments={'service': md.di.Reference('alias')}, public=True),
+        },
+        definition_alias_map={'alias': 'service'},
+    )
+    container = create_container(configuration)
+
+    assert container.get('alias') is container.get('service')
+    assert container.get('dependant').kwargs['service'] is container.get('service')
+
+
+def test_calls(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'dependency': md.di.Definition(class_=Service),
+        'service': md.di.Definition(
+            class_=Service,
+            calls=[
+                ('call', [1, md.di.Reference('dependency')], {}),
+                ('call', [], {'key': 'value'}),
+            ],
+            public=True,
+        ),
+        'missing_method': md.di.Definition(class_=Service, calls=[('missing', [], {})], public=True),
+    })
+    container = create_container(configuration)
+
+    service = container.get('service')
+    (argument_list, argument_map), keyword_call = service.call_list
+    assert argument_list[0] == 1 and isinstance(argument_list[1], Service) and argument_map == {}
+    assert keyword_call == ((), {'key': 'value'})
+    with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+        container.get('missing_method')
+
+
+def test_factory(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'holder': md.di.Definition(class_=Service),
+        'function': md.di.Definition(factory=create_service, arguments={'value': 1}, public=True),
+        'class_method': md.di.Definition(factory=(Service, 'create_from_class'), arguments={'value': 2}, public=True),
+        'service_method': md.di.Definition(
+            factory=(md.di.Reference('holder'), 'create'),
+            arguments={'value': 3},
+            public=True,
+        ),
+    })
+    container = create_container(configuration)
+
+    assert container.get('function').args == (1, )
+    assert container.get('class_method').args == (2, )
+    assert container.get('service_method').args == (3, )
+
+
+def test_callable_argument(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'holder': md.di.Definition(class_=Service),
+        'service': md.di.Definition(
+            class_=Service,
+            arguments={'factory': md.di.Callable(holder=md.di.Reference('holder'), method='create')},
+            public=True,
+        ),
+    })
+    container = create_container(configuration)
+
+    factory = container.get('service').kwargs['factory']
+    assert factory(4).args == (4, )
+
+
+def test_inline_definition(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'dependency': md.di.Definition(class_=Service),
+        'service': md.di.Definition(
+            class_=Service,
+            arguments={
+                'inline': md.di.Definition(class_=Service, arguments={'dependency': md.di.Reference('dependency')}),
+            },
+            public=True,
+        ),
+    })
+    container = create_container(configuration)
+
+    inline = container.get('service').kwargs['inline']
+    assert isinstance(inline, Service)
+    assert isinstance(inline.kwargs['dependency'], Service)
+
+
+
+
+
+
+def test_circular_reference(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'first': md.di.Definition(class_=Service, arguments={'second': md.di.Reference('second')}, public=True),
+        'second': md.di.Definition(class_=Service, arguments={'first': md.di.Reference('first')}, public=True),
+    })
+    container = create_container(configuration)
+
+    with pytest.raises(Exception) as exception_info:
+        container.get('first')
+
+    exception = exception_info.value
+    while exception is not None and not isinstance(exception, md.di.ServiceCircularReferenceException):
+        exception = exception.__cause__
+    assert exception is not None
+
+
+def test_circular_reference_by_calls(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'first': md.di.Definition(class_=Service, calls=[('call', [md.di.Reference('second')], {})], public=True),
+        'second': md.di.Definition(class_=Service, arguments={'first': md.di.Reference('first')}, public=True),
+    })
+    container = create_container(configuration)
+
+    first = container.get('first')
+    assert first.call_list[0][0][0].kwargs['first'] is first
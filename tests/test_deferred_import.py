@@ -0,0 +1,97 @@
+import asyncio
+import itertools
+import sys
+
+import pytest
+
+import md.di
+import md.di.aio
+import md.di.analysis
+import md.di.storage
+
+_module_number_iterator = itertools.count()
+
+
+@pytest.fixture
+def module_name(tmp_path, monkeypatch) -> str:
+    """ Module, which is not imported until its class or function is used (paths are resolved once per process) """
+    module_name = f'md_di_test_deferred_module_{next(_module_number_iterator)!s}'
+    (tmp_path / f'{module_name!s}.py').write_text(
+        'class Service:\n'
+        '    def __init__(self, value=0, factory=None) -> None:\n'
+        '        self.value = value\n'
+        '        self.factory = factory\n'
+        '\n'
+        '    @staticmethod\n'
+        '    def create(value=0) -> \'Service\':\n'
+        '        return Service(value=value + 100)\n'
+        '\n\n'
+        'def create(value=0) -> Service:\n'
+        '    return Service(value=value + 1000)\n'
+        '\n\n'
+        'def helper() -> str:\n'
+        '    return \'helper\'\n'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield module_name
+    sys.modules.pop(module_name, None)
+
+
+def create_configuration(module_name: str) -> md.di.Configuration:
+    return md.di.Configuration(definition_map={
+        'class': md.di.Definition(
+            class_=f'{module_name!s}.Service',
+            arguments={'value': 1, 'factory': md.di.Callable(holder=module_name, method='helper')},
+            public=True,
+        ),
+        'static_method': md.di.Definition(
+            factory=(f'{module_name!s}.Service', 'create'), arguments={'value': 2}, public=True,
+        ),
+        'function': md.di.Definition(factory=f'{module_name!s}.create', arguments={'value': 3}, public=True),
+        'missing': md.di.Definition(class_=f'{module_name!s}.Missing', public=True),
+        'missing_module': md.di.Definition(class_='md_di_test_missing_module.Service', public=True),
+    })
+
+
+def assert_container(container: md.di.Container, module_name: str) -> None:
+    service = container.get('class')
+    assert type(service).__module__ == module_name
+    assert service.value == 1 and service.factory() == 'helper'
+    assert container.get('static_method').value == 102
+    assert container.get('function').value == 1003
+
+    for id_ in ('missing', 'missing_module'):
+        with pytest.raises(Exception):
+            container.get(id_)
+
+
+def test_deferred_import(create_container, module_name) -> None:
+    container = create_container(create_configuration(module_name=module_name))
+    assert_container(container=container, module_name=module_name)
+
+
+def test_module_is_imported_on_first_instantiation(module_name) -> None:
+    container = md.di.Container(configuration=create_configuration(module_name=module_name))
+    assert module_name not in sys.modules
+
+    container.get('function')
+    assert module_name in sys.modules
+
+
+def test_aget(module_name) -> None:
+    container = md.di.aio.Container(configuration=create_configuration(module_name=module_name))
+    assert asyncio.run(container.aget('function')).value == 1003
+
+
+def test_storage(module_name) -> None:
+    namespace = {}
+    exec(md.di.storage.write_python(configuration=create_configuration(module_name=module_name)), namespace)
+    assert_container(container=md.di.Container(configuration=namespace['configuration']), module_name=module_name)
+
+
+def test_analyze(module_name) -> None:
+    configuration = create_configuration(module_name=module_name)
+    del configuration.definition_map['missing']
+    del configuration.definition_map['missing_module']
+
+    assert md.di.analysis.Analyzer().analyze(configuration=configuration).is_valid
@@ -0,0 +1,70 @@
+import gc
+import os
+
+import pytest
+
+import md.di
+
+
+class Service:
+    def __init__(self, dependency: 'Service' = None) -> None:
+        self.dependency = dependency
+        self.pid = os.getpid()
+
+
+def create_configuration(created_list: list = None) -> md.di.Configuration:
+    def create(**kwargs) -> Service:
+        if created_list is not None:
+            created_list.append(kwargs)
+        return Service(**kwargs)
+
+    return md.di.Configuration(
+        definition_map={
+            'safe': md.di.Definition(factory=create, public=True),
+            'socket': md.di.Definition(factory=create, tags=[{'name': 'fork_unsafe'}], public=True),
+            'client': md.di.Definition(factory=create, arguments={'dependency': md.di.Reference('socket_alias')}, public=True),
+            'consumer': md.di.Definition(factory=create, arguments={'dependency': md.di.Reference('safe')}, public=True),
+        },
+        definition_alias_map={'socket_alias': 'socket'},
+    )
+
+
+def test_prepare_for_fork(create_container) -> None:
+    created_list = []
+    container = create_container(create_configuration(created_list=created_list))
+
+    container.prepare_for_fork()
+    assert len(created_list) == 2  # safe and consumer
+    safe = container.get('safe')
+    assert container.get('consumer').dependency is safe
+    assert len(created_list) == 2
+
+    client = container.get('client')
+    container.after_fork()
+    assert container.get('safe') is safe
+    assert container.get('client') is not client
+    assert container.get('client').dependency is container.get('socket')
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='Process fork is not supported')
+def test_fork(create_container) -> None:
+    container = create_container(create_configuration())
+    container.prepare_for_fork(freeze_gc=True)
+    try:
+        safe = container.get('safe')
+
+        pid = os.fork()
+        if pid == 0:  # worker
+            exit_code = 1
+            try:
+                container.after_fork()
+                client = container.get('client')
+                if container.get('safe') is safe and client.pid == os.getpid() and client.dependency.pid == os.getpid():
+                    exit_code = 0
+            finally:
+                os._exit(exit_code)
+
+        _, status = os.waitpid(pid, 0)
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    finally:
+        gc.unfreeze()
@@ -0,0 +1,99 @@
+import operator
+import types
+
+import pytest
+
+import md.di
+import md.di.analysis
+import md.di.storage
+
+
+class Service:
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+        self.call_list = []
+
+    def call(self, *args, **kwargs) -> None:
+        self.call_list.append((args, kwargs))
+
+
+def create_configuration() -> md.di.Configuration:
+    return md.di.Configuration(
+        parameter_map={'name': 'value'},
+        definition_map={
+            'dependency': md.di.Definition(class_=Service, tags=[{'name': 'tag', 'priority': 1}]),
+            'service': md.di.Definition(
+                class_=Service,
+                arguments={
+                    'list': [1, md.di.Reference('dependency'), [2, 3]],
+                    'dict': {'key': 'value'},
+                    'inline': md.di.Definition(class_=Service, arguments={'value': 1}),
+                    'tagged': md.di.Tagged('tag', priority='priority'),
+                },
+                calls=[('call', [md.di.Reference('dependency')], {'list': [1]})],
+                shared=False,
+                public=True,
+            ),
+        },
+        definition_alias_map={'alias': 'dependency'},
+    )
+
+
+def test_freeze() -> None:
+    configuration = create_configuration().freeze()
+    assert configuration.freeze() is configuration
+    assert isinstance(configuration.definition_map, types.MappingProxyType)
+
+    definition = configuration.definition_map['service']
+    # equal references are interned
+    assert definition.arguments['list'][1] is definition.calls[0][1][0]
+
+    for modify in (
+        lambda: setattr(configuration, 'parameter_map', {}),
+        lambda: operator.setitem(configuration.definition_map, 'other', definition),
+        lambda: setattr(definition, 'public', False),
+        lambda: operator.setitem(definition.arguments, 'other', 1),
+        lambda: operator.setitem(definition.arguments['dict'], 'other', 1),
+    ):
+        with pytest.raises(TypeError):
+            modify()
+
+
+def test_container_does_not_modify_configuration(create_container) -> None:
+    configuration = create_configuration()
+    container = create_container(configuration)
+    container.get('service')
+
+    assert set(configuration.definition_map) == {'dependency', 'service'}
+    assert configuration.definition_alias_map == {'alias': 'dependency'}
+    assert configuration.definition_map['service'].arguments['list'][2] == [2, 3]
+
+
+def test_frozen_values_are_thawed(create_container) -> None:
+    container = create_container(create_configuration().freeze())
+
+    service = container.get('service')
+    other_service = container.get('service')
+    assert type(service.kwargs['list']) is list and type(service.kwargs['list'][2]) is list
+    assert type(service.kwargs['dict']) is dict and service.kwargs['dict'] is not other_service.kwargs['dict']
+    assert service.call_list[0][1] == {'list': [1]} and type(service.call_list[0][1]['list']) is list
+    assert [type(item) for item in service.kwargs['tagged']] == [Service]
+
+
+def test_containers_share_frozen_configuration(create_container) -> None:
+    configuration = create_configuration().freeze()
+
+    container = create_container(configuration)
+    other_container = create_container(configuration)
+    assert container.get('service').kwargs['list'][1] is not other_container.get('service').kwargs['list'][1]
+
+
+def test_frozen_configuration_tools() -> None:
+    configuration = create_configuration().freeze()
+    assert md.di.analysis.Analyzer().analyze(configuration=configuration).is_valid
+
+    namespace = {}
+    exec(md.di.storage.write_python(configuration=configuration), namespace)
+    container = md.di.Container(configuration=namespace['configuration'])
+    assert container.get('service').call_list[0][1] == {'list': [1]}
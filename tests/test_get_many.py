@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+
+import md.di
+import md.di.concurrent
+
+
+class Service:
+    def __init__(self, name: str, **kwargs) -> None:
+        self.name = name
+        self.kwargs = kwargs
+
+
+def create_configuration(created_list: list, delay: float = 0) -> md.di.Configuration:
+    def create(name: str, **kwargs) -> Service:
+        time.sleep(delay)
+        created_list.append((name, threading.current_thread().name))
+        return Service(name=name, **kwargs)
+
+    return md.di.Configuration(
+        definition_map={
+            'first': md.di.Definition(
+                factory=create, arguments={'name': 'first', 'common': md.di.Reference('common')}, public=True,
+            ),
+            'second': md.di.Definition(
+                factory=create, arguments={'name': 'second', 'common': md.di.Reference('common')}, public=True,
+            ),
+            'common': md.di.Definition(factory=create, arguments={'name': 'common'}),
+            'non_shared': md.di.Definition(
+                factory=create, arguments={'name': 'non_shared', 'common': md.di.Reference('common')}, shared=False,
+                public=True,
+            ),
+            'broken': md.di.Definition(
+                factory=create, arguments={'name': 'broken', 'missing': md.di.Reference('missing')}, public=True,
+            ),
+        },
+        definition_alias_map={'alias': 'first'},
+    )
+
+
+def test_get_many(create_container) -> None:
+    created_list = []
+    container = create_container(create_configuration(created_list=created_list))
+
+    service_list = container.get_many(['second', 'alias', 'first', 'non_shared'])
+    assert [service.name for service in service_list] == ['second', 'first', 'first', 'non_shared']
+    assert service_list[1] is service_list[2] is container.get('first')
+    assert service_list[0].kwargs['common'] is service_list[1].kwargs['common']
+    assert sorted(name for name, _ in created_list) == ['common', 'first', 'non_shared', 'second']
+    assert container.get_many([]) == []
+
+
+def test_get_many_errors(create_container) -> None:
+    container = create_container(create_configuration(created_list=[]))
+
+    with pytest.raises(md.di.ServiceRetrievalException) as exception_info:
+        container.get_many(['first', 'broken', 'common', 'undefined'])
+    assert set(exception_info.value.error_map) == {'broken', 'common', 'undefined'}  # common is private
+    assert exception_info.value.instance_map['first'] is container.get('first')
+
+
+def test_get_many_failed_service_is_created_once(create_container) -> None:
+    created_list = []
+
+    def fail(**kwargs) -> Service:
+        created_list.append('failing')
+        raise ValueError('failing')
+
+    configuration = md.di.Configuration(definition_map={
+        'failing': md.di.Definition(factory=fail, public=True),
+        'dependant': md.di.Definition(
+            class_=Service, arguments={'name': 'dependant', 'failing': md.di.Reference('failing')},
+        ),
+        'non_shared': md.di.Definition(
+            class_=Service, arguments={'name': 'non_shared', 'dependant': md.di.Reference('dependant')}, shared=False,
+        ),
+        'root': md.di.Definition(
+            class_=Service, arguments={'name': 'root', 'non_shared': md.di.Reference('non_shared')}, public=True,
+        ),
+        'requested_non_shared': md.di.Definition(
+            class_=Service,
+            arguments={'name': 'requested_non_shared', 'dependant': md.di.Reference('dependant')},
+            shared=False,
+            public=True,
+        ),
+    })
+    container = create_container(configuration)
+
+    with pytest.raises(md.di.ServiceRetrievalException) as exception_info:
+        container.get_many(['root', 'failing', 'requested_non_shared'])
+    assert created_list == ['failing']
+    error_map = exception_info.value.error_map
+    assert list(error_map) == ['root', 'failing', 'requested_non_shared']
+    assert error_map['root'] is error_map['failing'] is error_map['requested_non_shared']  # the first failure
+
+
+def test_iterate_many(create_container) -> None:
+    created_list = []
+    container = create_container(create_configuration(created_list=created_list))
+
+    iterator = container.iterate_many(['first', 'broken', 'second'])
+    assert created_list == []
+    id_, first = next(iterator)
+    assert id_ == 'first' and first.name == 'first'
+    assert [name for name, _ in created_list] == ['common', 'first']  # services are retrieved on iteration
+
+    id_list = []
+    with pytest.raises(md.di.ServiceRetrievalException) as exception_info:
+        for id_, _ in iterator:
+            id_list.append(id_)
+    assert id_list == ['second']
+    assert list(exception_info.value.error_map) == ['broken']
+    assert exception_info.value.instance_map == {'first': first, 'second': container.get('second')}
+
+
+def test_concurrent_get_many() -> None:
+    created_list = []
+    container = md.di.concurrent.Container(configuration=create_configuration(created_list=created_list, delay=0.1))
+
+    started_at = time.monotonic()
+    first, second = container.get_many(['first', 'second'], max_workers=4)
+    assert time.monotonic() - started_at < 0.27  # first and second are created in parallel (3 services, 2 levels)
+    assert first.kwargs['common'] is second.kwargs['common']
+    assert len({thread_name for name, thread_name in created_list if name in ('first', 'second')}) == 2
+
+    with pytest.raises(md.di.ServiceRetrievalException) as exception_info:
+        container.get_many(['first', 'broken'], max_workers=4)
+    assert list(exception_info.value.error_map) == ['broken']
+
+
+def test_concurrent_get_many_failed_service_is_created_once() -> None:
+    created_list = []
+
+    def fail() -> Service:
+        created_list.append('failing')
+        raise ValueError('failing')
+
+    container = md.di.concurrent.Container(configuration=md.di.Configuration(definition_map={
+        'failing': md.di.Definition(factory=fail),
+        'first': md.di.Definition(
+            class_=Service, arguments={'name': 'first', 'failing': md.di.Reference('failing')}, public=True,
+        ),
+        'second': md.di.Definition(
+            class_=Service, arguments={'name': 'second', 'failing': md.di.Reference('failing')}, public=True,
+        ),
+    }))
+
+    with pytest.raises(md.di.ServiceRetrievalException) as exception_info:
+        container.get_many(['first', 'second'], max_workers=4)
+    assert created_list == ['failing']
+    assert set(map(type, exception_info.value.error_map.values())) == {md.di.InvalidDefinitionConfigurationException}
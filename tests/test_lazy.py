@@ -0,0 +1,63 @@
+import md.di
+
+
+class Service:
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+
+def test_lazy(create_container) -> None:
+    created_list = []
+
+    def create(value: str) -> Service:
+        created_list.append(value)
+        return Service(value)
+
+    configuration = md.di.Configuration(definition_map={
+        'lazy': md.di.Definition(factory=create, arguments={'value': 'lazy'}, lazy=True, public=True),
+        'lazy_non_shared': md.di.Definition(
+            factory=create, arguments={'value': 'lazy_non_shared'}, lazy=True, shared=False, public=True,
+        ),
+        'referenced': md.di.Definition(factory=create, arguments={'value': 'referenced'}),
+        'service': md.di.Definition(
+            class_=Service,
+            arguments={'referenced': md.di.Reference('referenced', lazy=True)},
+            public=True,
+        ),
+    })
+    container = create_container(configuration)
+
+    lazy = container.get('lazy')
+    lazy_non_shared = container.get('lazy_non_shared')
+    service = container.get('service')
+    assert type(lazy) is md.di.LazyProxy
+    assert type(lazy_non_shared) is md.di.LazyProxy
+    assert created_list == []
+
+    assert lazy.args == ('lazy', )
+    assert lazy_non_shared.args == ('lazy_non_shared', )
+    assert service.kwargs['referenced'].args == ('referenced', )
+    assert created_list == ['lazy', 'lazy_non_shared', 'referenced']
+
+
+def test_resolved_proxy_is_replaced(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'lazy': md.di.Definition(class_=Service, lazy=True, public=True),
+    })
+    container = create_container(configuration)
+
+    proxy = container.get('lazy')
+    assert isinstance(proxy, Service)  # proxy reports class of resolved instance
+    assert type(container.get('lazy')) is Service
+
+
+def test_lazy_reference_breaks_circular_reference(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'first': md.di.Definition(class_=Service, arguments={'second': md.di.Reference('second', lazy=True)}, public=True),
+        'second': md.di.Definition(class_=Service, arguments={'first': md.di.Reference('first')}, public=True),
+    })
+    container = create_container(configuration)
+
+    first = container.get('first')
+    assert first.kwargs['second'].kwargs['first'] is first
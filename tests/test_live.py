@@ -0,0 +1,220 @@
+import importlib
+import inspect
+import os
+import sys
+import typing
+
+import pytest
+
+import md.di
+import md.di.live
+import md.di.storage
+
+
+class Dependency:
+    pass
+
+
+class Service:
+    def __init__(self, dependency: Dependency) -> None:
+        self.dependency = dependency
+
+
+class StorageInterface:
+    pass
+
+
+class HandlerInterface:
+    pass
+
+
+class Storage(StorageInterface):
+    pass
+
+
+class FirstHandler(HandlerInterface):
+    pass
+
+
+class SecondHandler(HandlerInterface):
+    pass
+
+
+class Dispatcher:
+    def __init__(self, handler_list: typing.List[HandlerInterface], storage: StorageInterface) -> None:
+        self.handler_list = handler_list
+        self.storage = storage
+
+
+def create_container() -> md.di.live.Container:
+    container = md.di.live.Container()
+    container.set_definition_cache(md.di.live.DefinitionCache())
+    return container
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    """ Module with autowired classes, which file could be modified """
+    path = tmp_path / 'md_di_test_live_module.py'
+    path.write_text(
+        'class Repository:\n'
+        '    pass\n'
+        '\n\n'
+        'class Sender:\n'
+        '    def __init__(self, repository: Repository, name: str = \'sender\') -> None:\n'
+        '        self.repository = repository\n'
+        '        self.name = name\n'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield importlib.import_module('md_di_test_live_module')
+    sys.modules.pop('md_di_test_live_module', None)
+
+
+def test_autowire() -> None:
+    container = create_container()
+
+    service = container.get(Service)
+    assert service.dependency is container.get(Dependency)
+
+
+def test_scope_autowire() -> None:
+    container = create_container()
+
+    with container.scope() as scope:
+        service = scope.get(Service)
+    assert service is container.get(Service)
+
+
+def test_definition_cache_is_shared_between_containers(monkeypatch) -> None:
+    definition_cache = md.di.live.DefinitionCache()
+    container = md.di.live.Container()
+    container.set_definition_cache(definition_cache)
+    container.get(Service)
+
+    def signature(*args, **kwargs):
+        raise AssertionError('Class is introspected again')
+
+    monkeypatch.setattr(inspect, 'signature', signature)
+    container = md.di.live.Container()
+    container.set_definition_cache(definition_cache)
+    assert container.get(Service).dependency is container.get(Dependency)
+
+
+def test_definition_cache_persistence(module, tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / 'definition.cache')
+    definition_cache = md.di.live.DefinitionCache(path=path)
+    container = md.di.live.Container()
+    container.set_definition_cache(definition_cache)
+    sender = container.get(module.Sender)
+    assert sender.name == 'sender' and sender.repository is container.get(module.Repository)
+    definition_cache.save()
+
+    container = md.di.live.Container()
+    container.set_definition_cache(md.di.live.DefinitionCache(path=path))
+    with monkeypatch.context() as patch:
+        patch.setattr(inspect, 'signature', lambda *args, **kwargs: pytest.fail('Class is introspected again'))
+        sender = container.get(module.Sender)
+    assert sender.name == 'sender' and sender.repository is container.get(module.Repository)
+
+
+def test_definition_cache_invalidation(module, tmp_path) -> None:
+    path = str(tmp_path / 'definition.cache')
+
+    def cache() -> None:
+        definition_cache = md.di.live.DefinitionCache(path=path)
+        definition_cache.set(module.Sender, {'name': 'cached'})
+        definition_cache.save()
+        assert md.di.live.DefinitionCache(path=path).get(module.Sender) == {'name': 'cached'}
+
+    cache()
+    stat = os.stat(module.__file__)
+    modified_at = stat.st_mtime_ns + 1_000_000_000
+    os.utime(module.__file__, ns=(stat.st_atime_ns, modified_at))  # modification time is changed
+    assert md.di.live.DefinitionCache(path=path).get(module.Sender) is None
+
+    cache()
+    with open(module.__file__, 'a') as file:
+        file.write('\n')
+    os.utime(module.__file__, ns=(stat.st_atime_ns, modified_at))  # only size is changed
+    assert md.di.live.DefinitionCache(path=path).get(module.Sender) is None
+
+
+def test_broken_definition_cache_file(tmp_path) -> None:
+    path = tmp_path / 'definition.cache'
+    path.write_bytes(b'broken')
+
+    definition_cache = md.di.live.DefinitionCache(path=str(path))
+    assert definition_cache.get(Service) is None
+
+
+def test_export(module) -> None:
+    container = md.di.live.Container(configuration=md.di.Configuration(
+        definition_alias_map={'sender': md.di.reference(module.Sender)},
+    ))
+    container.set_definition_cache(md.di.live.DefinitionCache())
+    container.discover(['sender'])
+    configuration = container.export()
+
+    namespace = {}
+    exec(md.di.storage.write_python(configuration=configuration), namespace)
+    static_container = md.di.Container(configuration=namespace['configuration'])
+    sender = static_container.get('sender')
+    assert isinstance(sender, module.Sender) and sender.name == 'sender'
+    assert sender.repository is static_container.get(md.di.reference(module.Repository))
+
+
+def test_interface_without_index() -> None:
+    container = create_container()
+
+    with pytest.raises(Exception):
+        container.get(StorageInterface)
+
+
+def test_interface_autowire() -> None:
+    container = create_container()
+    container.set_implementation_index(md.di.live.ImplementationIndex(package_list=[__name__]))
+
+    dispatcher = container.get(Dispatcher)
+    assert [type(handler) for handler in dispatcher.handler_list] == [FirstHandler, SecondHandler]
+    assert dispatcher.storage is container.get(StorageInterface)
+    assert dispatcher.storage is container.get(Storage)
+
+    with container.scope() as scope:
+        assert scope.get(StorageInterface) is dispatcher.storage
+
+    with pytest.raises(Exception):
+        container.get(HandlerInterface)  # several implementations
+
+    configuration = container.export()
+    assert configuration.definition_alias_map[md.di.reference(StorageInterface)] == md.di.reference(Storage)
+    static_container = md.di.Container(configuration=configuration)
+    assert type(static_container.get(md.di.reference(Dispatcher)).storage) is Storage
+
+
+def test_implementation_index(tmp_path, monkeypatch) -> None:
+    package_path = tmp_path / 'md_di_test_live_package'
+    (package_path / 'handler').mkdir(parents=True)
+    (package_path / '__init__.py').write_text(
+        'class HandlerInterface:\n'
+        '    pass\n'
+    )
+    (package_path / 'handler' / '__init__.py').write_text('')
+    (package_path / 'handler' / 'first.py').write_text(
+        'from md_di_test_live_package import HandlerInterface\n'
+        '\n\n'
+        'class FirstHandler(HandlerInterface):\n'
+        '    pass\n'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        package = importlib.import_module('md_di_test_live_package')
+        implementation_index = md.di.live.ImplementationIndex(package_list=['md_di_test_live_package'])
+        assert implementation_index.find(package.HandlerInterface) == []  # module is not imported yet
+
+        implementation_index.load()
+        handler_list = implementation_index.find(package.HandlerInterface)
+        assert [handler.__qualname__ for handler in handler_list] == ['FirstHandler']
+    finally:
+        for module_name in list(sys.modules):
+            if module_name.startswith('md_di_test_live_package'):
+                del sys.modules[module_name]
@@ -0,0 +1,135 @@
+import asyncio
+import os
+import pickle
+
+import pytest
+
+import md.di
+import md.di.aio
+import md.di.storage
+
+
+class Service:
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+    def call(self, *args, **kwargs) -> None:
+        self.call_arguments = (args, kwargs)
+
+
+def create_configuration() -> md.di.Configuration:
+    return md.di.Configuration(
+        parameter_map={
+            'host': 'localhost',
+            'port': md.di.Env('MD_DI_TEST_PORT', cast=int),
+            'debug': md.di.Env('MD_DI_TEST_DEBUG', cast=bool),
+            'missing': md.di.Env('MD_DI_TEST_MISSING', default=None),
+            'url': 'http://%host%:%port%/',
+            'port_list': ['%port%', 1],
+            'port_alias': md.di.Parameter('port'),
+        },
+        definition_map={
+            'service': md.di.Definition(
+                class_=Service,
+                arguments={
+                    'host': md.di.Parameter('host'),
+                    'url': '%url%',
+                    'port': '%port_alias%',
+                    'escaped': '100%%',
+                    'list': ['%host%', md.di.Reference('dependency')],
+                    'dict': {'port': '%port%'},
+                    'missing': '%missing%',
+                    'plain': 'value',
+                },
+                calls=[('call', ['%debug%'], {'port_list': md.di.Parameter('port_list')})],
+                public=True,
+            ),
+            'dependency': md.di.Definition(class_=Service),
+        },
+    )
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch) -> None:
+    monkeypatch.setenv('MD_DI_TEST_PORT', '8080')
+    monkeypatch.setenv('MD_DI_TEST_DEBUG', 'yes')
+    monkeypatch.delenv('MD_DI_TEST_MISSING', raising=False)
+
+
+def assert_service(service: Service) -> None:
+    host, dependency = service.kwargs['list']
+    assert host == 'localhost' and isinstance(dependency, Service)
+    assert {key: value for key, value in service.kwargs.items() if key != 'list'} == {
+        'host': 'localhost',
+        'url': 'http://localhost:8080/',
+        'port': 8080,
+        'escaped': '100%',
+        'dict': {'port': 8080},
+        'missing': None,
+        'plain': 'value',
+    }
+    assert service.call_arguments == ((True, ), {'port_list': [8080, 1]})
+
+
+def test_parameters(create_container) -> None:
+    container = create_container(create_configuration())
+
+    assert container.get_parameter('url') == 'http://localhost:8080/'
+    assert_service(container.get('service'))
+
+    with container.scope() as scope:
+        assert scope.get_parameter('port') == 8080
+
+
+def test_aget_parameters() -> None:
+    assert_service(asyncio.run(md.di.aio.Container(configuration=create_configuration()).aget('service')))
+
+
+def test_invalidate(create_container) -> None:
+    container = create_container(md.di.Configuration(definition_map={
+        'service': md.di.Definition(
+            class_=Service, arguments={'port': md.di.Env('MD_DI_TEST_PORT', cast=int)}, shared=False, public=True,
+        ),
+    }))
+    assert container.get('service').kwargs['port'] == 8080
+
+    os.environ['MD_DI_TEST_PORT'] = '9090'
+    container.invalidate()
+    assert container.get('service').kwargs['port'] == 9090
+
+
+@pytest.mark.parametrize(('parameter_map', 'exception_class'), [
+    ({'url': md.di.Parameter('missing')}, md.di.ParameterNotFoundException),
+    ({'first': '%second%', 'second': md.di.Parameter('first')}, md.di.InvalidParameterConfigurationException),
+    ({'value': md.di.Env('MD_DI_TEST_MISSING')}, md.di.ParameterNotFoundException),
+    ({'value': md.di.Env('MD_DI_TEST_PORT', cast=bool)}, md.di.InvalidParameterConfigurationException),
+], ids=['not-found', 'circular', 'env-not-found', 'invalid-env'])
+def test_invalid_parameters(create_container, parameter_map, exception_class) -> None:
+    with pytest.raises(exception_class):
+        create_container(md.di.Configuration(parameter_map=parameter_map))
+
+
+def test_not_placeholder_strings(create_container) -> None:
+    argument_map = {
+        'format': '%(asctime)s %(message)s',
+        'url': 'a%20b%20c',
+        'time_format': '%H%M%S',
+        'string_format': '%s%s',
+        'undeclared': '%undeclared%',  # only declared parameters are placeholders
+    }
+    container = create_container(md.di.Configuration(parameter_map={'host': 'localhost'}, definition_map={
+        'service': md.di.Definition(
+            class_=Service, arguments=argument_map, public=True,
+        ),
+    }))
+    assert container.get('service').kwargs == argument_map
+
+
+def test_storage() -> None:
+    configuration = pickle.loads(pickle.dumps(create_configuration()))
+    assert_service(md.di.Container(configuration=configuration).get('service'))
+
+    namespace = {}
+    exec(md.di.storage.write_python(configuration=create_configuration()), namespace)
+    assert_service(md.di.Container(configuration=namespace['configuration']).get('service'))
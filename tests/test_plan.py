@@ -0,0 +1,106 @@
+import md.di
+
+
+class Service:
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+
+def test_definition_is_not_modified(create_container) -> None:
+    reference = md.di.Reference('dependency')
+    definition = md.di.Definition(
+        class_=Service,
+        arguments={'list': [reference, 1], 'dict': {'key': reference}},
+        shared=False,
+        public=True,
+    )
+    configuration = md.di.Configuration(definition_map={
+        'dependency': md.di.Definition(class_=Service),
+        'service': definition,
+    })
+    container = create_container(configuration)
+
+    service = container.get('service')
+    other_service = container.get('service')
+    assert isinstance(service.kwargs['list'][0], Service) and service.kwargs['list'][1] == 1
+    assert service.kwargs['list'] is not other_service.kwargs['list']
+    assert service.kwargs['dict'] is not other_service.kwargs['dict']
+    assert definition.arguments == {'list': [reference, 1], 'dict': {'key': reference}}
+
+
+def test_replaced_definition() -> None:
+    configuration = md.di.Configuration(definition_map={
+        'service': md.di.Definition(class_=Service, arguments={'value': 1}, shared=False, public=True),
+    })
+    container = md.di.Container(configuration=configuration)
+    assert container.get('service').kwargs == {'value': 1}
+
+    configuration.definition_map['service'] = md.di.Definition(
+        class_=Service, arguments={'value': 2}, shared=False, public=True,
+    )
+    assert container.get('service').kwargs == {'value': 2}
+
+
+def test_invalidate() -> None:
+    definition = md.di.Definition(class_=Service, arguments={'value': 1}, shared=False, public=True)
+    container = md.di.Container(configuration=md.di.Configuration(definition_map={'service': definition}))
+    assert container.get('service').kwargs == {'value': 1}
+
+    definition.arguments['value'] = 2  # in-place modification is not observed until invalidation
+    assert container.get('service').kwargs == {'value': 1}
+    container.invalidate()
+    assert container.get('service').kwargs == {'value': 2}
+
+
+def test_plans_are_shared(monkeypatch, frozen) -> None:
+    configuration = md.di.Configuration(
+        parameter_map={'value': md.di.Env('MD_DI_TEST_PLAN_VALUE', cast=int)},
+        definition_map={
+            'service': md.di.Definition(class_=Service, arguments={'value': '%value%'}, shared=False, public=True),
+        },
+    )
+    if frozen:
+        configuration = configuration.freeze()
+
+    plan_list = []
+    create_plan = md.di.Container._create_plan
+    monkeypatch.setattr(
+        md.di.Container,
+        '_create_plan',
+        lambda container, definition: plan_list.append(create_plan(container, definition=definition)) or plan_list[-1],
+    )
+
+    monkeypatch.setenv('MD_DI_TEST_PLAN_VALUE', '1')
+    container = md.di.Container(configuration=configuration)
+    assert container.get('service').kwargs == {'value': 1}
+    assert md.di.Container(configuration=configuration).get('service').kwargs == {'value': 1}
+    assert container.scope().get('service').kwargs == {'value': 1}
+    assert len(plan_list) == 1
+
+    monkeypatch.setenv('MD_DI_TEST_PLAN_VALUE', '2')  # plans depend on parameter values
+    assert md.di.Container(configuration=configuration).get('service').kwargs == {'value': 2}
+    assert container.get('service').kwargs == {'value': 1}
+    assert len(plan_list) == 2
+
+
+def test_reference_is_bound_to_definition(monkeypatch) -> None:
+    configuration = md.di.Configuration(
+        definition_map={
+            'dependency': md.di.Definition(class_=Service, shared=False),
+            'service': md.di.Definition(
+                class_=Service, arguments={'dependency': md.di.Reference('alias')}, shared=False, public=True,
+            ),
+        },
+        definition_alias_map={'alias': 'dependency'},
+    ).freeze()
+    container = md.di.Container(configuration=configuration)
+    container.get('service')
+
+    id_list = []
+    get_definition = md.di.Container._get_definition
+    monkeypatch.setattr(
+        md.di.Container, '_get_definition', lambda container_, id_: id_list.append(id_) or get_definition(container_, id_=id_),
+    )
+    assert isinstance(container.get('service').kwargs['dependency'], Service)
+    assert id_list == ['service']  # referenced definition is not looked up
@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+
+import md.di
+import md.di.storage
+
+
+class Parser:
+    def __init__(self, dependency: object) -> None:
+        self.dependency = dependency
+        self.buffer = []
+
+    def clear(self, dependency: object = None) -> None:
+        self.buffer.clear()
+        self.cleared_with = dependency
+
+
+class BrokenParser(Parser):
+    def clear(self, dependency: object = None) -> None:
+        raise ValueError('Unable to reset')
+
+
+def create_configuration() -> md.di.Configuration:
+    return md.di.Configuration(
+        definition_map={
+            'parser': md.di.Definition(
+                class_=Parser,
+                arguments={'dependency': md.di.Reference('dependency')},
+                shared=False,
+                pool=2,
+                reset=[('clear', [], {'dependency': md.di.Reference('dependency')})],
+                public=True,
+            ),
+            'broken': md.di.Definition(
+                class_=BrokenParser,
+                arguments={'dependency': md.di.Reference('dependency')},
+                shared=False,
+                pool=2,
+                reset=[('clear', [], {})],
+                public=True,
+            ),
+            'shared': md.di.Definition(class_=Parser, arguments={'dependency': None}, public=True),
+            'dependency': md.di.Definition(class_=object),
+        },
+        definition_alias_map={'alias': 'parser'},
+    )
+
+
+def test_pool(create_container) -> None:
+    container = create_container(create_configuration())
+
+    parser = container.acquire('parser')
+    parser.buffer.append(1)
+    with container.pooled('alias') as other_parser:
+        assert other_parser is not parser
+    container.release('parser', parser)
+    assert parser.buffer == [] and parser.cleared_with is parser.dependency
+
+    with container.pooled('parser') as pooled_parser:
+        assert pooled_parser is parser
+
+    statistics = container.get_pool_statistics('parser')
+    assert (statistics.hit_count, statistics.miss_count, statistics.idle_count) == (1, 2, 2)
+
+    parser_list = [container.acquire('parser') for _ in range(3)]
+    for parser in parser_list:
+        container.release('parser', parser)
+    statistics = container.get_pool_statistics('alias')
+    assert (statistics.discard_count, statistics.idle_count) == (1, 2)  # pool capacity is exceeded
+
+
+def test_failed_reset_discards_instance(create_container) -> None:
+    container = create_container(create_configuration())
+
+    with pytest.raises(ValueError):
+        with container.pooled('broken'):
+            pass
+    statistics = container.get_pool_statistics('broken')
+    assert (statistics.discard_count, statistics.idle_count) == (1, 0)
+
+
+def test_not_pooled_service(create_container) -> None:
+    container = create_container(create_configuration())
+
+    with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+        container.acquire('shared')
+
+
+def test_scope_pool(create_container) -> None:
+    container = create_container(create_configuration())
+
+    with container.scope() as scope:
+        with scope.pooled('parser') as parser:
+            pass
+    assert container.acquire('parser') is parser
+
+
+def test_threaded_pool(create_container) -> None:
+    container = create_container(create_configuration())
+    error_list = []
+
+    def work() -> None:
+        try:
+            for _ in range(200):
+                with container.pooled('parser') as parser:
+                    assert not parser.buffer  # instance is not used by other thread
+                    parser.buffer.append(1)
+        except Exception as e:
+            error_list.append(e)
+
+    thread_list = [threading.Thread(target=work) for _ in range(8)]
+    for thread in thread_list:
+        thread.start()
+    for thread in thread_list:
+        thread.join()
+    assert error_list == []
+
+    statistics = container.get_pool_statistics('parser')
+    assert statistics.hit_count + statistics.miss_count == 1600
+    assert statistics.idle_count <= 2
+
+
+def test_storage(tmp_path) -> None:
+    namespace = {}
+    exec(md.di.storage.write_python(configuration=create_configuration()), namespace)
+    path = str(tmp_path / 'configuration.index')
+    md.di.storage.dump_indexed(configuration=create_configuration(), path=path)
+
+    for configuration in (namespace['configuration'], md.di.storage.load_indexed(path=path)):
+        definition = configuration.definition_map['parser']
+        assert definition.pool == 2 and definition.reset[0][0] == 'clear'
+
+        container = md.di.Container(configuration=configuration)
+        with container.pooled('parser'):
+            pass
+        assert container.get_pool_statistics('parser').idle_count == 1
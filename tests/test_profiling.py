@@ -0,0 +1,109 @@
+import json
+import time
+import typing
+
+import md.di
+import md.di.profiling
+
+
+class Service:
+    def __init__(self, dependency: 'Service' = None, delay: float = 0) -> None:
+        time.sleep(delay)
+        self.dependency = dependency
+
+
+class Instrumentation(md.di.InstrumentationInterface):
+    def __init__(self) -> None:
+        self.event_list: typing.List[tuple] = []
+
+    def hit(self, id_: str) -> None:
+        self.event_list.append(('hit', id_))
+
+    def before_construction(self, id_: str, definition: md.di.Definition, depth: int) -> None:
+        self.event_list.append(('before', id_, depth))
+
+    def after_construction(self, id_: str, definition: md.di.Definition, depth: int, elapsed: float) -> None:
+        self.event_list.append(('after', id_, depth))
+
+
+def create_configuration() -> md.di.Configuration:
+    return md.di.Configuration(definition_map={
+        'leaf': md.di.Definition(class_=Service, arguments={'delay': 0.02}),
+        'middle': md.di.Definition(class_=Service, arguments={'dependency': md.di.Reference('leaf'), 'delay': 0.01}),
+        'root': md.di.Definition(class_=Service, arguments={'dependency': md.di.Reference('middle')}, public=True),
+        'non_shared': md.di.Definition(
+            class_=Service, arguments={'dependency': md.di.Reference('middle')}, shared=False, public=True,
+        ),
+    })
+
+
+def test_instrumentation(create_container) -> None:
+    container = create_container(create_configuration())
+    instrumentation = Instrumentation()
+    container.set_instrumentation(instrumentation)
+
+    container.get('root')
+    container.get('root')
+    assert instrumentation.event_list == [
+        ('before', 'root', 0),
+        ('before', 'middle', 1),
+        ('before', 'leaf', 2),
+        ('after', 'leaf', 2),
+        ('after', 'middle', 1),
+        ('after', 'root', 0),
+        ('hit', 'root'),
+    ]
+
+    container.set_instrumentation(None)
+    container.get('non_shared')
+    assert len(instrumentation.event_list) == 7
+
+
+def test_profiler(create_container) -> None:
+    container = create_container(create_configuration())
+    profiler = md.di.profiling.Profiler()
+    container.set_instrumentation(profiler)
+
+    container.get('root')
+    container.get('non_shared')
+    container.get('non_shared')
+
+    statistics_map = profiler.statistics_map
+    assert (statistics_map['leaf'].miss_count, statistics_map['leaf'].hit_count) == (1, 0)
+    assert (statistics_map['middle'].miss_count, statistics_map['middle'].hit_count) == (1, 2)
+    assert statistics_map['non_shared'].miss_count == 2
+    assert statistics_map['leaf'].exclusive_time >= 0.02
+    assert 0.01 <= statistics_map['middle'].exclusive_time < statistics_map['middle'].inclusive_time
+    assert statistics_map['middle'].inclusive_time >= statistics_map['leaf'].inclusive_time + 0.01
+    assert profiler.get_statistics_list()[0].id == 'leaf'
+
+    folded_stack_list = profiler.create_folded_stack_list()
+    assert any(folded_stack.startswith('root;middle;leaf ') for folded_stack in folded_stack_list)
+
+    trace = json.loads(json.dumps(profiler.create_chrome_trace()))
+    assert {event['name'] for event in trace['traceEvents']} == {'leaf', 'middle', 'root', 'non_shared'}
+
+    profiler.reset()
+    assert profiler.statistics_map == {} and profiler.create_folded_stack_list() == []
+
+
+def test_dump_chrome_trace(tmp_path) -> None:
+    container = md.di.Container(configuration=create_configuration())
+    profiler = md.di.profiling.Profiler()
+    container.set_instrumentation(profiler)
+    container.get('root')
+
+    path = str(tmp_path / 'trace.json')
+    profiler.dump_chrome_trace(path=path)
+    with open(path) as file:
+        assert len(json.load(file)['traceEvents']) == 3
+
+
+def test_scope_instrumentation() -> None:
+    container = md.di.Container(configuration=create_configuration())
+    profiler = md.di.profiling.Profiler()
+    container.set_instrumentation(profiler)
+
+    with container.scope() as scope:
+        scope.get('non_shared')
+    assert profiler.statistics_map['non_shared'].miss_count == 1
@@ -0,0 +1,182 @@
+import asyncio
+import gc
+import time
+
+import pytest
+
+import md.di
+import md.di.aio
+import md.di.storage
+
+
+class Service:
+    def __init__(self, dependency: object = None) -> None:
+        self.dependency = dependency
+
+
+def create_configuration(closed_list: list) -> md.di.Configuration:
+    class Disposable(Service):
+        def close(self) -> None:
+            closed_list.append(self)
+
+    def define(**kwargs) -> md.di.Definition:
+        return md.di.Definition(class_=Disposable, public=True, **kwargs)
+
+    def define_grouped(group: str, **kwargs) -> md.di.Definition:
+        return define(retention=md.di.Retention(group=group, **kwargs), tags=[{'name': group, 'memory': 60}])
+
+    return md.di.Configuration(
+        definition_map={
+            'idle': define(retention=md.di.Retention(idle_ttl=0.05)),
+            'weak': define(retention=md.di.Retention(weak=True)),
+            'weak_user': define(arguments={'dependency': md.di.Reference('weak')}),
+            'first': define_grouped(group='cache', capacity=2),
+            'second': define_grouped(group='cache', capacity=2),
+            'third': define_grouped(group='cache', capacity=2),
+            'large': define_grouped(group='memory', memory_budget=100),
+            'other_large': define_grouped(group='memory', memory_budget=100),
+            'plain': define(),
+            'not_weak_referenceable': md.di.Definition(class_=int, retention=md.di.Retention(weak=True), public=True),
+        },
+        definition_alias_map={'alias': 'idle'},
+    )
+
+
+def test_idle_retention(create_container) -> None:
+    closed_list = []
+    container = create_container(create_configuration(closed_list=closed_list))
+
+    service = container.get('idle')
+    assert container.get('alias') is service
+    time.sleep(0.08)
+    assert container.get('idle') is not service
+    assert closed_list == [service]
+
+
+def test_weak_retention(create_container) -> None:
+    container = create_container(create_configuration(closed_list=[]))
+
+    weak_user = container.get('weak_user')
+    assert weak_user.dependency is container.get('weak')  # weakly retained service could be held
+
+    del weak_user
+    gc.collect()
+    assert isinstance(container.get('weak'), Service)  # created again, when it is not referenced
+
+    with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+        container.get('not_weak_referenceable')
+
+
+def test_group_retention(create_container) -> None:
+    closed_list = []
+    container = create_container(create_configuration(closed_list=closed_list))
+
+    first, second = container.get('first'), container.get('second')
+    container.get('first')  # second is least recently used now
+    container.get('third')
+    assert closed_list == [second]
+    assert container.get('first') is first and container.get('second') is not second
+
+    large = container.get('large')
+    container.get('other_large')  # memory budget is exceeded
+    assert large in closed_list
+
+
+def test_evict(create_container) -> None:
+    closed_list = []
+    container = create_container(create_configuration(closed_list=closed_list))
+
+    plain = container.get('plain')
+    container.evict('plain')
+    assert closed_list == [plain]
+    assert container.get('plain') is not plain
+
+    idle = container.get('idle')
+    time.sleep(0.08)
+    container.evict()  # expired services are dropped
+    assert closed_list == [plain, idle]
+
+    with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+        container.evict('md.di.Container')
+
+
+def test_held_service_could_not_be_evictable(create_container) -> None:
+    configuration = create_configuration(closed_list=[])
+    configuration.definition_map['user'] = md.di.Definition(
+        class_=Service,
+        arguments={
+            'dependency': md.di.Definition(class_=Service, arguments={'dependency': md.di.Reference('alias')}, shared=False),
+        },
+        public=True,
+    )
+    container = create_container(configuration)
+
+    with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+        container.get('idle')
+
+
+def test_lazy_and_tagged_consumers_do_not_hold_service(create_container) -> None:
+    closed_list = []
+    configuration = create_configuration(closed_list=closed_list)
+    configuration.definition_map.update({
+        'model': md.di.Definition(
+            class_=Service, retention=md.di.Retention(group='model', capacity=1), tags=[{'name': 'model'}],
+        ),
+        'other_model': md.di.Definition(
+            class_=Service, retention=md.di.Retention(group='model', capacity=1), tags=[{'name': 'model'}],
+        ),
+        'registry': md.di.Definition(class_=Service, arguments={'dependency': md.di.Tagged('model')}, public=True),
+        'lazy_user': md.di.Definition(
+            class_=Service, arguments={'dependency': md.di.Reference('idle', lazy=True)}, public=True,
+        ),
+    })
+    container = create_container(configuration)
+
+    model_list = [id(model) for model in container.get('registry').dependency]
+    assert len(model_list) == 2  # services are retrieved on iteration, least recently used one is evicted
+    assert isinstance(container.get('lazy_user').dependency, Service)  # proxy retrieves retained service
+
+
+def test_aget_retention() -> None:
+    closed_list = []
+    container = md.di.aio.Container(configuration=create_configuration(closed_list=closed_list))
+
+    async def main() -> None:
+        service = await container.aget('idle')
+        assert await container.aget('idle') is service
+        await asyncio.sleep(0.08)
+        assert await container.aget('idle') is not service
+        assert closed_list == [service]
+
+    asyncio.run(main())
+
+
+def test_after_fork_drops_retained_fork_unsafe_service() -> None:
+    closed_list = []
+    configuration = create_configuration(closed_list=closed_list)
+    configuration.definition_map['first'].tags.append({'name': 'fork_unsafe'})
+    container = md.di.Container(configuration=configuration)
+    container.prepare_for_fork(tag='fork_unsafe')
+
+    first = container.get('first')
+    container.after_fork()
+    assert container.get('first') is not first
+    assert closed_list == []  # instance is used by parent process
+
+
+def test_storage(tmp_path) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'idle': md.di.Definition(class_=Service, retention=md.di.Retention(idle_ttl=0.05)),
+        'grouped': md.di.Definition(
+            class_=Service, retention=md.di.Retention(group='memory', memory_budget=100), tags=[{'name': 'memory'}],
+        ),
+    })
+    path = str(tmp_path / 'configuration.index')
+    md.di.storage.dump_indexed(configuration=configuration, path=path)
+    namespace = {}
+    exec(md.di.storage.write_python(configuration=configuration), namespace)
+
+    for loaded_configuration in (md.di.storage.load_indexed(path=path), namespace['configuration']):
+        assert loaded_configuration.definition_map['idle'].retention.idle_ttl == 0.05
+        retention = loaded_configuration.definition_map['grouped'].retention
+        assert (retention.group, retention.memory_budget) == ('memory', 100)
@@ -0,0 +1,60 @@
+import md.di
+
+
+class Service:
+    pass
+
+
+def create_configuration() -> md.di.Configuration:
+    return md.di.Configuration(
+        definition_map={
+            md.di.reference(Service): md.di.Definition(class_=Service, public=True),
+            'non_shared': md.di.Definition(class_=Service, shared=False, public=True),
+            'lazy': md.di.Definition(class_=Service, lazy=True, public=True),
+            'scoped': md.di.Definition(class_=Service, scope='request', public=True),
+        },
+        definition_alias_map={'alias': md.di.reference(Service)},
+    )
+
+
+def test_retrieval_by_class(create_container) -> None:
+    container = create_container(create_configuration())
+
+    service = container.get(Service)
+    assert container.get(Service) is service
+    assert container.get('alias') is service
+    assert container.get(md.di.reference(Service)) is service
+    assert container.has(Service) and container.has('alias')
+
+
+def test_non_shared_and_lazy_services_are_not_kept(create_container) -> None:
+    container = create_container(create_configuration())
+
+    assert container.get('non_shared') is not container.get('non_shared')
+    lazy = container.get('lazy')
+    assert type(lazy) is md.di.LazyProxy
+    assert isinstance(lazy, Service)  # proxy is resolved
+    assert type(container.get('lazy')) is Service
+
+
+def test_scope_retrieval(create_container) -> None:
+    container = create_container(create_configuration())
+    service = container.get(Service)
+
+    with container.scope() as scope:
+        scoped = scope.get('scoped')
+        assert scope.get('scoped') is scoped
+        assert scope.get(Service) is service
+
+    with container.scope() as scope:
+        assert scope.get('scoped') is not scoped
+
+
+def test_set(create_container) -> None:
+    container = create_container(create_configuration())
+    container.get(Service)
+
+    service = Service()
+    container.set(md.di.reference(Service), service)
+    assert container.get(Service) is service
+    assert container.get('alias') is service
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+import md.di
+
+
+class Service:
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+
+def create_configuration(closed_list: list = None) -> md.di.Configuration:
+    class Disposable(Service):
+        def close(self) -> None:
+            closed_list.append(self.kwargs['name'])
+
+    return md.di.Configuration(definition_map={
+        'shared': md.di.Definition(class_=Service, public=True),
+        'session': md.di.Definition(class_=Disposable, arguments={'name': 'session'}, scope='request'),
+        'repository': md.di.Definition(
+            class_=Disposable,
+            arguments={'name': 'repository', 'session': md.di.Reference('session'), 'shared': md.di.Reference('shared')},
+            scope='request',
+            public=True,
+        ),
+        'handler': md.di.Definition(
+            class_=Service, arguments={'repository': md.di.Reference('repository')}, shared=False, public=True,
+        ),
+        'widened': md.di.Definition(class_=Service, arguments={'repository': md.di.Reference('repository')}, public=True),
+        'task': md.di.Definition(class_=Service, scope='task', public=True),
+    })
+
+
+def test_scope(create_container) -> None:
+    container = create_container(create_configuration(closed_list=[]))
+
+    with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+        container.get('repository')
+    with pytest.raises(Exception):
+        container.get('handler')
+    assert container.current_scope() is container
+
+    with container.scope() as scope:
+        assert container.current_scope() is scope
+        repository = scope.get('repository')
+        assert scope.get('repository') is repository
+        handler = scope.get('handler')
+        assert handler is not scope.get('handler') and handler.kwargs['repository'] is repository
+        assert repository.kwargs['shared'] is container.get('shared')
+
+    with container.scope() as scope:
+        other_repository = scope.get('repository')
+        assert other_repository is not repository
+        assert other_repository.kwargs['shared'] is repository.kwargs['shared']
+    assert container.current_scope() is container
+
+
+def test_shared_service_could_not_depend_on_scoped_service(create_container) -> None:
+    container = create_container(create_configuration(closed_list=[]))
+
+    with container.scope() as scope:
+        with pytest.raises(Exception):
+            scope.get('widened')
+
+
+def test_nested_scope(create_container) -> None:
+    container = create_container(create_configuration(closed_list=[]))
+
+    with container.scope() as scope:
+        repository = scope.get('repository')
+        with pytest.raises(Exception):
+            scope.get('task')
+
+        with scope.scope('task') as task_scope:
+            assert container.current_scope() is task_scope
+            assert task_scope.get('repository') is repository  # outer scope service
+            assert task_scope.get('task') is task_scope.get('task')
+        assert container.current_scope() is scope
+
+
+def test_scope_close(create_container) -> None:
+    closed_list = []
+    container = create_container(create_configuration(closed_list=closed_list))
+
+    with container.scope() as scope:
+        scope.get('repository')
+        assert closed_list == []
+    assert closed_list == ['repository', 'session']
+
+
+def test_scope_per_task() -> None:
+    container = md.di.Container(configuration=create_configuration(closed_list=[]))
+
+    async def handle() -> Service:
+        with container.scope() as scope:
+            await asyncio.sleep(0)  # other task enters its scope
+            assert container.current_scope() is scope
+            return scope.get('repository')
+
+    async def main() -> None:
+        repository, other_repository = await asyncio.gather(handle(), handle())
+        assert repository is not other_repository
+
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+import pytest
+
+import md.di
+import md.di.storage
+
+
+class Service:
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+    def configure(self, **kwargs) -> None:
+        self.configuration = kwargs
+
+    def create(self, value: str = None) -> 'Service':
+        return Service(value)
+
+
+def create_configuration() -> md.di.Configuration:
+    return md.di.Configuration(
+        parameter_map={'name': 'value'},
+        definition_map={
+            'dependency': md.di.Definition(class_=Service, tags=[{'name': 'tag', 'priority': 1}]),
+            'service': md.di.Definition(
+                class_=Service,
+                arguments={
+                    'dependency': md.di.Reference('alias'),
+                    'lazy': md.di.Reference('dependency', lazy=True),
+                    'inline': md.di.Definition(class_=Service, arguments={'value': 1}),
+                    'factory': md.di.Callable(holder=md.di.Reference('dependency'), method='create'),
+                    'list': [1, 2.5, None, True, b'bytes', float('inf')],
+                    'tuple': (1, ),
+                },
+                calls=[('configure', [], {'key': 'value'})],
+                public=True,
+            ),
+            'created': md.di.Definition(factory=(md.di.Reference('dependency'), 'create'), shared=False, public=True),
+        },
+        definition_alias_map={'alias': 'dependency'},
+    )
+
+
+def test_write_python() -> None:
+    namespace = {}
+    exec(md.di.storage.write_python(configuration=create_configuration(), name='loaded'), namespace)
+    configuration = namespace['loaded']
+    assert configuration.parameter_map == {'name': 'value'}
+    assert configuration.definition_alias_map == {'alias': 'dependency'}
+
+    container = md.di.Container(configuration=configuration)
+    service = container.get('service')
+    assert service.kwargs['dependency'] is service.kwargs['lazy']
+    assert service.kwargs['inline'].kwargs == {'value': 1}
+    assert service.kwargs['factory']('created').args == ('created', )
+    assert service.kwargs['list'][:5] == [1, 2.5, None, True, b'bytes'] and service.kwargs['tuple'] == (1, )
+    assert service.configuration == {'key': 'value'}
+    assert container.get('created') is not container.get('created')
+
+
+def test_write_not_literal_value() -> None:
+    configuration = md.di.Configuration(definition_map={'service': md.di.Definition(factory=lambda: Service())})
+
+    with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+        md.di.storage.write_python(configuration=configuration)
+
+
+def test_dump(tmp_path) -> None:
+    path = str(tmp_path / 'configuration.pickle')
+    md.di.storage.dump(configuration=create_configuration(), path=path)
+
+    container = md.di.Container(configuration=md.di.storage.load(path=path))
+    assert container.get('service').kwargs['list'][:3] == [1, 2.5, None]
+
+
+@pytest.mark.parametrize('freeze', [False, True], ids=['dump-mutable', 'dump-frozen'])
+def test_indexed(create_container, tmp_path, freeze) -> None:
+    configuration = create_configuration()
+    configuration.definition_map['deferred'] = md.di.Definition(class_='md_di_test_missing_module.Service')
+    path = str(tmp_path / 'configuration.index')
+    md.di.storage.dump_indexed(configuration=configuration.freeze() if freeze else configuration, path=path)
+
+    loaded_configuration = md.di.storage.load_indexed(path=path)
+    assert sorted(loaded_configuration.definition_map) == ['created', 'deferred', 'dependency', 'service']
+    assert loaded_configuration.definition_map['service'] is loaded_configuration.definition_map['service']
+    assert loaded_configuration.definition_alias_map == {'alias': 'dependency'}
+    assert [id_ for id_, _ in loaded_configuration.find_tagged(tag='tag')] == ['dependency']
+    with pytest.raises(TypeError):
+        loaded_configuration.definition_map['other'] = md.di.Definition(class_=Service)
+
+    container = create_container(loaded_configuration)
+    service = container.get('service')
+    assert service.kwargs['inline'].kwargs == {'value': 1}
+    assert service.configuration == {'key': 'value'}
+
+
+def test_invalid_indexed_file(tmp_path) -> None:
+    path = tmp_path / 'configuration.index'
+    path.write_bytes(b'x' * 32)
+
+    with pytest.raises(md.di.InvalidDefinitionConfigurationException):
+        md.di.storage.load_indexed(path=str(path))
+
+
+def test_write_dispose_option() -> None:
+    configuration = md.di.Configuration(definition_map={
+        'not_disposed': md.di.Definition(class_=Service, dispose=False, public=True),
+        'custom': md.di.Definition(class_=Service, dispose='shutdown', public=True),
+    })
+
+    for configuration_ in (configuration, configuration.freeze()):
+        namespace = {}
+        exec(md.di.storage.write_python(configuration=configuration_), namespace)
+        definition_map = namespace['configuration'].definition_map
+        assert definition_map['not_disposed'].dispose is False
+        assert definition_map['custom'].dispose == 'shutdown'
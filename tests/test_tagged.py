@@ -0,0 +1,104 @@
+import asyncio
+
+import md.di
+import md.di.aio
+
+
+class Service:
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+
+def create_configuration(created_list: list) -> md.di.Configuration:
+    def create(name: str) -> Service:
+        created_list.append(name)
+        return Service(name=name)
+
+    return md.di.Configuration(definition_map={
+        'first': md.di.Definition(factory=create, arguments={'name': 'first'}, tags=[{'name': 'handler', 'priority': 1}]),
+        'second': md.di.Definition(factory=create, arguments={'name': 'second'}, tags=[{'name': 'handler', 'priority': 2}]),
+        'default': md.di.Definition(factory=create, arguments={'name': 'default'}, tags=[{'name': 'handler'}]),
+        'other': md.di.Definition(factory=create, arguments={'name': 'other'}, tags=[{'name': 'other'}]),
+        'service': md.di.Definition(
+            class_=Service,
+            arguments={
+                'handler_list': md.di.Tagged(tag='handler', priority='priority'),
+                'unordered_handler_list': md.di.Tagged(tag='handler'),
+            },
+            public=True,
+        ),
+    })
+
+
+def test_tagged(create_container) -> None:
+    created_list = []
+    container = create_container(create_configuration(created_list=created_list))
+
+    service = container.get('service')
+    assert created_list == []  # tagged services are retrieved on iteration
+
+    handler_list = list(service.kwargs['handler_list'])
+    assert [handler.kwargs['name'] for handler in handler_list] == ['second', 'first', 'default']
+    assert [handler.kwargs['name'] for handler in service.kwargs['unordered_handler_list']] == [
+        'first', 'second', 'default',
+    ]
+    assert created_list == ['second', 'first', 'default']
+
+
+def test_find_tagged() -> None:
+    configuration = create_configuration(created_list=[])
+    assert configuration.find_tagged('handler') == [
+        ('first', {'name': 'handler', 'priority': 1}),
+        ('second', {'name': 'handler', 'priority': 2}),
+        ('default', {'name': 'handler'}),
+    ]
+    assert configuration.find_tagged('Handler') == []
+
+    configuration.definition_map['third'] = md.di.Definition(class_=Service, tags=[{'name': 'handler'}])
+    assert len(configuration.find_tagged('handler')) == 3  # index is built on first use
+    configuration.reindex()
+    assert len(configuration.find_tagged('handler')) == 4
+
+
+def test_tagged_several_times(create_container) -> None:
+    configuration = md.di.Configuration(definition_map={
+        'listener': md.di.Definition(
+            class_=Service,
+            arguments={'name': 'listener'},
+            tags=[{'name': 'listener', 'event': 'a'}, {'name': 'other'}, {'name': 'listener', 'event': 'b', 'priority': 1}],
+        ),
+        'other_listener': md.di.Definition(
+            class_=Service, arguments={'name': 'other_listener'}, tags=[{'name': 'listener', 'event': 'a'}],
+        ),
+        'service': md.di.Definition(
+            class_=Service, arguments={'listener_list': md.di.Tagged(tag='listener', priority='priority')}, public=True,
+        ),
+    })
+    assert configuration.find_tagged('listener') == [
+        ('listener', {'name': 'listener', 'event': 'a'}),
+        ('listener', {'name': 'listener', 'event': 'b', 'priority': 1}),
+        ('other_listener', {'name': 'listener', 'event': 'a'}),
+    ]
+
+    container = create_container(configuration)
+    listener_list = container.get('service').kwargs['listener_list']
+    assert [listener.kwargs['name'] for listener in listener_list] == ['listener', 'other_listener']  # injected once
+
+
+def test_container_invalidate_reindexes_configuration() -> None:
+    configuration = create_configuration(created_list=[])
+    configuration.definition_map['service'].shared = False
+    container = md.di.Container(configuration=configuration)
+    assert len(list(container.get('service').kwargs['handler_list'])) == 3
+
+    configuration.definition_map['third'] = md.di.Definition(class_=Service, tags=[{'name': 'handler'}])
+    container.invalidate()
+    assert len(list(container.get('service').kwargs['handler_list'])) == 4
+
+
+def test_aget_tagged() -> None:
+    container = md.di.aio.Container(configuration=create_configuration(created_list=[]))
+
+    service = asyncio.run(container.aget('service'))
+    assert [handler.kwargs['name'] for handler in service.kwargs['handler_list']] == ['second', 'first', 'default']
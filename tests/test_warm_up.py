@@ -0,0 +1,72 @@
+import time
+import typing
+
+import pytest
+
+import md.di
+import md.di.concurrent
+
+
+def create_configuration(created_list: typing.List[str], delay: float = 0) -> md.di.Configuration:
+    def create(name: str, **kwargs) -> str:
+        time.sleep(delay)
+        created_list.append(name)
+        return name
+
+    def define(name: str, **kwargs) -> md.di.Definition:
+        arguments = {key: md.di.Reference(id_) for key, id_ in kwargs.pop('dependency_map', {}).items()}
+        return md.di.Definition(factory=create, arguments={'name': name, **arguments}, **kwargs)
+
+    return md.di.Configuration(
+        definition_map={
+            'database': define('database'),
+            'cache': define('cache'),
+            'repository': define('repository', dependency_map={'database': 'database'}),
+            'api': define('api', dependency_map={'repository': 'repository', 'cache': 'cache_alias'}, public=True),
+            'worker': define('worker', dependency_map={'cache': 'cache'}, tags=[{'name': 'worker'}]),
+            'non_shared': define('non_shared', shared=False, public=True),
+            'lazy': define('lazy', lazy=True, public=True),
+        },
+        definition_alias_map={'cache_alias': 'cache'},
+    )
+
+
+def test_warm_up(create_container) -> None:
+    created_list = []
+    container = create_container(create_configuration(created_list=created_list))
+
+    container.warm_up()
+    assert sorted(created_list) == ['api', 'cache', 'database', 'repository']
+    assert created_list.index('database') < created_list.index('repository') < created_list.index('api')
+
+    container.get('api')
+    assert len(created_list) == 4
+
+
+def test_warm_up_tagged(create_container) -> None:
+    created_list = []
+    container = create_container(create_configuration(created_list=created_list))
+
+    container.warm_up(tag='worker')
+    assert created_list == ['cache', 'worker']
+
+
+def test_warm_up_error(create_container) -> None:
+    def fail() -> None:
+        raise ValueError('Unable to connect')
+
+    configuration = md.di.Configuration(definition_map={'service': md.di.Definition(factory=fail, public=True)})
+    container = create_container(configuration)
+
+    with pytest.raises(Exception):
+        container.warm_up()
+
+
+def test_concurrent_warm_up() -> None:
+    created_list = []
+    container = md.di.concurrent.Container(configuration=create_configuration(created_list=created_list, delay=0.1))
+
+    started_at = time.monotonic()
+    container.warm_up(max_workers=4)
+    assert time.monotonic() - started_at < 0.37  # database and cache are created in parallel (4 services, 3 levels)
+    assert sorted(created_list) == ['api', 'cache', 'database', 'repository']